@@ -0,0 +1,8 @@
+""" Performance benchmarks.
+
+* benchmarks.suite: serializers, request parsing, includes, bulk writes and
+  request handlers with testapp models.
+* benchmarks.compare: compare results of suite with baseline.
+* benchmarks.encoders: compare encoder backends.
+
+"""
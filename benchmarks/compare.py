@@ -0,0 +1,66 @@
+""" Compare benchmark results with baseline.
+
+Usage:
+    python -m benchmarks.compare baseline.json results.json [--threshold 0.1]
+
+Benchmark is a regression if it is slower than baseline by more than
+threshold (relative). Exit status is 1 if there are regressions.
+
+"""
+import argparse
+import json
+import sys
+
+
+def get_key(data):
+    return data["name"], tuple(sorted(
+        (key, str(value)) for key, value in data["params"].items()))
+
+
+def compare(baseline, results, threshold=0.1):
+    """ Compare results of benchmarks present in both runs.
+
+    :return list: (key, baseline seconds, seconds, change, is regression),
+        change is relative, positive if benchmark is slower.
+
+    """
+    baseline = {get_key(data): data["seconds"] for data in baseline}
+    rows = []
+    for data in results:
+        key = get_key(data)
+        if key not in baseline:
+            continue
+
+        change = data["seconds"] / baseline[key] - 1
+        rows.append(
+            (key, baseline[key], data["seconds"], change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("results")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.results) as f:
+        results = json.load(f)["results"]
+
+    rows = compare(baseline, results, threshold=args.threshold)
+    for (name, params), before, after, change, regression in rows:
+        print("{:16} {:50} {:10.3f} ms {:10.3f} ms {:+7.1%}{}".format(
+            name, " ".join("{}={}".format(*param) for param in params),
+            before * 1000, after * 1000, change,
+            " REGRESSION" if regression else ""))
+
+    regressions = sum(1 for row in rows if row[-1])
+    print("{} benchmarks compared, {} regressions".format(
+        len(rows), regressions))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
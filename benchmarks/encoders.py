@@ -0,0 +1,68 @@
+""" Compare encoder backends.
+
+Usage:
+    python -m benchmarks.encoders [--rows 1000] [--repeat 20]
+
+"""
+import argparse
+import datetime
+import decimal
+import timeit
+
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure()
+
+from jsonapi.encoders import (  # noqa
+    OrjsonEncoderBackend,
+    StdlibEncoderBackend,
+    orjson,
+)
+
+
+def get_document(rows):
+    return {
+        "data": [{
+            "id": index,
+            "name": "name {}".format(index),
+            "created": datetime.datetime(2015, 1, 1, 12, 0, index % 60),
+            "price": decimal.Decimal("{}.99".format(index)),
+            "ratio": index / 7.0,
+            "is_active": bool(index % 2),
+            "links": {"author": index, "comments": list(range(index % 5))},
+        } for index in range(rows)],
+        "links": {
+            "posts.author": "http://testserver/api/author/{posts.author}",
+        },
+    }
+
+
+def get_backends():
+    backends = [StdlibEncoderBackend()]
+    if orjson is not None:
+        backends.append(OrjsonEncoderBackend())
+    return backends
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    document = get_document(args.rows)
+    outputs = set()
+    for backend in get_backends():
+        outputs.add(backend.dumps(document))
+        duration = min(timeit.repeat(
+            lambda: backend.dumps(document), number=1, repeat=args.repeat))
+        print("{:10} {:10.2f} ms {:12.0f} rows/sec".format(
+            backend.name, duration * 1000, args.rows / duration))
+
+    if len(outputs) > 1:
+        print("WARNING: backends output is different")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+""" Database and fixtures of testapp for benchmarks.
+
+Objects are created with bulk_create, it is much faster than mixer used in
+tests, so benchmarks could use thousands of rows.
+
+"""
+import datetime
+import decimal
+import os
+
+
+def setup():
+    """ Set up django with testapp settings and create in-memory database."""
+    os.environ.setdefault(
+        "DJANGO_SETTINGS_MODULE", "tests.testapp.settings.test")
+
+    import django
+    if hasattr(django, "setup"):
+        django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    settings.DEBUG = False
+    connection.creation.create_test_db(verbosity=0)
+
+
+def create_fixtures(posts=1000, authors=100, comments_per_post=2):
+    """ Create authors, posts with comments and objects with all fields.
+
+    :return dict: number of created objects by model name.
+
+    """
+    from tests.testapp.models import (
+        Author, Comment, Post, TestSerializerAllFields)
+
+    Author.objects.bulk_create([
+        Author(name="author {}".format(index)) for index in range(authors)
+    ])
+    author_ids = list(Author.objects.values_list("id", flat=True))
+
+    Post.objects.bulk_create([
+        Post(title="post {}".format(index),
+             author_id=author_ids[index % len(author_ids)])
+        for index in range(posts)
+    ])
+    post_ids = list(Post.objects.values_list("id", flat=True))
+
+    Comment.objects.bulk_create([
+        Comment(post_id=post_id,
+                author_id=author_ids[(post_id + index) % len(author_ids)])
+        for post_id in post_ids
+        for index in range(comments_per_post)
+    ])
+
+    TestSerializerAllFields.objects.bulk_create([
+        TestSerializerAllFields(
+            big_integer=index * 10 ** 10,
+            boolean=bool(index % 2),
+            char="char {}".format(index),
+            comma_separated_integer="1,2",
+            date=datetime.date(2015, 1, 1),
+            datetime=datetime.datetime(2015, 1, 1, 12, 0, index % 60),
+            decimal=decimal.Decimal("1.5"),
+            email="user{}@example.com".format(index),
+            authorfile="file.txt",
+            filepath="file.txt",
+            floatnum=index / 7.0,
+            integer=index,
+            ip="127.0.0.1",
+            generic_ip="::1",
+            nullboolean=None,
+            positive_integer=index,
+            positive_small_integer=index % 100,
+            slug="slug-{}".format(index),
+            small_integer=index % 100,
+            text="text " * 20,
+            time=datetime.time(12, 0, index % 60),
+            url="http://example.com/{}".format(index),
+        ) for index in range(posts)
+    ])
+
+    return {
+        "author": authors,
+        "post": posts,
+        "comment": posts * comments_per_post,
+        "testserializerallfields": posts,
+    }
@@ -0,0 +1,256 @@
+""" Benchmarks of serializers, request parsing and request handlers.
+
+Usage:
+    python -m benchmarks.suite [--output results.json] [--repeat 5]
+        [--posts 1000] [--only dump_documents handler]
+
+Benchmarks use testapp models in in-memory sqlite database. Every number is
+the best of repeat runs in seconds, results are written as JSON and could be
+compared with benchmarks.compare.
+
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import timeit
+
+from .fixtures import create_fixtures, setup
+
+CONTENT_TYPE = "application/vnd.api+json"
+PAGE_SIZES = (10, 100, 1000)
+BULK_SIZES = (1, 10, 100)
+FIELD_COUNTS = (2, 8, None)  # None is all of the fields
+INCLUDE_PATHS = ("", "post", "post.author", "post.author.posts")
+QUERY = (
+    "include=author,comments&fields[post]=title,author&"
+    "filter=title__contains=a&sort=-id,title&page=2"
+)
+
+
+def measure(function, repeat, number=1):
+    """ Get the best time of function call in seconds."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def result(name, seconds, rows=None, **params):
+    data = {"name": name, "params": params, "seconds": seconds}
+    if rows is not None:
+        data["rows_per_sec"] = rows / seconds
+    return data
+
+
+def patch_page_size(resource, page_size):
+    """ Set Meta.page_size of resource, return function to restore it."""
+    original = resource.Meta.page_size
+    resource.Meta.page_size = page_size
+    return lambda: setattr(resource.Meta, 'page_size', original)
+
+
+def bench_dump_documents(client, repeat):
+    """ Serialization of evaluated objects, without SQL."""
+    from tests.testapp.resources import AuthorResource, PostResource
+
+    results = []
+    for resource in (AuthorResource, PostResource):
+        for size in PAGE_SIZES:
+            objects = list(resource.Meta.model.objects.order_by("id")[:size])
+            seconds = measure(
+                lambda: resource.dump_documents(resource, objects), repeat)
+            results.append(result(
+                "dump_documents", seconds, rows=len(objects),
+                resource=resource.Meta.name, page_size=size))
+    return results
+
+
+def bench_dump_document(client, repeat, rows=100):
+    """ Serialization of model with different number of fields."""
+    from jsonapi.serializers import Serializer
+    from tests.testapp.models import TestSerializerAllFields
+    from tests.testapp.urls import api
+
+    fields = [f for f in TestSerializerAllFields._meta.fields if f.serialize]
+    objects = list(TestSerializerAllFields.objects.order_by("id")[:rows])
+    results = []
+    # File fields urls are absolute, they use api base url.
+    original_api = getattr(Serializer.Meta, 'api', None)
+    Serializer.Meta.api = api
+    try:
+        for count in FIELD_COUNTS:
+            fields_own = fields[:count]
+            seconds = measure(lambda: [
+                Serializer.dump_document(obj, fields_own=fields_own)
+                for obj in objects
+            ], repeat)
+            results.append(result(
+                "dump_document", seconds, rows=len(objects),
+                fields=len(fields_own)))
+    finally:
+        Serializer.Meta.api = original_api
+    return results
+
+
+def bench_request_parser(client, repeat, number=1000):
+    from django.http import QueryDict
+    from jsonapi.request_parser import RequestParser
+
+    querydict = QueryDict(QUERY)
+    seconds = measure(
+        lambda: RequestParser.parse(querydict), repeat, number=number)
+    return [result("request_parser", seconds)]
+
+
+def bench_include(client, repeat, page_size=100):
+    """ Resource.get of comments with includes of depth 0 - 3."""
+    from django.test import RequestFactory
+    from tests.testapp.resources import CommentResource
+
+    factory = RequestFactory()
+    results = []
+    restore = patch_page_size(CommentResource, page_size)
+    try:
+        for path in INCLUDE_PATHS:
+            request = factory.get(
+                "/api/comment", {"include": path} if path else {})
+            seconds = measure(
+                lambda: CommentResource.get(request=request), repeat)
+            results.append(result(
+                "include", seconds, rows=page_size,
+                depth=len(path.split(".")) if path else 0))
+    finally:
+        restore()
+    return results
+
+
+def bench_bulk(client, repeat):
+    """ Bulk POST and PUT of authors, changes are rolled back."""
+    from django.db import transaction
+    from tests.testapp.models import Author
+
+    def request(method, url, body, status):
+        with transaction.atomic():
+            response = getattr(client, method)(
+                url, body, content_type=CONTENT_TYPE)
+            assert response.status_code == status, response.content
+            transaction.set_rollback(True)
+
+    results = []
+    for size in BULK_SIZES:
+        body = json.dumps({"data": [
+            {"name": "author {}".format(index)} for index in range(size)]})
+        seconds = measure(
+            lambda: request("post", "/api/author", body, 201), repeat)
+        results.append(result(
+            "bulk", seconds, rows=size, method="POST", size=size))
+
+        ids = list(Author.objects.order_by("id").values_list(
+            "id", flat=True)[:size])
+        body = json.dumps({"data": [
+            {"id": id, "name": "name {}".format(id)} for id in ids]})
+        url = "/api/author/{}".format(",".join(str(id) for id in ids))
+        seconds = measure(lambda: request("put", url, body, 200), repeat)
+        results.append(result(
+            "bulk", seconds, rows=size, method="PUT", size=size))
+    return results
+
+
+def bench_handler(client, repeat):
+    """ Full GET request with test client."""
+    from tests.testapp.resources import PostResource
+
+    def request(url):
+        response = client.get(url)
+        assert response.status_code == 200, response.content
+        return response
+
+    results = []
+    for size in PAGE_SIZES:
+        restore = patch_page_size(PostResource, size)
+        try:
+            for url in ("/api/post", "/api/post?include=author"):
+                content = request(url).content.decode("utf8")
+                rows = len(json.loads(content)["data"])
+                seconds = measure(lambda: request(url), repeat)
+                results.append(result(
+                    "handler", seconds, rows=rows, url=url, page_size=size))
+        finally:
+            restore()
+    return results
+
+
+def bench_encoders(client, repeat, rows=1000):
+    from .encoders import get_backends, get_document
+
+    document = get_document(rows)
+    return [
+        result("encoder", measure(lambda: backend.dumps(document), repeat),
+               rows=rows, backend=backend.name)
+        for backend in get_backends()
+    ]
+
+
+BENCHMARKS = [
+    ("dump_documents", bench_dump_documents),
+    ("dump_document", bench_dump_document),
+    ("request_parser", bench_request_parser),
+    ("include", bench_include),
+    ("bulk", bench_bulk),
+    ("handler", bench_handler),
+    ("encoder", bench_encoders),
+]
+
+
+def format_result(data):
+    params = " ".join(
+        "{}={}".format(key, value)
+        for key, value in sorted(data["params"].items()))
+    line = "{:16} {:50} {:10.3f} ms".format(
+        data["name"], params, data["seconds"] * 1000)
+    if "rows_per_sec" in data:
+        line += " {:12.0f} rows/sec".format(data["rows_per_sec"])
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="path of JSON results")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument(
+        "--only", nargs="+", choices=[name for name, _ in BENCHMARKS])
+    args = parser.parse_args()
+
+    setup()
+    objects = create_fixtures(posts=args.posts)
+
+    from django.test import Client
+    client = Client()
+    # Set up api urls, they are used in documents links.
+    client.get("/api/author")
+
+    results = []
+    for name, benchmark in BENCHMARKS:
+        if args.only and name not in args.only:
+            continue
+        for data in benchmark(client, args.repeat):
+            print(format_result(data))
+            results.append(data)
+
+    if args.output:
+        import django
+        import jsonapi
+        with open(args.output, "w") as f:
+            json.dump({
+                "created": datetime.datetime.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "jsonapi": jsonapi.version,
+                "objects": objects,
+                "repeat": args.repeat,
+                "results": results,
+            }, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,29 +22,161 @@ Responsible for routing and resource registration.
     )
 
 """
+import hashlib
 import json
 import logging
+import os
+import threading
 import time
-from django.http import HttpResponse, HttpResponseNotAllowed
+from django.contrib.auth import get_user_model
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
-
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+
+from . import memory
+from . import metrics
+from . import nplusone
+from . import queries
+from . import six
+from . import slowlog
+from . import timings
+from .cache import (
+    ResponseCache,
+    SingleFlight,
+    get_document_cache,
+    get_request_origin,
+    get_url_origin,
+    normalize_query,
+)
+from .compression import compress, compress_stream, get_encoding
+from .django_utils import get_file_response, get_timestamp
+from .encoders import MsgpackEncoderBackend, get_backend
 from .exceptions import JSONAPIError
-from .serializers import DatetimeDecimalEncoder
-from .signals import signal_request, signal_response
+from .jobs import JobRequest, JobStore, prefers_async
+from .metrics import MetricsRegistry
+from .profiling import Profiler
+from .request_parser import RequestParser
+from .signals import (
+    signal_request, signal_response, signal_response_trace)
+from .snapshots import SnapshotStore
+from .utils import atomic_write
+from .workers import WorkerPool
 
 logger = logging.getLogger(__name__)
 
 
 class API(object):
 
-    """ API handler."""
+    """ API handler.
+
+    .. versionchanged:: 0.10.0
+        cache_alias parameter, django cache used for GET responses of
+        resources with Meta.cache_ttl. Concurrent cached GET requests are
+        coalesced. Stale responses are refreshed in background. Pluggable
+        encoder backends. Response compression. MessagePack responses.
+        Asynchronous bulk write jobs. NDJSON exports. Resource snapshots.
+        Per-phase timings. SQL queries log. N+1 queries detector. Metrics.
+        Sampled profiling. Memory accounting. Slow requests log.
+
+    :param str cache_alias: django cache alias for response cache.
+    :param int coalesce_timeout: seconds concurrent GET request waits for
+        the same request in progress before doing it itself.
+    :param int refresh_workers: number of threads to refresh stale responses.
+    :param encoder: jsonapi.encoders.EncoderBackend, default is the fastest
+        available one. Resource.Meta.encoder has priority over it.
+    :param compress_min_length: minimal response length in bytes to compress
+        it with gzip or deflate, None to disable compression.
+    :type compress_min_length: int or None
+    :param int compress_level: compression level from 1 to 9.
+    :param str jobs_dir: spool directory of bulk write jobs and exports,
+        see jsonapi.jobs.
+    :param int job_workers: number of threads to process jobs and exports.
+    :param int job_ttl: seconds files of jobs and exports are kept after
+        the last update.
+    :param int job_timeout: seconds queued or running job could be not
+        updated, after that it is considered interrupted and failed.
+    :param str snapshots_dir: directory of resource snapshots, see
+        jsonapi.snapshots.
+    :param float snapshot_delay: seconds to wait for other changes before
+        snapshot rebuild.
+    :param bool server_timing: add Server-Timing header with timings of
+        request phases to responses, see jsonapi.timings.
+    :param bool query_log: collect SQL queries log of requests for
+        signal_response_trace, see jsonapi.queries. It is collected anyway
+        if debug, nplusone or metrics are enabled or resource has
+        Meta.slow_threshold.
+    :param bool debug: add meta.debug with SQL queries log and timings to
+        JSON responses, see jsonapi.queries. Do not use in production, SQL
+        of queries is visible to clients.
+    :param str nplusone: N+1 queries detector mode for GET requests, "raise"
+        or "log", None to disable it. Detector checks Meta.max_queries of
+        resources too. See jsonapi.nplusone.
+    :param bool metrics: record metrics of requests and show them at
+        <api url>/metrics, see jsonapi.metrics.
+    :param str metrics_dir: directory to share metrics between processes.
+    :param str profile_dir: directory of cProfile dumps of sampled requests,
+        None to disable profiling. See jsonapi.profiling.
+    :param int profile_rate: profile every profile_rate-th request, None to
+        profile only requests with signed header.
+    :param bool memory: trace allocated memory of requests with tracemalloc,
+        see jsonapi.memory.
+    :param int memory_threshold: log requests with peak of allocated memory
+        over it in bytes.
+    :param int memory_top_rate: report the largest allocation sites of
+        every memory_top_rate-th traced request, None for every request.
+        Sites are found by comparison of snapshots, which is slow.
+
+    """
 
     CONTENT_TYPE = "application/vnd.api+json"
-
-    def __init__(self):
+    EXPORT_CONTENT_TYPE = "application/x-ndjson"
+
+    def __init__(self, cache_alias='default', coalesce_timeout=30,
+                 refresh_workers=2, encoder=None, compress_min_length=1024,
+                 compress_level=6, jobs_dir=None, job_workers=2,
+                 job_ttl=86400, job_timeout=3600,
+                 snapshots_dir=None, snapshot_delay=1, server_timing=False,
+                 debug=False, nplusone=None, metrics=False,
+                 metrics_dir=None, profile_dir=None, profile_rate=None,
+                 memory=False, memory_threshold=None, memory_top_rate=100,
+                 query_log=False):
         self._resources = []
+        self.encoder = get_backend(encoder)
+        self.msgpack_encoder = MsgpackEncoderBackend()
         self.base_url = None  # base server url
         self.api_url = None  # api root url
+        self.response_cache = ResponseCache(alias=cache_alias)
+        self.single_flight = SingleFlight(timeout=coalesce_timeout)
+        self.refresh_pool = WorkerPool(
+            size=refresh_workers, name='jsonapi-refresh')
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+        self.compress_min_length = compress_min_length
+        self.compress_level = compress_level
+        self.job_store = JobStore(
+            directory=jobs_dir, ttl=job_ttl, timeout=job_timeout)
+        self.job_pool = WorkerPool(
+            size=job_workers, queue_size=1000, name='jsonapi-jobs')
+        self.snapshots = SnapshotStore(
+            directory=snapshots_dir, delay=snapshot_delay)
+        self.server_timing = server_timing
+        self.query_log = query_log
+        self.debug = debug
+        self.nplusone = nplusone
+        self.metrics = MetricsRegistry(directory=metrics_dir) \
+            if metrics else None
+        self.profiler = Profiler(directory=profile_dir, rate=profile_rate) \
+            if profile_dir is not None else None
+        self.memory = memory
+        self.memory_threshold = memory_threshold
+        self.memory_top_rate = memory_top_rate
 
     @property
     def resource_map(self):
@@ -66,6 +198,28 @@ class API(object):
             if hasattr(resource.Meta, 'model')
         }
 
+    def get_encoder(self, resource=None, request=None):
+        """ Get encoder backend for resource.
+
+        .. versionadded:: 0.10.0
+
+        If request is given and client prefers MessagePack to JSON in Accept
+        header, MessagePack backend is returned.
+
+        :return jsonapi.encoders.EncoderBackend:
+
+        """
+        if request is not None and RequestParser.get_accepted_media_type(
+                request.META.get('HTTP_ACCEPT'),
+                (self.CONTENT_TYPE, "application/json") +
+                self.msgpack_encoder.media_types
+        ) in self.msgpack_encoder.media_types:
+            return self.msgpack_encoder
+
+        if resource is None:
+            return self.encoder
+        return get_backend(resource.Meta.encoder, self.encoder)
+
     def register(self, resource=None, **kwargs):
         """ Register resource for currnet API.
 
@@ -106,6 +260,15 @@ class API(object):
 
         resource.Meta.api = self
         self._resources.append(resource)
+
+        # Exports are reused until model versions are changed.
+        if getattr(resource.Meta, 'cache_ttl', None) is not None or \
+                getattr(resource.Meta, 'export_chunk_size', None) is not None:
+            self.response_cache.enabled = True
+
+        if getattr(resource.Meta, 'snapshot', False):
+            self.snapshots.add(resource)
+
         return resource
 
     @property
@@ -122,12 +285,17 @@ class API(object):
         urls = [
             url(r'^$', self.documentation),
             url(r'^map$', self.map_view),
+            url(r'^/?jobs/(?P<job_id>\w+)$', self.job_view),
         ]
+        if self.metrics is not None:
+            urls.append(url(r'^/?metrics$', self.metrics_view))
 
         for resource_name in self.resource_map:
             urls.extend([
                 url(r'(?P<resource_name>{})$'.format(
                     resource_name), self.handler_view),
+                url(r'(?P<resource_name>{})/export$'.format(
+                    resource_name), self.handler_view, {'export': True}),
                 url(r'(?P<resource_name>{})/(?P<ids>[\w\-\,]+)$'.format(
                     resource_name), self.handler_view),
             ])
@@ -185,7 +353,7 @@ class API(object):
                 resource.authenticate(request) is not None
             ]
         }
-        response = json.dumps(resource_info)
+        response = self.get_encoder().dumps(resource_info)
         return HttpResponse(response, content_type="application/vnd.api+json")
 
     def documentation(self, request):
@@ -203,24 +371,402 @@ class API(object):
         }
         return render(request, "jsonapi/index.html", context)
 
-    def handler_view_get(self, resource, **kwargs):
-        items = json.dumps(
-            resource.get(**kwargs),
-            cls=resource.Meta.encoder
+    def metrics_view(self, request):
+        """ Show metrics in Prometheus text format.
+
+        .. versionadded:: 0.10.0
+
+        :return django.http.HttpResponse
+
+        """
+        return HttpResponse(
+            self.metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+    def get_response_cache_key(self, resource, request=None, ids=None,
+                               **kwargs):
+        """ Get response cache key for GET request.
+
+        .. versionadded:: 0.10.0
+
+        Response is cached only for resources with Meta.cache_ttl and without
+        authentication on GET requests.
+
+        :return: cache key or None if response should not be cached.
+        :rtype: str or None
+
+        """
+        if not resource.Meta.is_model or resource.Meta.cache_ttl is None or (
+                resource.Meta.authenticators and
+                not resource.Meta.disable_get_authentication):
+            return None
+
+        try:
+            queryargs = RequestParser.parse(request.GET)
+            include_structure = resource._get_include_structure(
+                queryargs.include)
+        except (ValueError, KeyError):
+            # Request is not valid, let resource handle it.
+            return None
+
+        user = resource.authenticate(request) \
+            if resource.Meta.authenticators else None
+
+        return self.response_cache.get_key(
+            resource, request, self.get_models(resource, include_structure),
+            user=user, ids=ids,
+            representation=self.get_representation(resource, request))
+
+    @staticmethod
+    def get_models(resource, include_structure):
+        """ Get models GET response depends on.
+
+        .. versionadded:: 0.10.0
+
+        """
+        return [resource.Meta.model] + [
+            field.related_model
+            for include_resource in include_structure
+            for field in include_resource["field_path"]
+        ]
+
+    def get_representation(self, resource, request):
+        """ Get representation requested with Accept header.
+
+        .. versionadded:: 0.10.0
+
+        :return str: format and content type
+
+        """
+        return "{}|{}".format(
+            RequestParser.parse_accept_format(request.META.get('HTTP_ACCEPT')),
+            self.get_encoder(resource, request).content_type
         )
-        return HttpResponse(items, content_type=self.CONTENT_TYPE)
+
+    def get_content(self, resource, **kwargs):
+        """ Get encoded GET response content.
+
+        .. versionadded:: 0.10.0
+
+        If resource caches documents, they are cached as encoded fragments
+        and joined without encoding.
+
+        :return bytes: content
+
+        """
+        encoder = self.get_encoder(resource, kwargs.get('request'))
+        if not encoder.fragments or \
+                get_document_cache(resource.Meta.document_cache) is None:
+            document = resource.get(**kwargs)
+            with timings.phase("encode"):
+                return encoder.dumps(document)
+
+        document = resource.get(as_fragments=True, **kwargs)
+        with timings.phase("encode"):
+            return encoder.dumps_document(document)
+
+    def get_cached_content(self, resource, cache_key, **kwargs):
+        """ Get encoded GET response content and store it in cache.
+
+        .. versionadded:: 0.10.0
+
+        """
+        content = self.get_content(resource, **kwargs)
+        self.response_cache.set(
+            cache_key, content, resource.Meta.cache_ttl,
+            resource.Meta.cache_stale_ttl)
+        return content
+
+    def refresh_cached_content(self, resource, cache_key, **kwargs):
+        """ Recalculate stale content in background.
+
+        .. versionadded:: 0.10.0
+
+        Only one refresh per key is done at the same time.
+
+        """
+        with self._refreshing_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                self.single_flight.do(
+                    cache_key, self.get_cached_content, resource, cache_key,
+                    **kwargs)
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(cache_key)
+
+        if not self.refresh_pool.submit(refresh):
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
+
+    def get_validators(self, resource, cache_key=None, request=None,
+                       **kwargs):
+        """ Get validators of GET response.
+
+        .. versionadded:: 0.10.0
+
+        ETag is calculated from resource aggregate validators if resource has
+        Meta.updated_field. Otherwise it is based on response cache key, it
+        is changed with every change of models response depends on.
+
+        :return: (etag, last_modified), last_modified is unix timestamp.
+            Both values could be None.
+
+        """
+        validators = resource.get_validators(request=request, **kwargs)
+        if validators is None:
+            etag = cache_key and cache_key.rsplit(":", 1)[-1]
+            return etag, None
+
+        last_modified = validators["last_modified"]
+        parts = [
+            resource.Meta.name,
+            get_request_origin(request),
+            normalize_query(request.GET),
+            ",".join(kwargs.get("ids", [])),
+            self.get_representation(resource, request),
+            validators["count"],
+            validators["id_sum"],
+            validators["id_max"],
+            last_modified and last_modified.isoformat(),
+            cache_key,
+        ]
+        etag = hashlib.md5(
+            "|".join(six.text_type(p) for p in parts).encode('utf8'))
+        last_modified = last_modified and get_timestamp(last_modified)
+        return etag.hexdigest(), last_modified
+
+    @staticmethod
+    def is_not_modified(request, etag=None, last_modified=None):
+        """ Check request conditional headers.
+
+        .. versionadded:: 0.10.0
+
+        If-None-Match has priority over If-Modified-Since.
+
+        :return bool: True if client has actual response.
+
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            etags = {
+                e.strip().replace('W/', '', 1).strip('"')
+                for e in if_none_match.split(',')
+            }
+            return etag is not None and (etag in etags or '*' in etags)
+
+        if_modified_since = parse_http_date_safe(
+            request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return last_modified is not None and if_modified_since is not None \
+            and last_modified <= if_modified_since
+
+    def get_content_encoding(self, request):
+        """ Get content encoding accepted by client.
+
+        .. versionadded:: 0.10.0
+
+        :return: "gzip", "deflate" or None if response is not compressed.
+
+        """
+        if self.compress_min_length is None:
+            return None
+        return get_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+
+    def compress_response(self, request, response):
+        """ Compress response if client accepts it.
+
+        .. versionadded:: 0.10.0
+
+        Streaming responses are compressed on the fly regardless of length.
+        Responses with Content-Encoding and file responses are not changed.
+
+        :return django.http.HttpResponse: response
+
+        """
+        if self.compress_min_length is None:
+            return response
+
+        # File responses could be sent with sendfile, so they are not
+        # compressed.
+        if getattr(response, 'file_to_stream', None) is not None:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if response.has_header('Content-Encoding') or \
+                response.status_code in (204, 304):
+            return response
+
+        encoding = self.get_content_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding, self.compress_level)
+            del response['Content-Length']
+        elif len(response.content) >= self.compress_min_length:
+            with timings.phase("compress"):
+                response.content = compress(
+                    response.content, encoding, self.compress_level)
+            response['Content-Length'] = str(len(response.content))
+        else:
+            return response
+
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag is not None and not etag.startswith('W/'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def get_snapshot_response(self, resource, request=None, ids=None,
+                              **kwargs):
+        """ Get GET response from resource snapshot.
+
+        .. versionadded:: 0.10.0
+
+        Only requests without query parameters in default representation
+        with scheme and host of snapshot links are served from snapshot.
+
+        :return: django.http.HttpResponse or None if snapshot is not used.
+
+        """
+        if not resource.Meta.snapshot or request.GET or \
+                resource.Meta.authenticators or \
+                resource.Meta.page_size is not None or \
+                RequestParser.parse_accept_format(
+                    request.META.get('HTTP_ACCEPT')) is not None or \
+                self.get_encoder(resource, request) is self.msgpack_encoder:
+            return None
+
+        snapshot = self.snapshots.get(resource)
+        if snapshot is None or \
+                get_url_origin(snapshot.api_url) != \
+                get_request_origin(request):
+            return None
+
+        content, etag = snapshot.get_content(ids)
+        content_type = self.get_encoder(resource).content_type
+        if self.is_not_modified(request, etag):
+            response = HttpResponseNotModified()
+        elif ids is None:
+            response = StreamingHttpResponse(
+                content, content_type=content_type)
+            response['Content-Length'] = str(snapshot.size)
+        else:
+            response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = '"{}"'.format(etag)
+        patch_vary_headers(response, ('Accept',))
+        return response
+
+    def handler_view_get(self, resource, **kwargs):
+        response = self.get_snapshot_response(resource, **kwargs)
+        if response is not None:
+            return response
+
+        cache_key = self.get_response_cache_key(resource, **kwargs)
+        # NOTE: validators are stored with cached content, so cache hits do
+        # not run aggregate query.
+        validators = None
+        if cache_key is not None:
+            validators, _ = self.response_cache.get_variant(
+                cache_key, "validators")
+        is_cached = validators is not None
+        if not is_cached:
+            validators = self.get_validators(resource, cache_key, **kwargs)
+        etag, last_modified = validators
+
+        if self.is_not_modified(kwargs['request'], etag, last_modified):
+            response = HttpResponseNotModified()
+        else:
+            # NOTE: debug meta is added to not compressed content.
+            response = self.get_response(
+                resource, cache_key,
+                encoding=None if self.debug
+                else self.get_content_encoding(kwargs['request']),
+                **kwargs)
+
+        if cache_key is not None and not is_cached:
+            self.response_cache.set_variant(
+                cache_key, "validators", validators,
+                stale_ttl=resource.Meta.cache_stale_ttl)
+
+        if etag is not None:
+            response['ETag'] = '"{}"'.format(etag)
+            if response.has_header('Content-Encoding'):
+                response['ETag'] = 'W/' + response['ETag']
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+
+        # Representation format could be requested with Accept header.
+        patch_vary_headers(response, ('Accept',))
+        return response
+
+    def get_response(self, resource, cache_key=None, encoding=None,
+                     **kwargs):
+        """ Get GET response, use cache if key is given.
+
+        .. versionadded:: 0.10.0
+
+        :param encoding: content encoding accepted by client. Compressed
+            content is cached too, so it is compressed once.
+
+        """
+        content_type = self.get_encoder(
+            resource, kwargs.get('request')).content_type
+        if cache_key is not None and encoding is not None:
+            compressed, is_stale = self.response_cache.get_variant(
+                cache_key, encoding)
+            if compressed is not None and not is_stale:
+                return self._get_compressed_response(
+                    compressed, encoding, content_type)
+
+        if cache_key is None:
+            content = self.get_content(resource, **kwargs)
+        else:
+            content, is_stale = self.response_cache.get(cache_key)
+            if content is None:
+                content = self.single_flight.do(
+                    cache_key, self.get_cached_content, resource, cache_key,
+                    **kwargs)
+            elif is_stale:
+                self.refresh_cached_content(resource, cache_key, **kwargs)
+
+        if encoding is not None and len(content) >= self.compress_min_length:
+            with timings.phase("compress"):
+                compressed = compress(content, encoding, self.compress_level)
+            if cache_key is not None:
+                self.response_cache.set_variant(
+                    cache_key, encoding, compressed, content,
+                    resource.Meta.cache_stale_ttl)
+            return self._get_compressed_response(
+                compressed, encoding, content_type)
+
+        return HttpResponse(content, content_type=content_type)
+
+    def _get_compressed_response(self, content, encoding, content_type):
+        response = HttpResponse(content, content_type=content_type)
+        response['Content-Encoding'] = encoding
+        response['Content-Length'] = str(len(content))
+        return response
 
     def handler_view_post(self, resource, **kwargs):
+        encoder = self.get_encoder(resource, kwargs['request'])
         data = resource.post(**kwargs)
+        with timings.phase("encode"):
+            content = encoder.dumps(data)
+
         if "errors" in data:
+            # NOTE: chunks saved with commit=chunk are not rolled back.
             response = HttpResponse(
-                json.dumps(data, cls=DatetimeDecimalEncoder),
-                content_type=self.CONTENT_TYPE, status=400)
+                content, content_type=encoder.content_type,
+                status=200 if data.get("data") else 400)
             return response
 
         response = HttpResponse(
-            json.dumps(data, cls=DatetimeDecimalEncoder),
-            content_type=self.CONTENT_TYPE, status=201)
+            content, content_type=encoder.content_type, status=201)
 
         items = data["data"]
         items = items if isinstance(items, list) else [items]
@@ -235,18 +781,280 @@ class API(object):
         if 'ids' not in kwargs:
             return HttpResponse("Request SHOULD have resource ids", status=400)
 
+        encoder = self.get_encoder(resource, kwargs['request'])
         data = resource.put(**kwargs)
+        with timings.phase("encode"):
+            content = encoder.dumps(data)
+
         if "errors" in data:
+            # NOTE: chunks saved with commit=chunk are not rolled back.
             response = HttpResponse(
-                json.dumps(data, cls=DatetimeDecimalEncoder),
-                content_type=self.CONTENT_TYPE, status=400)
+                content, content_type=encoder.content_type,
+                status=200 if data.get("data") else 400)
             return response
 
         response = HttpResponse(
-            json.dumps(data, cls=DatetimeDecimalEncoder),
-            content_type=self.CONTENT_TYPE, status=200)
+            content, content_type=encoder.content_type, status=200)
         return response
 
+    def handler_view_job(self, resource, **kwargs):
+        """ Accept POST or PUT request as bulk write job.
+
+        .. versionadded:: 0.10.0
+
+        :return django.http.HttpResponse: 202 Accepted with job document.
+
+        """
+        request = kwargs['request']
+        if request.method == "PUT" and 'ids' not in kwargs:
+            return HttpResponse("Request SHOULD have resource ids", status=400)
+
+        user = resource.authenticate(request) \
+            if resource.Meta.authenticators else None
+        job = self.job_store.create(
+            request, resource, user=user, ids=kwargs.get('ids'))
+
+        if not self.job_pool.submit(self.process_job, job["id"]):
+            self.job_store.delete_body(job)
+            self.job_store.update(
+                job, status=JobStore.STATUS_FAILED,
+                errors=[{"detail": "Job queue is full"}])
+            return HttpResponse("Job queue is full", status=503)
+
+        encoder = self.get_encoder(resource, request)
+        response = HttpResponse(
+            encoder.dumps({"data": JobStore.get_document(job)}),
+            content_type=encoder.content_type, status=202)
+        response["Location"] = "{}/jobs/{}".format(self.api_url, job["id"])
+        return response
+
+    def process_job(self, job_id):
+        """ Process bulk write job.
+
+        .. versionadded:: 0.10.0
+
+        Job is processed with resource post or put method, progress is
+        updated after every saved chunk, see Resource.Meta.write_chunk_size.
+
+        """
+        store = self.job_store
+        job = store.get(job_id)
+        if job is None or job["status"] != JobStore.STATUS_QUEUED:
+            # Job is expired or failed as interrupted.
+            return
+
+        resource = self.resource_map[job["resource"]]
+        store.update(job, status=JobStore.STATUS_RUNNING)
+
+        user = None
+        if job["user"] is not None:
+            user = get_user_model().objects.filter(pk=job["user"]).first()
+
+        def progress(result):
+            job["progress"]["processed"] = result["offset"] + result["count"]
+            store.save(job)
+
+        kwargs = dict(user=user, progress=progress)
+        if job["ids"] is not None:
+            kwargs["ids"] = job["ids"]
+
+        try:
+            with store.open_body(job) as stream:
+                request = JobRequest(job, stream)
+                if job["method"] == "POST":
+                    data = resource.post(request=request, **kwargs)
+                else:
+                    data = resource.put(request=request, **kwargs)
+        except JSONAPIError as e:
+            data = {"errors": [e.data]}
+        except Exception:
+            # NOTE: exception message could expose internal details.
+            logger.exception("Job %s failed", job_id)
+            data = {"errors": [{"detail": "Job failed"}]}
+        finally:
+            store.delete_body(job)
+
+        # NOTE: errors could have lazy strings and django ErrorList.
+        data = json.loads(self.encoder.dumps(data).decode('utf8'))
+        items = data.get("data", [])
+        items = items if isinstance(items, list) else [items]
+        store.update(
+            job,
+            status=JobStore.STATUS_FAILED if "errors" in data
+            else JobStore.STATUS_FINISHED,
+            errors=data.get("errors", []),
+            result={
+                "ids": [item["id"] for item in items],
+                "meta": data.get("meta", {}),
+            },
+        )
+
+    def job_view(self, request, job_id):
+        """ Show bulk write job.
+
+        .. versionadded:: 0.10.0
+
+        Job is available for the user who created it.
+
+        :return django.http.HttpResponse
+
+        """
+        self.update_urls(request)
+        job = self.job_store.get(job_id)
+        if job is None or job["resource"] not in self.resource_map:
+            raise Http404("Job is not found")
+
+        resource = self.resource_map[job["resource"]]
+        if job["user"] is not None:
+            user = resource.authenticate(request)
+            if user is None or user.pk != job["user"]:
+                raise Http404("Job is not found")
+
+        encoder = self.get_encoder(resource, request)
+        return HttpResponse(
+            encoder.dumps({"data": JobStore.get_document(job)}),
+            content_type=encoder.content_type)
+
+    def get_export_id(self, resource, request, user=None, versioned=True):
+        """ Get export job id.
+
+        .. versionadded:: 0.10.0
+
+        Id depends on query, user and versions of exported models, so
+        finished export is reused until data is changed.
+
+        :param bool versioned: id depends on versions of models. Id without
+            versions is series of exports, see JobStore.set_latest.
+        :return str: job id
+        :raise JSONAPIError: query is not valid.
+
+        """
+        try:
+            queryargs = RequestParser.parse(request.GET)
+            include_structure = resource._get_include_structure(
+                queryargs.include)
+        except (ValueError, KeyError) as e:
+            raise JSONAPIError(detail="Query is not valid: {}".format(e))
+
+        models = self.get_models(resource, include_structure) \
+            if versioned else []
+        key = self.response_cache.get_key(
+            resource, request, models, user=user, representation="export")
+        return key.rsplit(":", 1)[-1]
+
+    def handler_view_export(self, resource, **kwargs):
+        """ Export resource documents to NDJSON file.
+
+        .. versionadded:: 0.10.0
+
+        Export is processed in background like bulk write jobs. While it is
+        not finished, response is 202 Accepted with job document. Finished
+        export is served from file with FileResponse (FileWrapper on Django
+        older than 1.8), so WSGI server could send it with sendfile.
+
+        :return django.http.HttpResponse
+
+        """
+        request = kwargs['request']
+        if not resource.Meta.is_model or \
+                resource.Meta.export_chunk_size is None:
+            raise Http404("Export is not available")
+
+        user = resource.authenticate(request) \
+            if resource.Meta.authenticators else None
+        job_id = self.get_export_id(resource, request, user=user)
+        if self.is_not_modified(request, job_id):
+            response = HttpResponseNotModified()
+            response['ETag'] = '"{}"'.format(job_id)
+            return response
+
+        job = self.job_store.get(job_id)
+        if job is not None and job["status"] == JobStore.STATUS_FINISHED:
+            try:
+                f = open(self.job_store.get_path(job_id, "ndjson"), "rb")
+            except (IOError, OSError):
+                # Export file is deleted, export again.
+                pass
+            else:
+                response = get_file_response(
+                    f, content_type=self.EXPORT_CONTENT_TYPE)
+                response['Content-Length'] = str(os.fstat(f.fileno()).st_size)
+                response['ETag'] = '"{}"'.format(job_id)
+                return response
+
+        if job is None or job["status"] in (
+                JobStore.STATUS_FINISHED, JobStore.STATUS_FAILED):
+            # NOTE: export could be started by concurrent request, job is
+            # created and submitted only if it is not changed.
+            with self.job_store.lock(job_id):
+                current = self.job_store.get(job_id)
+                if current is not None and (
+                        job is None or current["updated"] != job["updated"]):
+                    job = current
+                else:
+                    job = self.job_store.create(
+                        request, resource, user=user, job_id=job_id,
+                        series=self.get_export_id(
+                            resource, request, user=user, versioned=False))
+                    if not self.job_pool.submit(self.process_export, job_id):
+                        self.job_store.update(
+                            job, status=JobStore.STATUS_FAILED,
+                            errors=[{"detail": "Job queue is full"}])
+                        return HttpResponse("Job queue is full", status=503)
+
+        encoder = self.get_encoder(resource, request)
+        response = HttpResponse(
+            encoder.dumps({"data": JobStore.get_document(job)}),
+            content_type=encoder.content_type, status=202)
+        response["Location"] = "{}/jobs/{}".format(self.api_url, job_id)
+        return response
+
+    def process_export(self, job_id):
+        """ Process export job.
+
+        .. versionadded:: 0.10.0
+
+        Documents are written to temporary file, which is renamed when export
+        is finished. Previous export of the same query is deleted then.
+
+        """
+        store = self.job_store
+        job = store.get(job_id)
+        if job is None or job["status"] != JobStore.STATUS_QUEUED:
+            # Job is expired or failed as interrupted.
+            return
+
+        resource = self.resource_map[job["resource"]]
+        store.update(job, status=JobStore.STATUS_RUNNING)
+
+        user = None
+        if job["user"] is not None:
+            user = get_user_model().objects.filter(pk=job["user"]).first()
+
+        def progress(count):
+            job["progress"]["processed"] = count
+            store.save(job)
+
+        path = store.get_path(job_id, "ndjson")
+        try:
+            with atomic_write(path, "wb") as f, store.open_body(job) as body:
+                count = resource.export(
+                    f, self.get_encoder(resource),
+                    request=JobRequest(job, body),
+                    user=user, progress=progress)
+        except Exception:
+            # NOTE: exception message could expose internal details.
+            logger.exception("Export %s failed", job_id)
+            store.update(
+                job, status=JobStore.STATUS_FAILED,
+                errors=[{"detail": "Export failed"}])
+        else:
+            store.update(
+                job, status=JobStore.STATUS_FINISHED,
+                result={"count": count})
+            if job["series"] is not None:
+                store.set_latest(job)
+
     def handler_view_delete(self, resource, **kwargs):
         if 'ids' not in kwargs:
             return HttpResponse("Request SHOULD have resource ids", status=400)
@@ -255,47 +1063,131 @@ class API(object):
         return HttpResponse(
             response, content_type=self.CONTENT_TYPE, status=204)
 
-    def handler_view(self, request, resource_name, ids=None):
+    @staticmethod
+    def get_max_queries(resource, request):
+        """ Get budget of SQL queries of GET request.
+
+        .. versionadded:: 0.10.0
+
+        Budget is checked by N+1 queries detector, see
+        Resource.get_max_queries.
+
+        :return: number of queries or None if it is not checked.
+
+        """
+        if not resource.Meta.is_model:
+            return None
+
+        try:
+            include = RequestParser.parse(request.GET).include
+        except ValueError:
+            # Request is not valid, let resource handle it.
+            return None
+
+        return resource.get_max_queries(include)
+
+    def handler_view(self, request, resource_name, ids=None, export=False):
         """ Handler for resources.
 
         .. versionadded:: 0.5.7
             Content-Type check
 
+        .. versionchanged:: 0.10.0
+            export parameter, GET request exports resource, see
+            handler_view_export.
+
+        .. versionchanged:: 0.10.0
+            Timings, queries log and other request collectors are stopped
+            if exception is raised, response signal is sent with empty
+            response of 404 or 500 status then.
+
         :return django.http.HttpResponse
 
         """
         signal_request.send(sender=self, request=request)
         time_start = time.time()
-        self.update_urls(request, resource_name=resource_name, ids=ids)
-        resource = self.resource_map[resource_name]
+        timings.start()
+        if self.memory:
+            memory.start(rate=self.memory_top_rate)
+        if self.profiler is not None:
+            self.profiler.start(request)
+
+        resource = None
+        response = None
+        error = None
+        try:
+            # Export url has one more path segment, same as ids.
+            self.update_urls(
+                request, resource_name=resource_name,
+                ids="export" if export else ids)
+            resource = self.resource_map[resource_name]
+            if self.is_query_log_used(resource):
+                queries.start()
+            if resource.Meta.slow_threshold is not None:
+                slowlog.start(queries.get())
+
+            response, error = self.dispatch(
+                resource, request, ids=ids, export=export)
+        except Http404:
+            response = HttpResponse(status=404)
+            raise
+        except Exception:
+            response = HttpResponse(status=500)
+            raise
+        finally:
+            response = self.finish_response(
+                request, response, time_start, resource=resource,
+                error=error)
+        return response
+
+    def is_query_log_used(self, resource):
+        """ Check if SQL queries log of resource request is collected.
 
+        .. versionadded:: 0.10.0
+
+        """
+        return bool(
+            self.query_log or self.debug or self.nplusone or
+            self.metrics is not None or
+            resource.Meta.slow_threshold is not None)
+
+    def dispatch(self, resource, request, ids=None, export=False):
+        """ Get response of resource.
+
+        .. versionadded:: 0.10.0
+
+        :return: (response, error), error is JSONAPIError of response.
+
+        """
         allowed_http_methods = resource.Meta.allowed_methods
         if request.method not in allowed_http_methods:
-            response = HttpResponseNotAllowed(
-                permitted_methods=allowed_http_methods)
-            signal_response.send(
-                sender=self, request=request, response=response,
-                duration=time.time() - time_start)
-            return response
+            return HttpResponseNotAllowed(
+                permitted_methods=allowed_http_methods), None
 
         if resource.Meta.authenticators and not (
                 request.method == "GET" and
                 resource.Meta.disable_get_authentication):
-            user = resource.authenticate(request)
+            with timings.phase("auth"):
+                user = resource.authenticate(request)
             if user is None or not user.is_authenticated():
-                response = HttpResponse("Not Authenticated", status=401)
-                signal_response.send(
-                    sender=self, request=request, response=response,
-                    duration=time.time() - time_start)
-                return response
+                return HttpResponse("Not Authenticated", status=401), None
 
         kwargs = dict(request=request)
         if ids is not None:
             kwargs['ids'] = ids.split(",")
 
+        error = None
         try:
-            if request.method == "GET":
-                response = self.handler_view_get(resource, **kwargs)
+            if request.method == "GET" and export:
+                response = self.handler_view_export(resource, **kwargs)
+            elif request.method == "GET":
+                max_queries = self.nplusone and self.get_max_queries(
+                    resource, request)
+                with nplusone.detect(self.nplusone, max_queries=max_queries):
+                    response = self.handler_view_get(resource, **kwargs)
+            elif request.method in ("POST", "PUT") and \
+                    prefers_async(request):
+                response = self.handler_view_job(resource, **kwargs)
             elif request.method == "POST":
                 response = self.handler_view_post(resource, **kwargs)
             elif request.method == "PUT":
@@ -303,10 +1195,81 @@ class API(object):
             elif request.method == "DELETE":
                 response = self.handler_view_delete(resource, **kwargs)
         except JSONAPIError as e:
+            error = e
+            encoder = self.get_encoder(resource, request)
             response = HttpResponse(
-                json.dumps({"errors": [e.data]}, cls=DatetimeDecimalEncoder),
-                content_type=self.CONTENT_TYPE, status=e.status)
+                encoder.dumps({"errors": [e.data]}),
+                content_type=encoder.content_type, status=e.status)
+
+        if self.debug:
+            response = self.add_debug_meta(response)
+
+        return self.compress_response(request, response), error
+
+    def add_debug_meta(self, response):
+        """ Add queries log and timings to meta.debug of JSON response.
+
+        .. versionadded:: 0.10.0
 
-        signal_response.send(sender=self, request=request, response=response,
-                             duration=time.time() - time_start)
+        :return django.http.HttpResponse: response
+
+        """
+        if response.streaming or response.has_header('Content-Encoding') or \
+                response.get('Content-Type') != self.CONTENT_TYPE:
+            return response
+
+        try:
+            document = json.loads(response.content.decode('utf8'))
+        except ValueError:
+            return response
+
+        if isinstance(document, dict):
+            document.setdefault("meta", {})["debug"] = {
+                "queries": queries.get().as_dict(params=False),
+                "timings": timings.get().phases,
+            }
+            response.content = self.encoder.dumps(document)
+        return response
+
+    def finish_response(self, request, response, time_start, resource=None,
+                        error=None):
+        """ Send response signal with duration and response trace signal
+        with timings, queries log and memory trace.
+
+        .. versionadded:: 0.10.0
+
+        Request is recorded to metrics if they are enabled, profile of
+        sampled request is saved, slow request is logged.
+
+        :return django.http.HttpResponse: response with Server-Timing header
+            if API server_timing is enabled.
+
+        """
+        if self.profiler is not None:
+            self.profiler.stop(request, resource=resource)
+
+        duration = time.time() - time_start
+        phases = timings.stop().finish()
+        if self.server_timing:
+            response['Server-Timing'] = timings.get_server_timing(phases)
+
+        log = queries.stop()
+        log = log.as_dict() if log is not None else None
+        memory_trace = memory.stop()
+        memory.check(request, memory_trace, self.memory_threshold)
+        slowlog.check(
+            request, response, duration, resource, slowlog.stop(),
+            timings=phases)
+        if self.metrics is not None:
+            self.metrics.record(
+                request, response, duration, resource=resource, error=error,
+                queries=log)
+
+        signal_response.send(
+            sender=self, request=request, response=response,
+            duration=duration)
+        signal_response_trace.send(
+            sender=self, request=request, response=response,
+            duration=duration, timings=phases, queries=log,
+            memory=memory_trace)
         return response
@@ -0,0 +1,518 @@
+""" In-process caches used by resources.
+
+.. versionadded:: 0.10.0
+
+Document cache stores output of Serializer.dump_document. It is enabled per
+resource with Meta.document_cache:
+
+.. code-block:: python
+
+    @api.register
+    class GroupResource(Resource):
+        class Meta:
+            model = 'testapp.Group'
+            document_cache = True  # use shared cache
+            # document_cache = LRUCache(maxsize=100, ttl=60)  # own cache
+
+Response cache stores encoded GET responses with django cache framework, so
+every configured backend (locmem, file, memcached) could be used. It is
+enabled per resource with Meta.cache_ttl and only used for resources without
+authenticators or with disable_get_authentication. Response depends on user
+if resource has authenticators, user id is a part of the key in that case.
+
+.. code-block:: python
+
+    api = API(cache_alias='default')
+
+    @api.register
+    class GroupResource(Resource):
+        class Meta:
+            model = 'testapp.Group'
+            cache_ttl = 60
+
+With Meta.cache_stale_ttl, expired response is kept for that many seconds.
+It is served immediately and updated in the background.
+
+Concurrent GET requests with the same response cache key are coalesced with
+SingleFlight: only one of them queries database and serializes response, the
+others wait and share its result.
+
+Cached documents and responses are invalidated with django post_save,
+post_delete and m2m_changed signals. Response cache uses model versions:
+every change increases version of the model, key of response consists of
+versions of primary model and models from include structure. Queryset.update
+and other bulk operations do not send signals, cache entries would live until
+their ttl expires in that case. Filters over related models are not tracked
+either.
+
+"""
+import hashlib
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from django.db.models import signals
+from django.utils.http import urlencode
+
+from . import six
+from .django_utils import get_cache, get_model_name, get_models
+from .model_inspector import get_parent as _get_parent
+
+
+class LRUCache(object):
+
+    """ Bounded least recently used cache with time to live.
+
+    Cache is thread safe. Every key could be stored with tags, tag is used to
+    invalidate group of keys at once.
+
+    :param int maxsize: maximum number of stored keys.
+    :param ttl: key time to live in seconds, None for unlimited.
+    :type ttl: int or None
+
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Generation is increased on every invalidation. It is used to avoid
+        # storing values, calculated before invalidation happened.
+        self.generation = 0
+        self._data = OrderedDict()  # key -> (expires, value, tags)
+        self._tags = {}  # tag -> set of keys
+        self._lock = threading.RLock()
+        _caches.add(self)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _missing) is not _missing
+
+    def get(self, key, default=None):
+        """ Get value from cache, move key to the end of the queue."""
+        with self._lock:
+            try:
+                expires, value, tags = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if expires is not None and expires < time.time():
+                self._untag(key, tags)
+                self.misses += 1
+                return default
+
+            self._data[key] = (expires, value, tags)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, tags=(), generation=None):
+        """ Store value in cache.
+
+        :param tags: tags to invalidate key with.
+        :param generation: cache generation value was calculated at. If cache
+            was invalidated after that, value is not stored.
+
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            if key in self._data:
+                self._untag(key, self._data.pop(key)[2])
+
+            expires = time.time() + self.ttl if self.ttl is not None else None
+            tags = frozenset(tags)
+            self._data[key] = (expires, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._data) > self.maxsize:
+                old_key, (_, _, old_tags) = self._data.popitem(last=False)
+                self._untag(old_key, old_tags)
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._untag(key, self._data.pop(key)[2])
+
+    def invalidate(self, *tags):
+        """ Delete all of the keys stored with given tags."""
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    value = self._data.pop(key, None)
+                    if value is not None:
+                        self._untag(key, value[2])
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+            self._tags.clear()
+
+    def _untag(self, key, tags):
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class ResponseCache(object):
+
+    """ Cache of encoded responses based on django cache framework.
+
+    :param str alias: django cache alias.
+
+    """
+
+    KEY_PREFIX = "jsonapi"
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+        self.enabled = False
+        _caches.add(self)
+
+    @property
+    def cache(self):
+        return get_cache(self.alias)
+
+    @classmethod
+    def get_version_key(cls, model):
+        model = get_parent(model)
+        return "{}:version:{}.{}".format(
+            cls.KEY_PREFIX, model._meta.app_label, get_model_name(model))
+
+    def get_versions(self, models):
+        """ Get current versions of models.
+
+        Version is initialized with current time, so if version key is
+        evicted from cache, old responses would not be used.
+
+        """
+        keys = [self.get_version_key(model) for model in models]
+        versions = self.cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                self.cache.add(key, int(time.time() * 1000))
+                versions[key] = self.cache.get(key)
+        return [versions[key] for key in keys]
+
+    def get_key(self, resource, request, models, user=None, ids=None,
+                representation=None):
+        """ Get response cache key.
+
+        :param resource: resource to cache response for.
+        :param request: django request, query string, scheme and host are
+            used.
+        :param models: models response depends on.
+        :param user: user if resource output depends on it.
+        :param ids: requested ids.
+        :param representation: representation requested not in query
+            string, such as Accept header format.
+        :return str: key
+
+        """
+        parts = [
+            resource.Meta.name,
+            get_request_origin(request),
+            normalize_query(request.GET),
+            ",".join(ids or []),
+            user and user.pk,
+            representation,
+        ] + self.get_versions(models)
+        digest = hashlib.md5(
+            "|".join(six.text_type(p) for p in parts).encode('utf8'))
+        return "{}:response:{}".format(self.KEY_PREFIX, digest.hexdigest())
+
+    def get(self, key):
+        """ Get cached content.
+
+        :return: (content, is_stale), content is None if key is not found.
+
+        """
+        value = self.cache.get(key)
+        if value is None:
+            return None, False
+
+        expires, content = value
+        return content, expires < time.time()
+
+    def set(self, key, content, ttl, stale_ttl=None):
+        """ Store content in cache.
+
+        :param int ttl: seconds content is fresh.
+        :param stale_ttl: seconds content could be served after it expires
+            while it is being recalculated.
+
+        """
+        self.cache.set(
+            key, (time.time() + ttl, content), ttl + (stale_ttl or 0))
+
+    def get_variant(self, key, name):
+        """ Get cached variant of content, such as compressed one.
+
+        .. versionadded:: 0.10.0
+
+        :return: (content, is_stale), content is None if key is not found.
+
+        """
+        return self.get("{}:{}".format(key, name))
+
+    def set_variant(self, key, name, content, source=None, stale_ttl=None):
+        """ Store variant of cached content.
+
+        .. versionadded:: 0.10.0
+
+        Variant expires together with content it is made of. It is not stored
+        if content is not cached or cached content is changed.
+
+        :param bytes source: content variant is made of, it is not checked if
+            it is None.
+
+        """
+        value = self.cache.get(key)
+        if value is None or source is not None and value[1] != source:
+            return
+
+        expires = value[0]
+        self.cache.set(
+            "{}:{}".format(key, name), (expires, content),
+            max(expires - time.time(), 0) + (stale_ttl or 0))
+
+    def invalidate(self, *tags):
+        """ Increase versions of models from tags."""
+        if not self.enabled:
+            return
+
+        for model in {tag[1] for tag in tags}:
+            key = self.get_version_key(model)
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, int(time.time() * 1000))
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.exc_info = None
+
+
+class SingleFlight(object):
+
+    """ Coalesce concurrent calls with the same key.
+
+    The first caller (leader) executes function, the others wait for it and
+    share its result. If leader raises exception, it is raised in every
+    waiting thread. If leader does not finish within timeout, waiting thread
+    calls function itself.
+
+    :param timeout: seconds to wait for the leader, None for unlimited.
+    :type timeout: int or None
+
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args, **kwargs):
+        """ Call function(*args, **kwargs) once for concurrent callers."""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            if not call.event.wait(self.timeout):
+                return function(*args, **kwargs)
+            if call.exc_info is not None:
+                six.reraise(*call.exc_info)
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+        except Exception:
+            call.exc_info = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result
+
+
+_missing = object()
+# Caches are not kept alive by invalidation.
+_caches = weakref.WeakSet()
+
+#: Shared document cache, used if resource.Meta.document_cache is True.
+document_cache = LRUCache(maxsize=10000, ttl=300)
+
+
+def get_parent(model):
+    """ Get top parent of model, memoized version of inspector's one."""
+    try:
+        return _parents[model]
+    except KeyError:
+        parent = _parents[model] = _get_parent(model) or model
+        return parent
+
+
+_parents = {}
+
+
+def get_document_cache(value):
+    """ Get cache from Meta.document_cache value.
+
+    :param value: None, bool or LRUCache instance.
+    :return: LRUCache or None
+
+    """
+    if value is True:
+        return document_cache
+    if value is False:
+        return None
+    return value
+
+
+def normalize_query(querydict):
+    """ Get query string with sorted keys.
+
+    Order of values of the same key is kept, it is important for sort.
+
+    """
+    query = sorted((key, querydict.getlist(key)) for key in querydict.keys())
+    return urlencode(query, doseq=True)
+
+
+def get_request_origin(request):
+    """ Get scheme and host of request, links of response depend on them.
+
+    .. versionadded:: 0.10.0
+
+    API urls are shared by concurrent requests, so request itself is used.
+
+    """
+    return "{}://{}".format(
+        "https" if request.is_secure() else "http", request.get_host())
+
+
+def get_url_origin(url):
+    """ Get scheme and host of url.
+
+    .. versionadded:: 0.10.0
+
+    """
+    parts = six.moves.urllib.parse.urlsplit(url)
+    return "{}://{}".format(parts.scheme, parts.netloc)
+
+
+def get_instance_tag(model, pk):
+    """ Tag of model instance documents.
+
+    Parent model is used, documents of inherited models share primary key with
+    parent ones.
+
+    """
+    return ('instance', get_parent(model), pk)
+
+
+def get_document_tags(instance, fields_to_one=(), fields_to_many=()):
+    """ Tags of document cache entry.
+
+    Document depends on model instance itself, models it links to-one (if
+    linked model is deleted) and to-many (if linked model is changed).
+
+    """
+    tags = [get_instance_tag(type(instance), instance.pk)]
+    tags.extend(('to_one', get_parent(f.rel.to)) for f in fields_to_one)
+    tags.extend(
+        ('to_many', get_parent(f.related_model)) for f in fields_to_many)
+    return tags
+
+
+def register(cache):
+    """ Register object to be invalidated on model changes.
+
+    .. versionadded:: 0.10.0
+
+    :param cache: object with invalidate(*tags) method, it is referenced
+        weakly.
+
+    """
+    _caches.add(cache)
+
+
+def invalidate(*tags):
+    """ Invalidate tags in every cache."""
+    for cache in _caches:
+        cache.invalidate(*tags)
+
+
+def _get_through_models():
+    through_models = getattr(_get_through_models, 'result', None)
+    if through_models is None:
+        through_models = _get_through_models.result = {
+            field.rel.through
+            for model in get_models()
+            for field in model._meta.many_to_many
+        }
+    return through_models
+
+
+def _get_model_tags(model, pk, is_deleted=False):
+    model = get_parent(model)
+    tags = [('instance', model, pk), ('to_many', model)]
+    if is_deleted:
+        tags.append(('to_one', model))
+
+    # NOTE: through model change updates many-to-many links of both sides.
+    if model in _get_through_models():
+        tags.extend(
+            ('to_many', get_parent(field.rel.to))
+            for field in model._meta.fields if field.rel
+        )
+    return tags
+
+
+def on_post_save(sender, instance=None, **kwargs):
+    if _caches:
+        invalidate(*_get_model_tags(sender, instance.pk))
+
+
+def on_post_delete(sender, instance=None, **kwargs):
+    if _caches:
+        invalidate(*_get_model_tags(sender, instance.pk, is_deleted=True))
+
+
+def on_m2m_changed(sender, instance=None, action=None, model=None,
+                   pk_set=None, **kwargs):
+    if not _caches or action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    tags = _get_model_tags(type(instance), instance.pk)
+    if pk_set is None:
+        tags.append(('to_many', get_parent(model)))
+    else:
+        tags.extend(get_instance_tag(model, pk) for pk in pk_set)
+    invalidate(*tags)
+
+
+signals.post_save.connect(on_post_save, dispatch_uid='jsonapi.cache.save')
+signals.post_delete.connect(
+    on_post_delete, dispatch_uid='jsonapi.cache.delete')
+signals.m2m_changed.connect(on_m2m_changed, dispatch_uid='jsonapi.cache.m2m')
@@ -0,0 +1,74 @@
+""" Response compression.
+
+.. versionadded:: 0.10.0
+
+Encoding is negotiated with Accept-Encoding request header, gzip is preferred
+over deflate if client accepts both with the same quality. Output is
+deterministic (gzip header has zero modification time), so compressed
+content could be cached.
+
+"""
+import zlib
+
+ENCODINGS = {
+    # encoding name: zlib wbits
+    "gzip": 16 + zlib.MAX_WBITS,
+    "deflate": zlib.MAX_WBITS,
+}
+
+
+def get_encoding(accept_encoding):
+    """ Choose content encoding.
+
+    :param str accept_encoding: Accept-Encoding header value.
+    :return: "gzip", "deflate" or None
+
+    """
+    qualities = {}
+    for value in (accept_encoding or "").split(","):
+        parts = value.strip().split(";")
+        name = parts[0].strip().lower()
+        quality = 1.0
+        for param in parts[1:]:
+            key, _, param_value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(param_value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+
+    encodings = [
+        (qualities.get(name, qualities.get("*", 0.0)), -index, name)
+        for index, name in enumerate(("gzip", "deflate"))
+    ]
+    quality, _, name = max(encodings)
+    return name if quality > 0 else None
+
+
+def compress(content, encoding, level=6):
+    """ Compress content.
+
+    :param bytes content: content to compress.
+    :param str encoding: "gzip" or "deflate".
+    :param int level: compression level from 1 to 9.
+    :return bytes: compressed content.
+
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    return compressor.compress(content) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, level=6):
+    """ Compress streaming content.
+
+    :param chunks: iterable of bytes.
+    :return: generator of compressed chunks.
+
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
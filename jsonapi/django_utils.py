@@ -3,8 +3,9 @@
 Utils are used to work with different django versions.
 
 """
+import calendar
 import django
-from django.db import models
+from django.db import models, transaction
 from django.http import QueryDict
 from . import six
 
@@ -79,3 +80,89 @@ def get_models():
     else:
         from django.apps import apps
         return apps.get_models()
+
+
+def get_cache(alias):
+    """ Get django cache by alias.
+
+    Django 1.7 introduced caches handler, get_cache is deprecated.
+
+    """
+    if django.VERSION[:2] < (1, 7):
+        from django.core.cache import get_cache as _get_cache
+        return _get_cache(alias)
+    else:
+        from django.core.cache import caches
+        return caches[alias]
+
+
+def get_timestamp(value):
+    """ Get unix timestamp of datetime.
+
+    Naive datetime is considered to be in current time zone.
+
+    """
+    from django.utils import timezone
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.get_current_timezone())
+    return calendar.timegm(value.utctimetuple())
+
+
+def get_file_response(f, content_type):
+    """ Get streaming response of opened file, file is closed with it.
+
+    Django 1.8 introduced FileResponse, older versions stream file with
+    wsgiref FileWrapper.
+
+    .. versionadded:: 0.10.0
+
+    """
+    if django.VERSION[:2] < (1, 8):
+        from wsgiref.util import FileWrapper
+        from django.http import StreamingHttpResponse
+        response = StreamingHttpResponse(
+            FileWrapper(f, 65536), content_type=content_type)
+        # NOTE: the same attribute as in FileResponse.
+        response.file_to_stream = f
+        return response
+    else:
+        from django.http import FileResponse
+        return FileResponse(f, content_type=content_type)
+
+
+def on_commit(func):
+    """ Call function after commit of current transaction.
+
+    Django 1.9 introduced transaction.on_commit, function is called
+    immediately on older versions.
+
+    .. versionadded:: 0.10.0
+
+    """
+    if django.VERSION[:2] < (1, 9):
+        func()
+    else:
+        transaction.on_commit(func)
+
+
+def wrap_cursors(connection, wrap):
+    """ Wrap cursors created by connection.
+
+    Django 1.7+ creates cursors with make_cursor and make_debug_cursor,
+    older versions do not have make_cursor, connection.cursor is wrapped.
+
+    .. versionadded:: 0.10.0
+
+    :param wrap: function, it gets cursor and returns wrapped one.
+
+    """
+    def wrapper(method):
+        def wrapped(*args):
+            return wrap(method(*args))
+        return wrapped
+
+    if not hasattr(connection, 'make_cursor'):
+        connection.cursor = wrapper(connection.cursor)
+    else:
+        connection.make_cursor = wrapper(connection.make_cursor)
+        connection.make_debug_cursor = wrapper(connection.make_debug_cursor)
@@ -0,0 +1,273 @@
+""" JSON encoder backends.
+
+.. versionadded:: 0.10.0
+
+Backend converts document to bytes. Values, not supported by JSON, are
+converted with type dispatch table CONVERTERS: datetime, date and time are
+converted to isoformat, Decimal to float, UUID and lazy strings to string.
+
+Backends produce identical output: compact separators, not escaped unicode.
+Default backend is based on orjson if it is installed, otherwise on standard
+library json module. Backend could be set per API and per resource:
+
+.. code-block:: python
+
+    api = API(encoder=StdlibEncoderBackend())
+
+    @api.register
+    class AuthorResource(Resource):
+        class Meta:
+            model = 'testapp.Author'
+            encoder = OrjsonEncoderBackend()
+
+Meta.encoder could also be json.JSONEncoder subclass for backward
+compatibility. Documents could be encoded separately and joined with
+EncoderBackend.dumps_document, it is used for documents from cache. NaN and
+Infinity are not valid JSON and are not supported.
+
+MsgpackEncoderBackend encodes documents to MessagePack, API uses it if
+client accepts application/msgpack media type.
+
+"""
+import datetime
+import decimal
+import json
+import re
+import uuid
+
+from django.utils.encoding import force_text
+from django.utils.functional import Promise
+
+from . import six
+from . import messagepack
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+CONVERTERS = {
+    datetime.datetime: _isoformat,
+    datetime.date: _isoformat,
+    datetime.time: _isoformat,
+    decimal.Decimal: float,
+    uuid.UUID: str,
+    Promise: force_text,
+}
+
+_converters_cache = {}
+
+
+def get_converter(type_):
+    """ Get converter for type or its closest parent from CONVERTERS.
+
+    :return: function or None
+
+    """
+    try:
+        return _converters_cache[type_]
+    except KeyError:
+        converter = next((
+            CONVERTERS[klass] for klass in type_.__mro__
+            if klass in CONVERTERS
+        ), None)
+        _converters_cache[type_] = converter
+        return converter
+
+
+def default(o):
+    """ Convert value not supported by JSON.
+
+    :raise TypeError: if value could not be converted.
+
+    """
+    converter = get_converter(type(o))
+    if converter is None:
+        raise TypeError("{!r} is not JSON serializable".format(o))
+    return converter(o)
+
+
+def _orjson_default(o):
+    """ Convert value for orjson.
+
+    Subclasses of str, int, list and dict are passed to default function,
+    orjson serializes list subclasses (django ErrorList) by their internal
+    list, which might be empty.
+
+    """
+    converter = get_converter(type(o))
+    if converter is not None:
+        return converter(o)
+    if isinstance(o, dict):
+        return dict(o)
+    if isinstance(o, list):
+        return list(o)
+    if isinstance(o, six.text_type):
+        return six.text_type.__str__(o)
+    if isinstance(o, six.integer_types):
+        return int(o)
+    raise TypeError("{!r} is not JSON serializable".format(o))
+
+
+class Fragment(bytes):
+
+    """ Encoded JSON value, it is inserted to the document as is."""
+
+
+class EncoderBackend(object):
+
+    """ Base encoder backend.
+
+    .. versionchanged:: 0.10.0
+        content_type and fragments attributes. Backend supports fragments if
+        document could be joined from JSON encoded fragments.
+
+    """
+
+    name = None
+    content_type = "application/vnd.api+json"
+    fragments = True
+
+    def dumps(self, obj):
+        """ Encode object.
+
+        :return bytes: encoded object.
+
+        """
+        raise NotImplementedError()
+
+    def dumps_document(self, document):
+        """ Encode document, lists of fragments are joined without encoding.
+
+        Output is the same as dumps output for not encoded document.
+
+        :param dict document: document with lists of dicts or Fragments.
+        :return bytes: encoded document.
+
+        """
+        members = []
+        for key, value in document.items():
+            if isinstance(value, list) and value and \
+                    isinstance(value[0], Fragment):
+                encoded = b'[' + b','.join(value) + b']'
+            else:
+                encoded = self.dumps(value)
+            members.append(self.dumps(key) + b':' + encoded)
+        return b'{' + b','.join(members) + b'}'
+
+
+class StdlibEncoderBackend(EncoderBackend):
+
+    """ Encoder backend based on standard library json module.
+
+    :param cls: json.JSONEncoder subclass, default values converter is used
+        if not set.
+
+    """
+
+    name = "json"
+
+    def __init__(self, cls=None):
+        self.cls = cls
+        options = dict(ensure_ascii=False, separators=(',', ':'))
+        if cls is None:
+            self.encoder = json.JSONEncoder(default=default, **options)
+        else:
+            self.encoder = cls(**options)
+
+    def dumps(self, obj):
+        result = self.encoder.encode(obj)
+        if isinstance(result, six.text_type):
+            result = result.encode('utf8')
+        return result
+
+
+class OrjsonEncoderBackend(EncoderBackend):
+
+    """ Encoder backend based on orjson library.
+
+    Output is the same as StdlibEncoderBackend one. Objects, which are
+    encoded differently (floats in exponent notation, integers longer than 64
+    bits), are encoded with standard library.
+
+    """
+
+    name = "orjson"
+    RE_EXPONENT = re.compile(br'[:,\[]-?\d+(?:\.\d+)?e-?\d')
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+        self.options = orjson.OPT_NON_STR_KEYS | \
+            orjson.OPT_PASSTHROUGH_DATETIME | \
+            orjson.OPT_PASSTHROUGH_SUBCLASS
+        self.fallback = StdlibEncoderBackend()
+
+    def dumps(self, obj):
+        try:
+            result = orjson.dumps(
+                obj, default=_orjson_default, option=self.options)
+        except TypeError:
+            return self.fallback.dumps(obj)
+
+        # NOTE: orjson writes 1e16 and 1e-7 as they are, json writes 1e+16
+        # and 1e-07. Pattern could be found in strings too (",1e5"), it is
+        # fine to encode such object with slower backend.
+        if self.RE_EXPONENT.search(result) is not None:
+            return self.fallback.dumps(obj)
+
+        return result
+
+
+class MsgpackEncoderBackend(EncoderBackend):
+
+    """ Encoder backend for MessagePack format.
+
+    msgpack library is used if it is installed, otherwise pure python encoder
+    from jsonapi.messagepack is used.
+
+    """
+
+    name = "msgpack"
+    content_type = "application/msgpack"
+    media_types = ("application/msgpack", "application/x-msgpack")
+    fragments = False
+
+    def dumps(self, obj):
+        return messagepack.packb(obj, default=default)
+
+    def dumps_document(self, document):
+        return self.dumps(document)
+
+
+def get_default_backend():
+    """ Get the fastest available backend."""
+    if orjson is not None:
+        return OrjsonEncoderBackend()
+    return StdlibEncoderBackend()
+
+
+def get_backend(value, default_backend=None):
+    """ Get backend from API or Meta encoder value.
+
+    :param value: EncoderBackend instance, json.JSONEncoder subclass or None.
+    :param default_backend: backend to use if value is None.
+    :return EncoderBackend:
+
+    """
+    if value is None:
+        return default_backend or get_default_backend()
+    if isinstance(value, type) and issubclass(value, json.JSONEncoder):
+        if value not in _encoder_backends:
+            _encoder_backends[value] = StdlibEncoderBackend(cls=value)
+        return _encoder_backends[value]
+    return value
+
+
+_encoder_backends = {}
@@ -0,0 +1,341 @@
+""" Bulk write and export jobs.
+
+.. versionadded:: 0.10.0
+
+POST or PUT request with "Prefer: respond-async" header is not processed
+immediately. Request body is copied to spool directory and request is
+processed by API background worker pool with the same bulk write path.
+Response is 202 Accepted with job document, job state is available at
+<api url>/jobs/<job id>.
+
+GET request to <api url>/<resource>/export is processed as export job, see
+API.handler_view_export. Export job id is derived from request, documents are
+written to NDJSON file next to job state. Export of the same query made with
+older data is deleted when new one is finished.
+
+Job state is stored in JSON file next to request body, so there is no broker
+and jobs are processed by threads of the process, which accepted them.
+
+Bulk write is stopped at the first invalid item, like synchronous request,
+so errors of failed job contain only this item. With commit=chunk query
+parameter chunks saved before it are kept, result has their ids. Errors of
+unexpected exceptions are logged, job document has generic error only.
+
+Files of jobs not updated for API job_ttl seconds are deleted. Queued or
+running job not updated for API job_timeout seconds is failed when it is
+read: process, which accepted it, is probably stopped.
+
+Job document:
+
+.. code-block:: python
+
+    {
+        "id": "<job id>",
+        "resource": "author",
+        "method": "POST",
+        "status": "queued",  # running, finished, failed
+        "created": "2015-01-01T00:00:00+00:00",
+        "updated": "2015-01-01T00:00:00+00:00",
+        "progress": {"processed": 0},
+        "errors": [],  # errors of failed job
+        "result": None,  # {"ids": [...], "meta": {...}} of finished job
+    }
+
+"""
+import errno
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+
+from .utils import atomic_write, makedirs
+
+
+class JobRequest(HttpRequest):
+
+    """ Request of spooled job.
+
+    Request has method, query string and content headers of original one,
+    body is read from spool file.
+
+    :param dict job: job state.
+    :param stream: spooled request body.
+
+    """
+
+    def __init__(self, job, stream):
+        super(JobRequest, self).__init__()
+        self.method = job["method"]
+        self.path = job["path"]
+        self.GET = QueryDict(job["query"])
+        self.META = {
+            "CONTENT_TYPE": job["content_type"],
+            "CONTENT_LENGTH": str(job["content_length"]),
+            "HTTP_HOST": job["host"],
+        }
+        self._stream = stream
+        self._read_started = False
+
+
+class JobStore(object):
+
+    """ Storage of jobs in local directory.
+
+    .. versionchanged:: 0.10.0
+        ttl and timeout parameters.
+
+    :param str directory: spool directory, temporary directory by default.
+    :param int ttl: seconds files of not updated job are kept.
+    :param int timeout: seconds queued or running job could be not updated,
+        it is failed after that.
+
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_FINISHED = "finished"
+    STATUS_FAILED = "failed"
+
+    RE_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+    # Members of job document, other members are used to restore request.
+    DOCUMENT_MEMBERS = (
+        "id", "resource", "method", "status", "created", "updated",
+        "progress", "errors", "result",
+    )
+
+    # Seconds between deletions of expired files.
+    EXPIRE_INTERVAL = 60
+
+    def __init__(self, directory=None, ttl=86400, timeout=3600):
+        self._directory = directory
+        self.ttl = ttl
+        self.timeout = timeout
+        self._expired = 0
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            self._directory = os.path.join(
+                tempfile.gettempdir(), "jsonapi-jobs")
+        return makedirs(self._directory)
+
+    def get_path(self, job_id, extension):
+        return os.path.join(self.directory, "{}.{}".format(job_id, extension))
+
+    def create(self, request, resource, user=None, ids=None, job_id=None,
+               series=None):
+        """ Spool request body and create queued job.
+
+        Body of POST and PUT requests is copied from request stream, it is
+        not loaded to memory.
+
+        .. versionchanged:: 0.10.0
+            job_id parameter, random id is generated by default.
+
+        .. versionchanged:: 0.10.0
+            series parameter, see set_latest.
+
+        :return dict: job
+
+        """
+        self.expire()
+        now = timezone.now().isoformat()
+        job = {
+            "id": job_id or uuid.uuid4().hex,
+            "resource": resource.Meta.name,
+            "method": request.method,
+            "status": self.STATUS_QUEUED,
+            "created": now,
+            "updated": now,
+            "progress": {"processed": 0},
+            "errors": [],
+            "result": None,
+            "user": user and user.pk,
+            "ids": ids,
+            "path": request.path,
+            "query": request.META.get('QUERY_STRING', ''),
+            "host": request.get_host(),
+            "content_type": request.META.get('CONTENT_TYPE', ''),
+            "series": series,
+        }
+        job["content_length"] = 0
+        if request.method in ("POST", "PUT"):
+            with open(self.get_path(job["id"], "body"), "wb") as f:
+                shutil.copyfileobj(request, f, 65536)
+                job["content_length"] = f.tell()
+
+        self.save(job)
+        return job
+
+    def get(self, job_id):
+        """ Get job.
+
+        .. versionchanged:: 0.10.0
+            Expired job is not returned, interrupted job is failed.
+
+        :return: job or None if it does not exist.
+
+        """
+        if not self.RE_JOB_ID.match(job_id):
+            return None
+
+        try:
+            with open(self.get_path(job_id, "json")) as f:
+                job = json.load(f)
+                age = time.time() - os.fstat(f.fileno()).st_mtime
+        except (IOError, OSError, ValueError):
+            return None
+
+        if age > self.ttl:
+            return None
+
+        if age > self.timeout and job["status"] in (
+                self.STATUS_QUEUED, self.STATUS_RUNNING):
+            self.delete_body(job)
+            self.update(
+                job, status=self.STATUS_FAILED,
+                errors=[{"detail": "Job is interrupted"}])
+        return job
+
+    def save(self, job):
+        """ Save job state atomically."""
+        path = self.get_path(job["id"], "json")
+        job["updated"] = timezone.now().isoformat()
+        with atomic_write(path) as f:
+            json.dump(job, f)
+
+    def update(self, job, **kwargs):
+        """ Update job members and save it."""
+        job.update(kwargs)
+        self.save(job)
+
+    def open_body(self, job):
+        if not job["content_length"]:
+            return io.BytesIO()
+        return open(self.get_path(job["id"], "body"), "rb")
+
+    def delete_body(self, job):
+        try:
+            os.remove(self.get_path(job["id"], "body"))
+        except OSError:
+            pass
+
+    def delete(self, job_id):
+        """ Delete files of job.
+
+        .. versionadded:: 0.10.0
+
+        """
+        for extension in ("json", "body", "ndjson"):
+            try:
+                os.remove(self.get_path(job_id, extension))
+            except OSError:
+                pass
+
+    @contextmanager
+    def lock(self, name, timeout=10):
+        """ Lock name with lock file, so it is locked for other processes.
+
+        .. versionadded:: 0.10.0
+
+        Lock file older than timeout seconds is considered abandoned.
+
+        """
+        path = self.get_path(name, "lock")
+        while True:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+
+            try:
+                if time.time() - os.path.getmtime(path) > timeout:
+                    os.remove(path)
+            except OSError:
+                # Lock is released.
+                pass
+            time.sleep(0.01)
+
+        try:
+            yield
+        finally:
+            os.remove(path)
+
+    def set_latest(self, job):
+        """ Set job as the latest one of its series, delete superseded job.
+
+        .. versionadded:: 0.10.0
+
+        Exports of the same query with different data are series, only the
+        latest created one is kept.
+
+        :return bool: False if job itself is superseded and deleted.
+
+        """
+        path = self.get_path(job["series"], "latest")
+        with self.lock(job["series"]):
+            try:
+                with open(path) as f:
+                    latest = json.load(f)
+            except (IOError, OSError, ValueError):
+                latest = None
+
+            if latest is not None and latest["id"] != job["id"]:
+                if latest["created"] > job["created"]:
+                    self.delete(job["id"])
+                    return False
+                self.delete(latest["id"])
+
+            with atomic_write(path) as f:
+                json.dump({"id": job["id"], "created": job["created"]}, f)
+        return True
+
+    def expire(self):
+        """ Delete files of jobs, which are not updated for ttl seconds.
+
+        .. versionadded:: 0.10.0
+
+        Directory is scanned at most once per EXPIRE_INTERVAL seconds.
+
+        """
+        now = time.time()
+        if now - self._expired < self.EXPIRE_INTERVAL:
+            return
+        self._expired = now
+
+        directory = self.directory
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            try:
+                if now - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+            except OSError:
+                # File is deleted by other process.
+                pass
+
+    @classmethod
+    def get_document(cls, job):
+        """ Get public job document."""
+        return {key: job[key] for key in cls.DOCUMENT_MEMBERS}
+
+
+def prefers_async(request):
+    """ Check if request has Prefer: respond-async header.
+
+    :return bool:
+
+    """
+    return any(
+        preference.split(";")[0].strip().lower() == "respond-async"
+        for preference in request.META.get('HTTP_PREFER', '').split(",")
+    )
@@ -0,0 +1,53 @@
+""" Merge profile dumps of resource into single report.
+
+.. versionadded:: 0.10.0
+
+"""
+from optparse import make_option
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import six
+from ...profiling import get_dumps
+
+
+class Command(BaseCommand):
+    args = "<directory> <resource>"
+    help = "Show merged cProfile dumps of resource requests."
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--method', default=None,
+            help="HTTP method of requests, all methods by default."),
+        make_option(
+            '--sort', default='cumulative',
+            help="Sort key of stats, cumulative by default."),
+        make_option(
+            '--limit', type='int', default=30,
+            help="Number of functions to show."),
+        make_option(
+            '--output', default=None,
+            help="Path to save merged profile for other tools."),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 2:
+            raise CommandError("Usage: jsonapi_profile {}".format(self.args))
+
+        directory, resource_name = args
+        paths = get_dumps(directory, resource_name, method=options['method'])
+        if not paths:
+            raise CommandError("There are no dumps of resource {}".format(
+                resource_name))
+
+        stream = six.StringIO()
+        stats = pstats.Stats(paths[0], stream=stream)
+        for path in paths[1:]:
+            stats.add(path)
+
+        if options['output']:
+            stats.dump_stats(options['output'])
+
+        stats.sort_stats(options['sort']).print_stats(options['limit'])
+        self.stdout.write("{} requests".format(len(paths)))
+        self.stdout.write(stream.getvalue())
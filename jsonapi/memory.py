@@ -0,0 +1,188 @@
+""" Memory accounting of requests with tracemalloc.
+
+.. versionadded:: 0.10.0
+
+Accounting is enabled with API memory parameter, it requires python 3.4+.
+API.handler_view starts memory trace for the current thread, Resource.get
+records "query" and "serialize" phases. Memory trace is sent with
+signal_response_trace as memory argument:
+
+.. code-block:: python
+
+    {
+        "allocated": 1024,  # bytes allocated and not freed during request
+        "peak": 4096,  # peak of allocated bytes during request
+        "phases": {"query": 512, "serialize": 3584},  # peaks of phases
+        "top": [{"site": "jsonapi/serializers.py:120", "size": 2048,
+                 "count": 10}],
+    }
+
+Requests with peak over API memory_threshold are logged with query string.
+The largest allocation sites are found by comparison of snapshots, which is
+slow, so they are reported for every API memory_top_rate-th request only,
+"top" is empty for other requests.
+
+tracemalloc traces the whole process, so allocations of concurrent threads
+are accounted too. Peaks require python 3.9+ (tracemalloc.reset_peak), on
+older versions the largest allocated size on phase boundaries is used.
+Tracing slows allocations down, do not enable it for all of the workers.
+
+"""
+import itertools
+import logging
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .utils import LocalValue
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+logger = logging.getLogger(__name__)
+
+_current = LocalValue()
+_counter = itertools.count(1)
+
+
+class MemoryTrace(object):
+
+    """ Allocated memory of request.
+
+    :param int top: number of the largest allocation sites to report, sites
+        are found by comparison of snapshots, 0 to skip them.
+
+    """
+
+    def __init__(self, top=10):
+        self.top = top
+        self.started = self.peak = tracemalloc.get_traced_memory()[0]
+        self.phases = OrderedDict()
+        self.stack = []  # [name, allocated at start, peak]
+        self.snapshot = self.take_snapshot() if top else None
+        self.update()
+
+    @staticmethod
+    def take_snapshot():
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ])
+
+    def update(self):
+        """ Update peaks of request and current phases.
+
+        :return int: allocated bytes.
+
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            peak = current
+
+        self.peak = max(self.peak, peak)
+        for item in self.stack:
+            item[2] = max(item[2], peak)
+        return current
+
+    @contextmanager
+    def phase(self, name):
+        current = self.update()
+        item = [name, current, current]
+        self.stack.append(item)
+        try:
+            yield
+        finally:
+            self.update()
+            self.stack.remove(item)
+            self.phases[name] = max(
+                self.phases.get(name, 0), item[2] - current)
+
+    def finish(self):
+        """ Get memory trace as dictionary."""
+        current = self.update()
+        top = []
+        if self.snapshot is not None:
+            for stat in self.take_snapshot().compare_to(
+                    self.snapshot, 'lineno')[:self.top]:
+                frame = stat.traceback[0]
+                top.append({
+                    "site": "{}:{}".format(
+                        os.path.relpath(frame.filename), frame.lineno),
+                    "size": stat.size_diff,
+                    "count": stat.count_diff,
+                })
+
+        return {
+            "allocated": current - self.started,
+            "peak": self.peak - self.started,
+            "phases": self.phases,
+            "top": top,
+        }
+
+
+def start(top=10, rate=None):
+    """ Start memory trace of current thread, tracemalloc is started if it
+    is not tracing yet.
+
+    :param int top: number of the largest allocation sites to report.
+    :param int rate: report allocation sites of every rate-th trace only,
+        they are reported for every trace if it is None.
+    :return: MemoryTrace or None if tracemalloc is not available.
+
+    """
+    if tracemalloc is None:
+        return None
+
+    if top and rate is not None and next(_counter) % rate != 0:
+        top = 0
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return _current.set(MemoryTrace(top=top))
+
+
+def stop():
+    """ Stop memory trace of current thread.
+
+    :return: dictionary of MemoryTrace.finish or None if it is not started.
+
+    """
+    trace = _current.pop()
+    return trace.finish() if trace is not None else None
+
+
+def get():
+    return _current.get()
+
+
+@contextmanager
+def phase(name):
+    """ Record peak of allocated memory of code block."""
+    trace = get()
+    if trace is None:
+        yield
+        return
+
+    with trace.phase(name):
+        yield
+
+
+def check(request, result, threshold):
+    """ Log request if its peak is over threshold.
+
+    :param dict result: memory trace, see MemoryTrace.finish.
+    :param int threshold: bytes, requests are not logged if it is None.
+
+    """
+    if result is None or threshold is None or result["peak"] <= threshold:
+        return
+
+    logger.warning(
+        "Request %s %s peak memory is %s bytes, top allocations: %s",
+        request.method, request.get_full_path(), result["peak"],
+        ", ".join("{site} {size}".format(**site) for site in result["top"]))
@@ -0,0 +1,255 @@
+""" MessagePack serialization.
+
+.. versionadded:: 0.10.0
+
+Module has pure python encoder and decoder of MessagePack format without
+extension types. If msgpack library is installed, it is used instead.
+Strings are packed with str family, bytes with bin family. Values, which are
+not supported by MessagePack, are converted with default function.
+
+"""
+import struct
+
+from . import six
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def _pack(obj, default, chunks):
+    append = chunks.append
+    if obj is None:
+        append(b'\xc0')
+    elif obj is True:
+        append(b'\xc3')
+    elif obj is False:
+        append(b'\xc2')
+    elif isinstance(obj, six.integer_types):
+        if 0 <= obj < 0x80:
+            append(struct.pack('B', obj))
+        elif -0x20 <= obj < 0:
+            append(struct.pack('b', obj))
+        elif 0 <= obj <= 0xff:
+            append(struct.pack('>BB', 0xcc, obj))
+        elif 0 <= obj <= 0xffff:
+            append(struct.pack('>BH', 0xcd, obj))
+        elif 0 <= obj <= 0xffffffff:
+            append(struct.pack('>BI', 0xce, obj))
+        elif 0 <= obj <= 0xffffffffffffffff:
+            append(struct.pack('>BQ', 0xcf, obj))
+        elif -0x80 <= obj < 0:
+            append(struct.pack('>Bb', 0xd0, obj))
+        elif -0x8000 <= obj < 0:
+            append(struct.pack('>Bh', 0xd1, obj))
+        elif -0x80000000 <= obj < 0:
+            append(struct.pack('>Bi', 0xd2, obj))
+        elif -0x8000000000000000 <= obj < 0:
+            append(struct.pack('>Bq', 0xd3, obj))
+        else:
+            raise ValueError("Integer {} is out of range".format(obj))
+    elif isinstance(obj, float):
+        append(struct.pack('>Bd', 0xcb, obj))
+    elif isinstance(obj, six.text_type) or \
+            six.PY2 and isinstance(obj, bytes):
+        data = obj.encode('utf8') if isinstance(obj, six.text_type) else obj
+        length = len(data)
+        if length < 0x20:
+            append(struct.pack('B', 0xa0 | length))
+        elif length <= 0xff:
+            append(struct.pack('>BB', 0xd9, length))
+        elif length <= 0xffff:
+            append(struct.pack('>BH', 0xda, length))
+        else:
+            append(struct.pack('>BI', 0xdb, length))
+        append(data)
+    elif isinstance(obj, (bytes, bytearray)):
+        length = len(obj)
+        if length <= 0xff:
+            append(struct.pack('>BB', 0xc4, length))
+        elif length <= 0xffff:
+            append(struct.pack('>BH', 0xc5, length))
+        else:
+            append(struct.pack('>BI', 0xc6, length))
+        append(bytes(obj))
+    elif isinstance(obj, (list, tuple)):
+        length = len(obj)
+        if length < 0x10:
+            append(struct.pack('B', 0x90 | length))
+        elif length <= 0xffff:
+            append(struct.pack('>BH', 0xdc, length))
+        else:
+            append(struct.pack('>BI', 0xdd, length))
+        for value in obj:
+            _pack(value, default, chunks)
+    elif isinstance(obj, dict):
+        length = len(obj)
+        if length < 0x10:
+            append(struct.pack('B', 0x80 | length))
+        elif length <= 0xffff:
+            append(struct.pack('>BH', 0xde, length))
+        else:
+            append(struct.pack('>BI', 0xdf, length))
+        for key, value in obj.items():
+            _pack(key, default, chunks)
+            _pack(value, default, chunks)
+    elif default is not None:
+        _pack(default(obj), default, chunks)
+    else:
+        raise TypeError("{!r} is not MessagePack serializable".format(obj))
+
+
+def _packb(obj, default=None):
+    """ Pack object with pure python encoder."""
+    chunks = []
+    _pack(obj, default, chunks)
+    return b''.join(chunks)
+
+
+class _Unpacker(object):
+
+    """ Pure python decoder."""
+
+    # type byte: value
+    FIXED = {
+        0xc0: None, 0xc2: False, 0xc3: True,
+    }
+    # type byte: struct format of value
+    NUMBERS = {
+        0xca: '>f', 0xcb: '>d',
+        0xcc: '>B', 0xcd: '>H', 0xce: '>I', 0xcf: '>Q',
+        0xd0: '>b', 0xd1: '>h', 0xd2: '>i', 0xd3: '>q',
+    }
+    # type byte: struct format of length
+    LENGTHS = {
+        0xc4: '>B', 0xc5: '>H', 0xc6: '>I',  # bin
+        0xd9: '>B', 0xda: '>H', 0xdb: '>I',  # str
+        0xdc: '>H', 0xdd: '>I',  # array
+        0xde: '>H', 0xdf: '>I',  # map
+    }
+
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def read(self, size):
+        start = self.position
+        self.position += size
+        if self.position > len(self.data):
+            raise ValueError("Unexpected end of data")
+        return self.data[start:self.position]
+
+    def read_struct(self, fmt):
+        return struct.unpack(fmt, self.read(struct.calcsize(fmt)))[0]
+
+    def unpack(self):
+        code = self.read_struct('B')
+        if code <= 0x7f:
+            return code
+        if code >= 0xe0:
+            return code - 0x100
+        if 0x80 <= code <= 0x8f:
+            return self.unpack_map(code & 0x0f)
+        if 0x90 <= code <= 0x9f:
+            return self.unpack_array(code & 0x0f)
+        if 0xa0 <= code <= 0xbf:
+            return self.unpack_str(code & 0x1f)
+        if code in self.FIXED:
+            return self.FIXED[code]
+        if code in self.NUMBERS:
+            return self.read_struct(self.NUMBERS[code])
+        if code in self.LENGTHS:
+            length = self.read_struct(self.LENGTHS[code])
+            if code <= 0xc6:
+                return self.read(length)
+            if code <= 0xdb:
+                return self.unpack_str(length)
+            if code <= 0xdd:
+                return self.unpack_array(length)
+            return self.unpack_map(length)
+        raise ValueError("Type 0x{:02x} is not supported".format(code))
+
+    def unpack_str(self, length):
+        return self.read(length).decode('utf8')
+
+    def unpack_array(self, length):
+        return [self.unpack() for _ in range(length)]
+
+    def unpack_map(self, length):
+        result = {}
+        for _ in range(length):
+            key = self.unpack()
+            result[key] = self.unpack()
+        return result
+
+
+def _unpackb(data):
+    """ Unpack object with pure python decoder."""
+    unpacker = _Unpacker(data)
+    try:
+        result = unpacker.unpack()
+    except (TypeError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(str(e))
+    if unpacker.position != len(data):
+        raise ValueError("Extra data")
+    return result
+
+
+def _get_strict_default(default):
+    """ Get default function for msgpack strict_types mode.
+
+    msgpack packs list subclasses (django ErrorList) by their internal list,
+    which might be empty. In strict mode subclasses and tuples are passed to
+    default function and converted to built-in types here.
+
+    """
+    def strict_default(o):
+        if isinstance(o, dict):
+            return dict(o)
+        if isinstance(o, (list, tuple)):
+            return list(o)
+        if isinstance(o, six.text_type):
+            # NOTE: slice of str subclass is str.
+            return o[:]
+        if isinstance(o, six.integer_types):
+            return int(o)
+        if isinstance(o, float):
+            return float(o)
+        if isinstance(o, bytes):
+            return bytes(o)
+        if default is None:
+            raise TypeError("{!r} is not MessagePack serializable".format(o))
+        return default(o)
+    return strict_default
+
+
+def packb(obj, default=None):
+    """ Pack object to MessagePack.
+
+    :param default: function to convert not supported values.
+    :return bytes: packed object
+
+    """
+    if msgpack is not None:
+        return msgpack.packb(
+            obj, default=_get_strict_default(default), use_bin_type=True,
+            strict_types=True)
+    return _packb(obj, default=default)
+
+
+def unpackb(data):
+    """ Unpack MessagePack data.
+
+    :return: unpacked object
+    :raise ValueError: data is not valid.
+
+    """
+    if msgpack is not None:
+        try:
+            return msgpack.unpackb(data, raw=False)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(str(e))
+    return _unpackb(data)
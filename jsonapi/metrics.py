@@ -0,0 +1,219 @@
+""" Metrics of requests in Prometheus text format.
+
+.. versionadded:: 0.10.0
+
+Registry is enabled with API metrics parameter. API.handler_view records
+every request to it and metrics are available at <api url>/metrics:
+
+.. code-block:: python
+
+    api = API(metrics=True)
+
+Metrics:
+
+* jsonapi_requests_total: counter by resource, method and status.
+* jsonapi_errors_total: counter of JSONAPIError responses by resource,
+  method and error code.
+* jsonapi_request_duration_seconds: histogram by resource and method.
+* jsonapi_response_size_bytes: histogram of response body sizes.
+* jsonapi_request_queries: histogram of number of SQL queries.
+
+Metrics are aggregated per process. With API metrics_dir parameter every
+process writes its metrics to own file in this directory at most once per
+flush interval, and endpoint shows sum of all of the files, so any worker of
+multi-process server returns the same numbers. Clean directory on server
+start.
+
+"""
+import bisect
+import json
+import os
+import threading
+
+from .timings import clock
+from .utils import atomic_write, makedirs
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERIES_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# name -> (type, description, buckets)
+METRICS = {
+    "jsonapi_requests_total": (
+        "counter", "Number of requests.", None),
+    "jsonapi_errors_total": (
+        "counter", "Number of JSONAPIError responses.", None),
+    "jsonapi_request_duration_seconds": (
+        "histogram", "Duration of requests.", DURATION_BUCKETS),
+    "jsonapi_response_size_bytes": (
+        "histogram", "Size of response bodies.", SIZE_BUCKETS),
+    "jsonapi_request_queries": (
+        "histogram", "Number of SQL queries of requests.", QUERIES_BUCKETS),
+}
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _format_labels(labels):
+    return ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace(
+            '"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+
+
+class MetricsRegistry(object):
+
+    """ Counters and histograms of requests.
+
+    Values are stored by (name, labels) key, labels is sorted tuple of
+    (label, value) pairs. Histogram value is list of bucket counts (not
+    cumulative, the last one is +Inf) and sum.
+
+    :param str directory: directory of shared metrics files, metrics are not
+        shared if it is None.
+    :param float flush_interval: seconds between writes of metrics file.
+
+    """
+
+    def __init__(self, directory=None, flush_interval=1):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.values = {}
+        self.lock = threading.Lock()
+        self.flushed = None
+
+    @property
+    def path(self):
+        return os.path.join(
+            makedirs(self.directory), "metrics.{}.json".format(os.getpid()))
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.values.get(key)
+            if histogram is None:
+                histogram = self.values[key] = [0] * (len(buckets) + 2)
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-1] += value
+
+    def record(self, request, response, duration, resource=None,
+               error=None, queries=None):
+        """ Record request.
+
+        :param resource: resource of request.
+        :param error: JSONAPIError of response.
+        :param dict queries: SQL queries log, see jsonapi.queries.
+
+        """
+        labels = {
+            "resource": resource.Meta.name if resource is not None else "",
+            "method": request.method,
+        }
+        self.inc("jsonapi_requests_total", dict(
+            labels, status=response.status_code))
+        if error is not None:
+            self.inc("jsonapi_errors_total", dict(labels, code=error.code))
+        self.observe("jsonapi_request_duration_seconds", labels, duration)
+
+        if response.streaming:
+            size = response.get('Content-Length')
+        else:
+            size = len(response.content)
+        if size is not None:
+            self.observe("jsonapi_response_size_bytes", labels, int(size))
+
+        if queries is not None:
+            self.observe("jsonapi_request_queries", labels, queries["count"])
+
+        if self.directory is not None and (
+                self.flushed is None or
+                clock() - self.flushed >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """ Write metrics of process to shared file atomically."""
+        with self.lock:
+            values = [[name, labels, value]
+                      for (name, labels), value in self.values.items()]
+            self.flushed = clock()
+
+        with atomic_write(self.path) as f:
+            json.dump(values, f)
+
+    def collect(self):
+        """ Get values of all of the processes.
+
+        :return dict: values by (name, labels) key.
+
+        """
+        if self.directory is None:
+            with self.lock:
+                return {key: list(value) if isinstance(value, list) else value
+                        for key, value in self.values.items()}
+
+        self.flush()
+        result = {}
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith("metrics.") and
+                    filename.endswith(".json")):
+                continue
+
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    values = json.load(f)
+            except (IOError, OSError, ValueError):
+                continue
+
+            for name, labels, value in values:
+                key = (name, tuple(tuple(label) for label in labels))
+                if isinstance(value, list):
+                    current = result.setdefault(key, [0] * len(value))
+                    result[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    result[key] = result.get(key, 0) + value
+        return result
+
+    def render(self):
+        """ Get metrics in Prometheus text format."""
+        values = self.collect()
+        lines = []
+        for name in sorted(METRICS):
+            metric_type, description, buckets = METRICS[name]
+            lines.append("# HELP {} {}".format(name, description))
+            lines.append("# TYPE {} {}".format(name, metric_type))
+            for (key_name, labels), value in sorted(values.items()):
+                if key_name != name:
+                    continue
+
+                if metric_type == "counter":
+                    lines.append("{}{{{}}} {}".format(
+                        name, _format_labels(labels), _format_value(value)))
+                    continue
+
+                count = 0
+                for bucket, bucket_count in zip(
+                        buckets + ("+Inf",), value[:-1]):
+                    count += bucket_count
+                    lines.append("{}_bucket{{{}}} {}".format(
+                        name, _format_labels(labels + (("le", bucket),)),
+                        count))
+                lines.append("{}_sum{{{}}} {}".format(
+                    name, _format_labels(labels), _format_value(value[-1])))
+                lines.append("{}_count{{{}}} {}".format(
+                    name, _format_labels(labels), count))
+
+        return "\n".join(lines) + "\n"
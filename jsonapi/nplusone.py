@@ -0,0 +1,218 @@
+""" Detector of N+1 queries.
+
+.. versionadded:: 0.10.0
+
+Detector runs during GET requests if it is enabled with API nplusone
+parameter. Executed statements are grouped by fingerprint: SQL with literals
+and parameters replaced by "?". If statement with the same fingerprint is
+executed once per primary row (or more often), it is reported with resource,
+field and include path, which executed it.
+
+.. code-block:: python
+
+    api = API(nplusone="raise")  # or "log"
+
+Queries are attributed to document field hooks (dump_document_<field>),
+to-many links and include paths. Detection requires at least two primary
+rows in response.
+
+Detector checks budget of queries too, see Resource.get_max_queries.
+
+In "raise" mode NPlusOneError is raised from API.handler_view, so django
+test client fails the test. In "log" mode warning is logged.
+
+"""
+import logging
+import re
+from contextlib import contextmanager
+
+from . import queries
+from .utils import LocalValue
+
+logger = logging.getLogger(__name__)
+
+MODE_LOG = "log"
+MODE_RAISE = "raise"
+
+RE_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+RE_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+RE_WHITESPACE = re.compile(r"\s+")
+
+_current = LocalValue()
+
+
+class NPlusOneError(Exception):
+
+    """ Statement is executed for every primary row or budget is exceeded."""
+
+
+def fingerprint(sql):
+    """ Normalize SQL statement.
+
+    Literals and parameters are replaced with "?", lists of them with "(?)".
+
+    """
+    sql = RE_LITERALS.sub("?", sql)
+    sql = RE_LISTS.sub("(?)", sql)
+    return RE_WHITESPACE.sub(" ", sql).strip()
+
+
+class _Context(object):
+
+    """ Context manager which sets source of queries."""
+
+    def __init__(self, stack, source):
+        self.stack = stack
+        self.source = source
+
+    def __enter__(self):
+        self.stack.append(self.source)
+
+    def __exit__(self, type, value, traceback):
+        self.stack.pop()
+
+
+class _NullContext(object):
+    def __enter__(self):
+        pass
+
+    def __exit__(self, type, value, traceback):
+        pass
+
+
+_null_context = _NullContext()
+
+
+def _get_null_context(*args):
+    return _null_context
+
+
+class Detector(object):
+
+    """ Statements grouped by fingerprint with their sources.
+
+    Source is (resource name, field name, include path).
+
+    """
+
+    def __init__(self, mode=MODE_RAISE, max_queries=None):
+        self.mode = mode
+        self.max_queries = max_queries
+        self.rows = None
+        self.resource = None
+        self.stack = []
+        self.statements = {}  # fingerprint -> [count, source]
+
+    def record(self, sql, params, duration, alias=None):
+        key = fingerprint(sql)
+        statement = self.statements.get(key)
+        if statement is None:
+            source = self.stack[-1] if self.stack else (
+                self.resource, None, None)
+            statement = self.statements[key] = [0, source]
+        statement[0] += 1
+
+    def context(self, resource, field=None, include=None):
+        """ Set source of queries, include path is inherited."""
+        if include is None and self.stack:
+            include = self.stack[-1][2]
+        return _Context(self.stack, (resource.Meta.name, field, include))
+
+    def set_rows(self, resource, rows):
+        """ Set number of primary rows, the first call wins."""
+        if self.rows is None:
+            self.resource = resource.Meta.name
+            self.rows = rows
+
+    def get_problems(self):
+        """ Get statements executed for every primary row and exceeded
+        budget.
+
+        :return list: messages
+
+        """
+        problems = []
+        count = sum(c for c, _ in self.statements.values())
+        if self.max_queries is not None and count > self.max_queries:
+            problems.append(
+                "Query budget is exceeded in resource {}: {} queries, "
+                "budget is {}".format(self.resource, count, self.max_queries))
+
+        if self.rows is None or self.rows < 2:
+            return problems
+
+        return problems + [
+            "N+1 queries in resource {}, field {}, include {}: {} queries "
+            "for {} rows: {}".format(
+                source[0], source[1], source[2], count, self.rows, key)
+            for key, (count, source) in sorted(self.statements.items())
+            if count >= self.rows
+        ]
+
+    def check(self):
+        """ Raise or log found problems."""
+        problems = self.get_problems()
+        if not problems:
+            return
+
+        if self.mode == MODE_RAISE:
+            raise NPlusOneError("\n".join(problems))
+
+        for problem in problems:
+            logger.warning(problem)
+
+
+def start(mode=MODE_RAISE, max_queries=None):
+    """ Start detector in current thread, query log should be started."""
+    detector = _current.set(Detector(mode=mode, max_queries=max_queries))
+    queries.get().listeners.append(detector.record)
+    return detector
+
+
+def stop():
+    """ Stop detector of current thread.
+
+    :return: Detector or None if it is not started.
+
+    """
+    detector = _current.pop()
+    log = queries.get()
+    if detector is not None and log is not None and \
+            detector.record in log.listeners:
+        log.listeners.remove(detector.record)
+    return detector
+
+
+def get():
+    return _current.get()
+
+
+@contextmanager
+def detect(mode=MODE_RAISE, max_queries=None):
+    """ Run detector for code block and check it at the end.
+
+    :param mode: MODE_RAISE, MODE_LOG or None to disable detector.
+    :param max_queries: budget of queries, None if it is not checked.
+
+    """
+    if mode is None:
+        yield
+        return
+
+    detector = start(mode=mode, max_queries=max_queries)
+    try:
+        yield
+    finally:
+        stop()
+    detector.check()
+
+
+def get_context():
+    """ Get context function of current detector.
+
+    Function has Detector.context arguments, it does nothing if detector is
+    not started, so it is cheap to call in serialization loops.
+
+    """
+    detector = get()
+    return _get_null_context if detector is None else detector.context
@@ -0,0 +1,117 @@
+""" Sampled profiling of requests.
+
+.. versionadded:: 0.10.0
+
+Profiler is enabled with API profile_dir parameter. API.handler_view runs
+cProfile for every profile_rate-th request and for requests with signed
+X-JSONAPI-Profile header. Profile of request is dumped to
+<profile_dir>/<resource>.<method>.<timestamp>.<pid>.<thread>.prof:
+
+.. code-block:: python
+
+    api = API(profile_dir="/var/tmp/jsonapi", profile_rate=1000)
+
+Header value is created with get_token, it is signed with
+settings.SECRET_KEY and expires in an hour.
+
+Dumps of resource are merged into single report with management command:
+
+.. code-block:: bash
+
+    $ python manage.py jsonapi_profile /var/tmp/jsonapi author --method=GET
+
+"""
+import cProfile
+import glob
+import itertools
+import os
+import threading
+import time
+
+from django.core import signing
+
+from .utils import LocalValue, makedirs
+
+HEADER = "HTTP_X_JSONAPI_PROFILE"
+SALT = "jsonapi.profiling"
+TOKEN = "profile"
+
+_current = LocalValue()
+
+
+def get_token():
+    """ Get signed value of X-JSONAPI-Profile header."""
+    return signing.TimestampSigner(salt=SALT).sign(TOKEN)
+
+
+def get_dumps(directory, resource_name, method=None):
+    """ Get paths of profile dumps of resource.
+
+    :param str method: HTTP method, dumps of all methods if it is None.
+    :return list: paths
+
+    """
+    return sorted(glob.glob(os.path.join(directory, "{}.{}.*.prof".format(
+        resource_name, method or "*"))))
+
+
+class Profiler(object):
+
+    """ Sampling profiler of requests.
+
+    :param str directory: directory of profile dumps.
+    :param int rate: profile every rate-th request, only requests with
+        signed header are profiled if it is None.
+    :param int max_age: seconds header signature is valid.
+
+    """
+
+    def __init__(self, directory, rate=None, max_age=3600):
+        self.directory = directory
+        self.rate = rate
+        self.max_age = max_age
+        self.counter = itertools.count(1)
+
+    def is_sampled(self, request):
+        """ Check if request should be profiled."""
+        value = request.META.get(HEADER)
+        if value is not None:
+            try:
+                return signing.TimestampSigner(salt=SALT).unsign(
+                    value, max_age=self.max_age) == TOKEN
+            except signing.BadSignature:
+                return False
+
+        return self.rate is not None and next(self.counter) % self.rate == 0
+
+    def start(self, request):
+        """ Start profiling of request in current thread if it is sampled.
+
+        :return: cProfile.Profile or None if request is not profiled.
+
+        """
+        if not self.is_sampled(request):
+            return None
+
+        profile = _current.set(cProfile.Profile())
+        profile.enable()
+        return profile
+
+    def stop(self, request, resource=None):
+        """ Stop profiling of current thread and dump profile.
+
+        :return: path of dump or None if request is not profiled.
+
+        """
+        profile = _current.pop()
+        if profile is None:
+            return None
+
+        profile.disable()
+        path = os.path.join(
+            makedirs(self.directory), "{}.{}.{}.{}.{}.prof".format(
+                resource.Meta.name if resource is not None else "_",
+                request.method, int(time.time() * 1000), os.getpid(),
+                threading.current_thread().ident))
+        profile.dump_stats(path)
+        return path
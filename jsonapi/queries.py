@@ -0,0 +1,164 @@
+""" SQL queries log of requests.
+
+.. versionadded:: 0.10.0
+
+API.handler_view starts query log for the current thread if it is used:
+with API query_log, debug, nplusone or metrics parameters and for resources
+with Meta.slow_threshold. Cursors of django connections are wrapped, so
+every executed statement is counted and timed. It does not depend on
+settings.DEBUG and does not store all of the statements: only number of
+queries, their total duration and the slowest ones are kept.
+
+Query log is sent with signal_response_trace as queries argument, it is None if
+log is not used:
+
+.. code-block:: python
+
+    {
+        "count": 3,
+        "duration": 0.0021,  # seconds
+        "slowest": [{"sql": "SELECT ...", "params": [1], "duration": 0.001}],
+    }
+
+With API debug parameter it is added to meta.debug of JSON responses together
+with timings, see jsonapi.timings.
+
+"""
+import bisect
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .django_utils import wrap_cursors
+from .timings import clock
+from .utils import LocalValue
+
+_current = LocalValue()
+
+
+class QueryLog(object):
+
+    """ Statistics of executed queries.
+
+    :param int slowest: number of the slowest queries to keep.
+
+    """
+
+    def __init__(self, slowest=5):
+        self.count = 0
+        self.duration = 0
+        self.size = slowest
+        self.slowest = []  # (duration, index, sql, params) ascending
+        # Callables with record arguments, such as N+1 detector.
+        self.listeners = []
+
+    def record(self, sql, params, duration, alias=DEFAULT_DB_ALIAS):
+        """ Record executed statement.
+
+        .. versionchanged:: 0.10.0
+            alias parameter, database alias of connection.
+
+        """
+        for listener in self.listeners:
+            listener(sql, params, duration, alias=alias)
+
+        self.count += 1
+        self.duration += duration
+        if len(self.slowest) < self.size or duration > self.slowest[0][0]:
+            bisect.insort(self.slowest, (duration, self.count, sql, params))
+            if len(self.slowest) > self.size:
+                self.slowest.pop(0)
+
+    def as_dict(self, params=True):
+        """ Get log as dictionary, the slowest queries go first.
+
+        :param bool params: include params of queries.
+
+        """
+        slowest = []
+        for duration, _, sql, query_params in reversed(self.slowest):
+            query = {"sql": sql, "duration": duration}
+            if params:
+                query["params"] = query_params
+            slowest.append(query)
+
+        return {
+            "count": self.count,
+            "duration": self.duration,
+            "slowest": slowest,
+        }
+
+
+class CursorWrapper(object):
+
+    """ Cursor which records queries to query log."""
+
+    def __init__(self, cursor, log, alias=DEFAULT_DB_ALIAS):
+        self.cursor = cursor
+        self.log = log
+        self.alias = alias
+
+    def __getattr__(self, attr):
+        return getattr(self.cursor, attr)
+
+    def __iter__(self):
+        return iter(self.cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        return self.cursor.__exit__(type, value, traceback)
+
+    def execute(self, sql, params=None):
+        started = clock()
+        try:
+            return self.cursor.execute(sql, params)
+        finally:
+            self.log.record(sql, params, clock() - started, self.alias)
+
+    def executemany(self, sql, param_list):
+        started = clock()
+        try:
+            return self.cursor.executemany(sql, param_list)
+        finally:
+            self.log.record(
+                sql, param_list, clock() - started, self.alias)
+
+
+def _wrap(cursor, alias):
+    log = get()
+    return cursor if log is None else CursorWrapper(cursor, log, alias)
+
+
+def install(connection):
+    """ Wrap cursors of connection, it is done once per connection."""
+    if getattr(connection, '_jsonapi_queries', False):
+        return
+
+    alias = connection.alias
+    wrap_cursors(connection, lambda cursor: _wrap(cursor, alias))
+    connection._jsonapi_queries = True
+
+
+def start(slowest=5):
+    """ Start query log of current thread.
+
+    Connections are thread local, so they are wrapped for current thread.
+
+    """
+    for connection in connections.all():
+        install(connection)
+    return _current.set(QueryLog(slowest=slowest))
+
+
+def stop():
+    """ Stop query log of current thread.
+
+    :return: QueryLog or None if it is not started.
+
+    """
+    return _current.pop()
+
+
+def get():
+    return _current.get()
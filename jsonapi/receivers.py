@@ -0,0 +1,104 @@
+""" Receivers of jsonapi signals.
+
+.. versionadded:: 0.10.0
+
+NDJSONReceiver writes compact records of responses to file without blocking
+request threads: records are put to bounded queue and written in batches by
+background thread. If queue is full, record is dropped and counted.
+
+.. code-block:: python
+
+    from jsonapi.receivers import NDJSONReceiver
+    from jsonapi.signals import signal_response_trace
+
+    receiver = NDJSONReceiver("/var/log/jsonapi/requests.ndjson")
+    signal_response_trace.connect(receiver, weak=False)
+
+Record:
+
+.. code-block:: python
+
+    {
+        "time": 1420113600.0,
+        "method": "GET",
+        "path": "/api/author?include=posts",
+        "status": 200,
+        "duration": 0.012,
+        "size": 1024,  # null for streaming responses without Content-Length
+        "queries": 2,
+        "timings": {"query": 0.001, ...},
+    }
+
+Request body is not logged.
+
+"""
+import json
+import logging
+import threading
+import time
+
+from .workers import BatchWorker
+
+logger = logging.getLogger(__name__)
+
+
+class NDJSONReceiver(object):
+
+    """ Buffered signal_response_trace receiver writing NDJSON file.
+
+    Thread is started on first record, so receiver could be created on
+    module import and used after server forked worker processes.
+
+    :param str path: path of NDJSON file, records are appended to it.
+    :param int queue_size: maximum number of records waiting for write.
+    :param int batch_size: maximum number of records in one write.
+
+    """
+
+    def __init__(self, path, queue_size=10000, batch_size=100):
+        self.path = path
+        self.dropped = 0
+        self._worker = BatchWorker(
+            self.write, queue_size=queue_size, batch_size=batch_size,
+            name="jsonapi-receiver")
+        self._lock = threading.Lock()
+
+    def __call__(self, sender=None, request=None, response=None,
+                 duration=None, timings=None, queries=None, **kwargs):
+        record = self.get_record(request, response, duration, timings, queries)
+        if not self._worker.submit(record):
+            with self._lock:
+                self.dropped += 1
+
+    @staticmethod
+    def get_record(request, response, duration, timings=None, queries=None):
+        """ Get record of response, it is encoded in background thread."""
+        if response.streaming:
+            size = response.get('Content-Length')
+            size = int(size) if size is not None else None
+        else:
+            size = len(response.content)
+
+        return {
+            "time": time.time(),
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "duration": duration,
+            "size": size,
+            "queries": queries["count"] if queries is not None else None,
+            "timings": timings,
+        }
+
+    def join(self):
+        """ Wait until every received record is written."""
+        self._worker.join()
+
+    def write(self, records):
+        """ Append records to file."""
+        lines = "".join(
+            json.dumps(record, separators=(",", ":"), default=str) + "\n"
+            for record in records
+        )
+        with open(self.path, "a") as f:
+            f.write(lines)
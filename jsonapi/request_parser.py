@@ -7,6 +7,7 @@ JSONAPIQueryDict = namedtuple('JSONAPIQueryDict', [
     'distinct',
     'fields',
     'filter',
+    'format',
     'include',
     'page',
     'sort',
@@ -18,13 +19,18 @@ class RequestParser(object):
     """ Rarser for Django request.GET parameters."""
 
     RE_FIELDS = re.compile('^fields\[(?P<resource>\w+)\]$')
+    FORMATS = ("columnar",)
+    MEDIA_TYPE = "application/vnd.api+json"
 
     @classmethod
     def parse(cls, querydict):
         """ Parse querydict data.
 
         There are expected agruments:
-            distinct, fields, filter, include, page, sort
+            distinct, fields, filter, format, include, page, sort
+
+        .. versionchanged:: 0.10.0
+            format argument, see parse_format.
 
         Parameters
         ----------
@@ -53,6 +59,7 @@ class RequestParser(object):
             distinct=cls.prepare_values(querydict.getlist('distinct')),
             fields=cls.parse_fields(querydict),
             filter=querydict.getlist('filter'),
+            format=cls.parse_format(querydict.get('format')),
             include=cls.prepare_values(querydict.getlist('include')),
             page=int(querydict.get('page')) if querydict.get('page') else None,
             sort=cls.prepare_values(querydict.getlist('sort'))
@@ -60,6 +67,107 @@ class RequestParser(object):
 
         return result
 
+    @classmethod
+    def parse_format(cls, value):
+        """ Parse representation format.
+
+        .. versionadded:: 0.10.0
+
+        Format "columnar" represents collection as columns and rows.
+
+        :return: format or None for default representation.
+        :raise ValueError: format is not known.
+
+        """
+        if value is not None and value not in cls.FORMATS:
+            raise ValueError("Format {} is not known".format(value))
+        return value
+
+    @classmethod
+    def parse_accept(cls, accept):
+        """ Parse Accept header.
+
+        .. versionadded:: 0.10.0
+
+        :return: list of (media_type, quality, params) tuples in header order,
+            params is dict.
+
+        """
+        result = []
+        for media_range in (accept or "").split(","):
+            parts = media_range.split(";")
+            media_type = parts[0].strip().lower()
+            if not media_type:
+                continue
+
+            params = {}
+            for param in parts[1:]:
+                key, _, value = param.partition("=")
+                params[key.strip()] = value.strip().strip('"')
+
+            try:
+                quality = float(params.pop("q", 1))
+            except ValueError:
+                quality = 0.0
+            result.append((media_type, quality, params))
+
+        return result
+
+    @classmethod
+    def get_accepted_media_type(cls, accept, media_types):
+        """ Choose media type accepted by client.
+
+        .. versionadded:: 0.10.0
+
+        :param media_types: media types server could produce, the first one
+            is preferred.
+        :return: media type or None if client does not accept any.
+
+        """
+        qualities = {}
+        for media_type, quality, _ in cls.parse_accept(accept):
+            qualities[media_type] = quality
+
+        candidates = [
+            (qualities.get(media_type, 0.0), -index, media_type)
+            for index, media_type in enumerate(media_types)
+        ]
+        quality, _, media_type = max(candidates)
+        return media_type if quality > 0 else None
+
+    @classmethod
+    def parse_accept_format(cls, accept):
+        """ Get format parameter of API media type in Accept header.
+
+        .. versionadded:: 0.10.0
+
+        Example: Accept: application/vnd.api+json; format=columnar
+
+        :return: format or None, not known formats are ignored.
+
+        """
+        for media_type, _, params in cls.parse_accept(accept):
+            value = params.get("format")
+            if media_type == cls.MEDIA_TYPE and value in cls.FORMATS:
+                return value
+
+        return None
+
+    @classmethod
+    def get_format(cls, request):
+        """ Get requested representation format.
+
+        .. versionadded:: 0.10.0
+
+        Query parameter has priority over Accept header.
+
+        :return: format or None
+        :raise ValueError: format is not known.
+
+        """
+        return cls.parse_format(request.GET.get('format')) or \
+            cls.parse_accept_format(request.META.get('HTTP_ACCEPT'))
+
     @classmethod
     def prepare_values(cls, values):
         return [x for value in values for x in value.split(",")]
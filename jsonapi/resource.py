@@ -21,6 +21,15 @@ There are several optional Meta parameters:
     * fieldnames_exclude = None
     * page_size = None
     * allowed_methods = ('GET',)
+    * cache_ttl = None
+    * cache_stale_ttl = None
+    * updated_field = None
+    * stream_min_length = None
+    * write_chunk_size = None
+    * export_chunk_size = None
+    * snapshot = False
+    * max_queries = None
+    * slow_threshold = None
 
 Properties:
 
@@ -38,11 +47,16 @@ import inspect
 import json
 import logging
 
-from .utils import classproperty
+from .utils import classproperty, iter_chunks
 from .django_utils import get_model_name, get_model_by_name
 from .serializers import Serializer
 from .auth import Authenticator
+from .encoders import MsgpackEncoderBackend
+from . import messagepack
+from . import memory
+from . import timings
 from .request_parser import RequestParser
+from .stream_parser import DocumentStreamParser
 from .model_inspector import ModelInspector
 from .exceptions import (
     JSONAPIError,
@@ -51,6 +65,7 @@ from .exceptions import (
     JSONAPIFormValidationError,
     JSONAPIIntegrityError,
     JSONAPIInvalidRequestDataMissingError,
+    JSONAPIInvalidRequestError,
     JSONAPIParseError,
     JSONAPIResourceValidationError,
 )
@@ -162,6 +177,9 @@ class Resource(Serializer, Authenticator):
 
     """ Base JSON:API resource class."""
 
+    COMMIT_ATOMIC = "atomic"
+    COMMIT_CHUNK = "chunk"
+
     class Meta:
         name = None
         # fieldnames_include = None  # NOTE: moved to Serializer.
@@ -169,6 +187,15 @@ class Resource(Serializer, Authenticator):
         page_size = None
         allowed_methods = 'GET',
         form = None
+        cache_ttl = None
+        cache_stale_ttl = None
+        updated_field = None
+        stream_min_length = None
+        write_chunk_size = None
+        export_chunk_size = None
+        snapshot = False
+        max_queries = None
+        slow_threshold = None
 
         @classproperty
         def name_plural(cls):
@@ -328,15 +355,23 @@ class Resource(Serializer, Authenticator):
         return result
 
     @classmethod
-    def get(cls, request=None, **kwargs):
-        """ Get resource http response.
+    def filter_get_queryset(cls, request=None, user=None, **kwargs):
+        """ Get queryset for GET request with filters, distinct and sort.
 
-        :return str: resource
+        .. versionadded:: 0.10.0
+
+        :param user: user of request, it is authenticated if not given.
+        :return: (queryset, queryargs)
+        :raise JSONAPIInvalidRequestError: query parameters are not valid.
 
         """
-        user = cls.authenticate(request)
+        if user is None:
+            user = cls.authenticate(request)
         queryset = cls.get_queryset(user=user, **kwargs)
-        queryargs = RequestParser.parse(request.GET)
+        try:
+            queryargs = RequestParser.parse(request.GET)
+        except ValueError as e:
+            raise JSONAPIInvalidRequestError(detail=str(e))
 
         # Filters
         if 'ids' in kwargs:
@@ -352,27 +387,110 @@ class Resource(Serializer, Authenticator):
         if queryargs.sort:
             queryset = queryset.order_by(*queryargs.sort)
 
-        include = queryargs.include
-        include_structure = cls._get_include_structure(include)
+        return queryset, queryargs
 
-        # Update queryset based on include parameters.
-        for include_resource in include_structure:
-            field = include_resource['field_path'][-1]
-            related_query_type = 'select_related' \
-                if field.category == field.CATEGORIES.TO_ONE \
-                else 'prefetch_related'
+    @classmethod
+    def get_max_queries(cls, include=None):
+        """ Get budget of SQL queries of GET request.
 
-            queryset = getattr(queryset, related_query_type)(
-                include_resource['query'])
+        .. versionadded:: 0.10.0
 
-        # Fields serialisation
-        # NOTE: currently filter only own fields
-        model_info = cls.Meta.model_info
-        fields_own = model_info.fields_own
-        if queryargs.fields:
-            fieldnames = queryargs.fields
-            fields_own = [f for f in fields_own if f.name in fieldnames]
+        Meta.max_queries is either number of queries of request without
+        include or dictionary with budgets of include paths and "" key for
+        request without include. Every include path not in dictionary adds
+        one query.
+
+        :param list include: include paths.
+        :return: number of queries or None if budget is not set.
+
+        """
+        budgets = cls.Meta.max_queries
+        if budgets is None:
+            return None
 
+        if not isinstance(budgets, dict):
+            budgets = {"": budgets}
+        return budgets[""] + sum(
+            budgets.get(path, 1) for path in include or [])
+
+    @classmethod
+    def get_validators(cls, request=None, **kwargs):
+        """ Get validators of GET response without serialization.
+
+        .. versionadded:: 0.10.0
+
+        Validators are calculated with one aggregate query: number of objects,
+        sum and maximum of their ids and maximum of Meta.updated_field. If
+        object is created, deleted or updated, validators are changed.
+
+        Included documents are not covered by validators, so there are no
+        validators for requests with include.
+
+        :return: dict with count, id_sum, id_max and last_modified keys or
+            None if resource does not have Meta.updated_field.
+
+        """
+        if not cls.Meta.updated_field:
+            return None
+
+        queryset, queryargs = cls.filter_get_queryset(
+            request=request, **kwargs)
+        if queryargs.distinct or queryargs.include:
+            # Aggregate over distinct fields is not supported.
+            return None
+
+        return queryset.order_by().aggregate(
+            count=models.Count('pk'),
+            id_sum=models.Sum('pk'),
+            id_max=models.Max('pk'),
+            last_modified=models.Max(cls.Meta.updated_field),
+        )
+
+    @classmethod
+    def get(cls, request=None, as_fragments=False, **kwargs):
+        """ Get resource http response.
+
+        .. versionchanged:: 0.10.0
+            as_fragments parameter, see Serializer.dump_documents.
+
+        .. versionchanged:: 0.10.0
+            Columnar representation if it is requested with format query
+            parameter or Accept header media type parameter.
+
+        :return str: resource
+
+        """
+        with timings.phase("query"), memory.phase("query"):
+            queryset, queryargs = cls.filter_get_queryset(
+                request=request, **kwargs)
+            columnar = RequestParser.get_format(request) == "columnar"
+
+            include_structure = cls._get_include_structure(queryargs.include)
+            queryset = cls._update_include_queryset(
+                queryset, include_structure)
+            fields_own = cls._get_fields_own(queryargs)
+            objects, meta = cls._paginate(queryset, queryargs)
+
+        with timings.phase("serialize"), memory.phase("serialize"):
+            response = cls.dump_documents(
+                cls,
+                objects,
+                fields_own=fields_own,
+                include_structure=include_structure,
+                as_fragments=as_fragments,
+                columnar=columnar
+            )
+        if meta:
+            response["meta"] = meta
+        return response
+
+    @classmethod
+    def _paginate(cls, queryset, queryargs):
+        """ Get objects of requested page and pagination meta.
+
+        :return: (objects, meta), meta is empty if Meta.page_size is None.
+
+        """
         objects = queryset.all()
         meta = {}
         if cls.Meta.page_size is not None:
@@ -389,15 +507,96 @@ class Resource(Serializer, Authenticator):
             meta["page_prev"] = objects.previous_page_number() \
                 if objects.has_previous() else None
 
-        response = cls.dump_documents(
-            cls,
-            objects,
-            fields_own=fields_own,
-            include_structure=include_structure
-        )
-        if meta:
-            response["meta"] = meta
-        return response
+        return objects, meta
+
+    @classmethod
+    def _update_include_queryset(cls, queryset, include_structure):
+        """ Update queryset based on include parameters."""
+        select_related = []
+        for include_resource in include_structure:
+            field = include_resource['field_path'][-1]
+            if field.category == field.CATEGORIES.TO_ONE:
+                select_related.append(include_resource['query'])
+            else:
+                queryset = queryset.prefetch_related(
+                    include_resource['query'])
+
+        if select_related:
+            # NOTE: Django 1.6 select_related calls are not chained.
+            queryset = queryset.select_related(*select_related)
+
+        return queryset
+
+    @classmethod
+    def _get_fields_own(cls, queryargs):
+        """ Get own fields to serialize.
+
+        NOTE: currently filter only own fields
+
+        """
+        fields_own = cls.Meta.model_info.fields_own
+        if queryargs.fields:
+            fieldnames = queryargs.fields
+            fields_own = [f for f in fields_own if f.name in fieldnames]
+        return fields_own
+
+    @classmethod
+    def export(cls, stream, encoder, request=None, user=None, progress=None,
+               **kwargs):
+        """ Write documents of GET request to stream as NDJSON.
+
+        .. versionadded:: 0.10.0
+
+        Every line is a document with type member. Objects are queried and
+        dumped by Meta.export_chunk_size, documents of every chunk are
+        followed by its linked documents, which were not written yet.
+        Pagination is not applied. Chunks are selected by pk without OFFSET,
+        if sort is not requested, otherwise pk is added to sort, so order of
+        chunks is stable.
+
+        :param encoder: jsonapi.encoders.EncoderBackend for lines.
+        :param progress: callable, it gets number of written objects.
+        :return int: number of written objects.
+
+        """
+        queryset, queryargs = cls.filter_get_queryset(
+            request=request, user=user, **kwargs)
+        include_structure = cls._get_include_structure(queryargs.include)
+        queryset = cls._update_include_queryset(queryset, include_structure)
+        fields_own = cls._get_fields_own(queryargs)
+        queryset = queryset.order_by(*(list(queryargs.sort) + ['pk']))
+
+        chunk_size = cls.Meta.export_chunk_size
+        linked = set()
+        count = 0
+        objects = []
+        while True:
+            if queryargs.sort:
+                chunk = queryset[count:count + chunk_size]
+            elif objects:
+                chunk = queryset.filter(pk__gt=objects[-1].pk)[:chunk_size]
+            else:
+                chunk = queryset[:chunk_size]
+            objects = list(chunk)
+            data = cls.dump_documents(
+                cls, objects, fields_own=fields_own,
+                include_structure=include_structure)
+
+            for document in data["data"]:
+                document["type"] = cls.Meta.name_plural
+                stream.write(encoder.dumps(document) + b"\n")
+
+            for document in data.get("linked", []):
+                key = (document["type"], document["id"])
+                if key not in linked:
+                    linked.add(key)
+                    stream.write(encoder.dumps(document) + b"\n")
+
+            count += len(objects)
+            if progress is not None:
+                progress(count)
+            if len(objects) < chunk_size:
+                return count
 
     @classmethod
     def extract_resource_items(cls, request):
@@ -408,12 +607,61 @@ class Resource(Serializer, Authenticator):
         is_collection is True if items is list, False if object
         items is list of items
 
+        .. versionchanged:: 0.10.0
+            MessagePack request body, if Content-Type is application/msgpack.
+            Large JSON request body is parsed incrementally, see
+            iter_resource_items.
+
+        """
+        items, is_collection = cls.iter_resource_items(request)
+        return list(items), is_collection
+
+    @classmethod
+    def iter_resource_items(cls, request):
+        """ Extract resources iterator from django request.
+
+        .. versionadded:: 0.10.0
+
+        JSON request body longer than Meta.stream_min_length, if it is set,
+        is read from request stream and parsed incrementally, items are
+        decoded while they are iterated. request.body is not available then.
+
+        :return: (items, is_collection), items is iterator.
+        :raise JSONAPIParseError: body is not valid, could be raised while
+            items are iterated.
+
         """
-        jdata = request.body.decode('utf8')
+        content_type = request.META.get('CONTENT_TYPE', '')
+        is_msgpack = content_type.split(';')[0].strip() in \
+            MsgpackEncoderBackend.media_types
         try:
-            data = json.loads(jdata)
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
         except ValueError:
-            raise JSONAPIParseError(detail=jdata)
+            content_length = 0
+
+        stream_min_length = cls.Meta.stream_min_length
+        if not is_msgpack and stream_min_length is not None and \
+                content_length >= stream_min_length:
+            parser = DocumentStreamParser(request)
+            try:
+                items, is_collection = parser.parse()
+            except ValueError as e:
+                raise JSONAPIParseError(detail=str(e))
+            except KeyError:
+                raise JSONAPIInvalidRequestDataMissingError()
+            return cls._iter_stream_items(items), is_collection
+
+        if is_msgpack:
+            try:
+                data = messagepack.unpackb(request.body)
+            except ValueError as e:
+                raise JSONAPIParseError(detail=str(e))
+        else:
+            jdata = request.body.decode('utf8')
+            try:
+                data = json.loads(jdata)
+            except ValueError:
+                raise JSONAPIParseError(detail=jdata)
 
         try:
             items = data["data"]
@@ -424,7 +672,15 @@ class Resource(Serializer, Authenticator):
         if not is_collection:
             items = [items]
 
-        return (items, is_collection)
+        return iter(items), is_collection
+
+    @staticmethod
+    def _iter_stream_items(items):
+        try:
+            for item in items:
+                yield item
+        except ValueError as e:
+            raise JSONAPIParseError(detail=str(e))
 
     @classmethod
     def clean_resources(cls, resources, request=None, **kwargs):
@@ -455,30 +711,166 @@ class Resource(Serializer, Authenticator):
         return resources
 
     @classmethod
-    def _post_put(cls, request=None, **kwargs):
-        """ General method for post and put requests."""
-        items, is_collection = cls.extract_resource_items(request)
+    def _post_put(cls, request=None, user=None, progress=None, **kwargs):
+        """ General method for post and put requests.
+
+        .. versionchanged:: 0.10.0
+            Items are cleaned, validated and saved in chunks of
+            Meta.write_chunk_size, so only one chunk of forms and instances
+            is kept in memory. Query parameter commit=chunk commits every
+            chunk separately, by default (commit=atomic) all of the chunks
+            are saved in one transaction. Results of chunks are in
+            meta.chunks of response.
+
+            With commit=chunk saved documents are not kept, response data
+            has their ids only, so memory does not grow with request size.
+            If chunk fails, response has errors together with data and
+            meta.chunks of saved chunks, they are not rolled back.
+
+        .. versionchanged:: 0.10.0
+            user and progress parameters. User is authenticated with request
+            if it is not given. progress is called with result of every
+            saved chunk.
+
+        """
+        if user is None and request.method == "PUT":
+            user = cls.authenticate(request)
+
+        commit = request.GET.get("commit", cls.COMMIT_ATOMIC)
+        if commit not in (cls.COMMIT_ATOMIC, cls.COMMIT_CHUNK):
+            raise JSONAPIError(detail="commit should be {} or {}".format(
+                cls.COMMIT_ATOMIC, cls.COMMIT_CHUNK))
+
+        with timings.phase("parse"):
+            items, is_collection = cls.iter_resource_items(request)
+        chunks = iter_chunks(items, cls.Meta.write_chunk_size)
+
+        if commit == cls.COMMIT_CHUNK:
+            return cls._post_put_chunks(
+                chunks, is_collection, request=request, user=user,
+                progress=progress, **kwargs)
+
+        with transaction.atomic():
+            data = []
+            results = []
+            for chunk in chunks:
+                documents = cls._post_put_chunk(
+                    chunk, offset=len(data), request=request, user=user,
+                    **kwargs)
+                results.append(cls._get_chunk_result(len(data), documents))
+                data.extend(documents)
+                if progress is not None:
+                    progress(results[-1])
+
+            cls._check_put_ids(request, data, **kwargs)
+
+        return cls._get_post_put_response(data, is_collection, results)
+
+    @classmethod
+    def _post_put_chunks(cls, chunks, is_collection, request=None,
+                         progress=None, **kwargs):
+        """ Save every chunk in separate transaction.
+
+        Saving is stopped at the first failed chunk, saved chunks are not
+        rolled back. Error is returned in response with ids of saved
+        documents. Ids of PUT request are checked after the last chunk, so
+        missing items are reported too.
+
+        """
+        data = []
+        results = []
+        try:
+            for chunk in chunks:
+                with transaction.atomic():
+                    documents = cls._post_put_chunk(
+                        chunk, offset=len(data), request=request, **kwargs)
+                results.append(cls._get_chunk_result(len(data), documents))
+                data.extend({"id": d["id"]} for d in documents)
+                if progress is not None:
+                    progress(results[-1])
+        except JSONAPIError as e:
+            results.append({
+                "offset": len(data),
+                "count": 0,
+                "status": "failed",
+            })
+            return cls._get_post_put_error_response(data, results, e)
+
+        try:
+            cls._check_put_ids(request, data, **kwargs)
+        except JSONAPIError as e:
+            return cls._get_post_put_error_response(data, results, e)
+
+        return cls._get_post_put_response(data, is_collection, results)
+
+    @classmethod
+    def _get_chunk_result(cls, offset, documents):
+        return {
+            "offset": offset,
+            "count": len(documents),
+            "status": "saved",
+        }
+
+    @classmethod
+    def _get_post_put_response(cls, data, is_collection, results):
+        if not is_collection:
+            data = data[0]
+
+        response = dict(data=data)
+        if cls.Meta.write_chunk_size is not None:
+            response["meta"] = {"chunks": results}
+        return response
+
+    @classmethod
+    def _get_post_put_error_response(cls, data, results, error):
+        response = cls._get_post_put_response(data, True, results)
+        response["errors"] = [error.data]
+        return response
 
+    @classmethod
+    def _get_put_ids(cls, ids=None, **kwargs):
+        return {int(_id) for _id in ids}
+
+    @classmethod
+    def _check_put_ids(cls, request, data, **kwargs):
+        if request.method == "PUT" and \
+                {d["id"] for d in data} != cls._get_put_ids(**kwargs):
+            raise JSONAPIError(
+                detail="ids set in url and request body are not matched")
+
+    @classmethod
+    def _post_put_chunk(cls, items, offset=0, request=None, user=None,
+                        **kwargs):
+        """ Clean, validate and save chunk of items.
+
+        .. versionadded:: 0.10.0
+
+        :param int offset: index of the first item in request data.
+        :return list: documents of saved items.
+
+        """
         try:
-            items = cls.clean_resources(items, request=request, **kwargs)
+            with timings.phase("validate"):
+                items = cls.clean_resources(items, request=request, **kwargs)
         except ValidationError as e:
             raise JSONAPIResourceValidationError(detail=e.message)
 
         if request.method == "PUT":
-            ids_set = set([int(_id) for _id in kwargs['ids']])
+            ids_set = cls._get_put_ids(**kwargs)
             item_ids_set = {item["id"] for item in items}
-            if ids_set != item_ids_set:
+            if not item_ids_set <= ids_set or (
+                    cls.Meta.write_chunk_size is None and
+                    ids_set != item_ids_set):
                 msg = "ids set in url and request body are not matched"
                 raise JSONAPIError(detail=msg)
 
-            user = cls.authenticate(request)
             queryset = cls.get_queryset(user=user, **kwargs)
             queryset = cls.update_put_queryset(queryset, **kwargs)
-            objects_map = queryset.in_bulk(kwargs["ids"])
+            objects_map = queryset.in_bulk(list(item_ids_set))
 
-            if len(objects_map) < len(kwargs["ids"]):
+            if len(objects_map) < len(item_ids_set):
                 msg = "You do not have access to objects {}".format(
-                    list(ids_set - set(objects_map.keys()))
+                    list(item_ids_set - set(objects_map.keys()))
                 )
                 raise JSONAPIForbiddenError(detail=msg)
 
@@ -500,7 +892,8 @@ class Resource(Serializer, Authenticator):
             # In case 2) if model has setter for property, it would be set, if
             # not, catch AttributeError and do nothing with it.
 
-            attribute_keys = set(item.keys()) & set(cls.Meta.fieldnames_include)
+            attribute_keys = \
+                set(item.keys()) & set(cls.Meta.fieldnames_include)
             attributes_include.append({
                 k: v for k, v in item.items() if k in attribute_keys})
 
@@ -519,17 +912,21 @@ class Resource(Serializer, Authenticator):
             forms.append(form)
 
         for index, form in enumerate(forms):
-            if not form.is_valid():
+            with timings.phase("validate"):
+                is_valid = form.is_valid()
+            if not is_valid:
                 raise JSONAPIFormValidationError(
-                    links=["/data/{}".format(index)],
+                    links=["/data/{}".format(offset + index)],
                     paths=["/{}".format(attr) for attr in form.errors],
                     data=form.errors
                 )
 
         data = []
         try:
-            with transaction.atomic():
-                for form, instance_attributes in zip(forms, attributes_include):
+            # NOTE: chunk is saved in transaction of the caller.
+            with timings.phase("save"), transaction.atomic(savepoint=False):
+                for form, instance_attributes in zip(
+                        forms, attributes_include):
                     instance = form.save()
 
                     # Set instance attributes: resource attributes or model
@@ -558,11 +955,7 @@ class Resource(Serializer, Authenticator):
         except Exception as e:
             raise JSONAPIFormSaveError(detail=str(e))
 
-        if not is_collection:
-            data = data[0]
-
-        response = dict(data=data)
-        return response
+        return data
 
     @classmethod
     def post(cls, request=None, **kwargs):
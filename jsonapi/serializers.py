@@ -1,9 +1,12 @@
 """ Serializer definition."""
 import json
-import datetime
-import decimal
 from django.db import models
 
+from . import nplusone
+from . import timings
+from .cache import get_document_cache, get_document_tags
+from .encoders import Fragment, get_converter
+
 
 class DatetimeDecimalEncoder(json.JSONEncoder):
 
@@ -12,6 +15,9 @@ class DatetimeDecimalEncoder(json.JSONEncoder):
     Usage: json.dumps(object, cls=DatetimeDecimalEncoder)
     NOTE: _iterencode does not work
 
+    .. versionchanged:: 0.10.0
+        Values are converted with jsonapi.encoders.CONVERTERS.
+
     """
 
     def default(self, o):
@@ -20,17 +26,51 @@ class DatetimeDecimalEncoder(json.JSONEncoder):
         :return str: A JSON encoded string
 
         """
-        if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
-            return o.isoformat()
-
-        if isinstance(o, decimal.Decimal):
-            return float(o)
+        converter = get_converter(type(o))
+        if converter is not None:
+            return converter(o)
 
         return json.JSONEncoder.default(self, o)
 
 
+def copy_document(document):
+    """ Copy document with nested dictionaries and lists, such as links."""
+    if isinstance(document, dict):
+        return {key: copy_document(value) for key, value in document.items()}
+    if isinstance(document, list):
+        return [copy_document(value) for value in document]
+    return document
+
+
+def get_columnar(documents, fieldnames, type_):
+    """ Represent documents of one resource as columns and rows.
+
+    .. versionadded:: 0.10.0
+
+    :param list documents: documents with the same members.
+    :param fieldnames: own field names of documents, usually from
+        Serializer._get_fieldnames_own.
+    :param str type_: documents type.
+    :return dict: {"type": type_, "columns": [...], "rows": [[...], ...]}.
+        Links are columns with "links." prefix.
+
+    """
+    fieldnames = sorted(fieldnames)
+    linknames = sorted(documents[0].get("links", {})) if documents else []
+    return {
+        "type": type_,
+        "columns": fieldnames + ["links." + name for name in linknames],
+        "rows": [
+            [document[name] for name in fieldnames] +
+            [document["links"][name] for name in linknames]
+            for document in documents
+        ],
+    }
+
+
 class SerializerMeta:
-    encoder = DatetimeDecimalEncoder
+    encoder = None  # API encoder is used by default
+    document_cache = None
     fieldnames_include = []
     fieldnames_exclude = []
 
@@ -83,27 +123,33 @@ class Serializer(object):
         1) fieldnames_include could be properties, but not related models.
         Add them to fields_own.
 
+        .. versionchanged:: 0.10.0
+            Documents are cached if cls.Meta.document_cache is set. Cache key
+            is (resource, primary key, fields plan). Returned document is a
+            copy, it is safe to modify it.
+
         """
-        if fields_own is not None:
-            fields_own = {f.name for f in fields_own}
-        else:
-            fields_own = {
-                f.name for f in instance._meta.fields
-                if f.rel is None and f.serialize
-            }
-        fields_own.add('id')
+        fields_own = cls._get_fieldnames_own(instance, fields_own)
+        fields_to_many = fields_to_many or []
 
-        fields_own = (fields_own | set(cls.Meta.fieldnames_include))\
-            - set(cls.Meta.fieldnames_exclude)
+        cache, cache_key = cls._get_document_cache_key(
+            instance, fields_own, fields_to_many)
+        if cache is not None:
+            entry = cache.get(cache_key)
+            if entry is not None:
+                return copy_document(entry["document"])
+            generation = cache.generation
 
         document = {}
+        context = nplusone.get_context()
         # Include own fields
         for fieldname in fields_own:
             field_serializer = getattr(
                 cls, "dump_document_{}".format(fieldname), None)
 
             if field_serializer is not None:
-                value = field_serializer(instance)
+                with context(cls, fieldname):
+                    value = field_serializer(instance)
             else:
                 value = getattr(instance, fieldname)
                 try:
@@ -121,6 +167,7 @@ class Serializer(object):
             document[fieldname] = value
 
         # Include to-one fields. It does not require database calls
+        fields_to_one = []
         for field in instance._meta.fields:
             fieldname = "{}_id".format(field.name)
             # NOTE: check field is not related to parent model to exclude
@@ -131,26 +178,130 @@ class Serializer(object):
                 continue
 
             if field.rel and fieldname not in cls.Meta.fieldnames_exclude:
+                fields_to_one.append(field)
                 document["links"] = document.get("links") or {}
                 document["links"][field.name] = getattr(instance, fieldname)
 
-        # Include to-many fields. It requires database calls. At this point we
-        # assume that model was prefetch_related with child objects, which would
-        # be included into 'linked' attribute. Here we need to add ids of linked
-        # objects. To avoid database calls, iterate over objects manually and
-        # get ids.
-        fields_to_many = fields_to_many or []
+        # Include to-many fields. It requires database calls. At this point
+        # we assume that model was prefetch_related with child objects, which
+        # would be included into 'linked' attribute. Here we need to add ids
+        # of linked objects. To avoid database calls, iterate over objects
+        # manually and get ids.
         for field in fields_to_many:
             document["links"] = document.get("links") or {}
-            document["links"][field.related_resource_name] = [
-                obj.id for obj in getattr(instance, field.name).all()]
+            with context(cls, field.name):
+                document["links"][field.related_resource_name] = [
+                    obj.id for obj in getattr(instance, field.name).all()]
+
+        if cache is not None:
+            # NOTE: entry keeps encoded fragments of the document too.
+            entry = {"document": copy_document(document), "fragments": {}}
+            cache.set(
+                cache_key, entry,
+                tags=get_document_tags(
+                    instance, fields_to_one, fields_to_many),
+                generation=generation
+            )
 
         return document
 
+    @classmethod
+    def _get_fieldnames_own(cls, instance, fields_own=None):
+        """ Get names of own fields to dump.
+
+        :return set: field names
+
+        """
+        if fields_own is not None:
+            fields_own = {f.name for f in fields_own}
+        else:
+            fields_own = {
+                f.name for f in instance._meta.fields
+                if f.rel is None and f.serialize
+            }
+        fields_own.add('id')
+
+        fields_own = (fields_own | set(cls.Meta.fieldnames_include))\
+            - set(cls.Meta.fieldnames_exclude)
+        return fields_own
+
+    @classmethod
+    def _get_document_cache_key(cls, instance, fieldnames, fields_to_many):
+        """ Get document cache and key.
+
+        :return: (cache, key), cache is None if document is not cached.
+
+        """
+        cache = get_document_cache(cls.Meta.document_cache)
+        if cache is None or instance.pk is None:
+            return None, None
+
+        api = getattr(cls.Meta, 'api', None)
+        key = (
+            cls, instance.pk, frozenset(fieldnames),
+            frozenset(f.name for f in fields_to_many),
+            api and api.base_url
+        )
+        return cache, key
+
+    @classmethod
+    def dump_document_fragment(cls, instance, fields_own=None,
+                               fields_to_many=None, **extra):
+        """ Get document encoded to JSON.
+
+        .. versionadded:: 0.10.0
+
+        Fragment is stored in document cache together with document, so
+        repeated requests do not encode cached documents again.
+
+        :param extra: additional document members, such as type.
+        :return jsonapi.encoders.Fragment: encoded document
+
+        """
+        fields_to_many = fields_to_many or []
+        fragment_key = tuple(sorted(extra.items()))
+        cache, cache_key = cls._get_document_cache_key(
+            instance, cls._get_fieldnames_own(instance, fields_own),
+            fields_to_many)
+        entry = cache.get(cache_key) if cache is not None else None
+        if entry is not None and fragment_key in entry["fragments"]:
+            return entry["fragments"][fragment_key]
+
+        document = cls.dump_document(
+            instance, fields_own=fields_own, fields_to_many=fields_to_many)
+        document.update(extra)
+        if entry is None and cache is not None:
+            entry = cache.get(cache_key)
+        fragment = Fragment(cls.Meta.api.get_encoder(cls).dumps(document))
+        if entry is not None:
+            entry["fragments"][fragment_key] = fragment
+
+        return fragment
+
     @classmethod
     def dump_documents(cls, resource, model_instances, fields_own=None,
-                       include_structure=None):
-        model_instances = list(model_instances)
+                       include_structure=None, as_fragments=False,
+                       columnar=False):
+        """ Dump documents with linked ones.
+
+        .. versionchanged:: 0.10.0
+            as_fragments parameter. If it is True, data and linked documents
+            are encoded fragments, use EncoderBackend.dumps_document to
+            encode result.
+
+        .. versionchanged:: 0.10.0
+            columnar parameter. If it is True, data and every linked resource
+            are represented with columns and rows, see get_columnar.
+            as_fragments is ignored then.
+
+        """
+        as_fragments = as_fragments and not columnar
+        with timings.phase("sql"):
+            model_instances = list(model_instances)
+        detector = nplusone.get()
+        if detector is not None:
+            detector.set_rows(resource, len(model_instances))
+        context = nplusone.get_context()
         model_info = resource.Meta.model_info
         include_structure = include_structure or []
 
@@ -160,9 +311,11 @@ class Serializer(object):
             if f.category == f.CATEGORIES.TO_MANY:
                 fields_to_many.add(f)
 
+        dump_document = cls.dump_document_fragment if as_fragments \
+            else cls.dump_document
         data = {
             "data": [
-                cls.dump_document(
+                dump_document(
                     m,
                     fields_own=fields_own,
                     fields_to_many=fields_to_many
@@ -175,7 +328,8 @@ class Serializer(object):
         if model_info.fields_to_one or fields_to_many:
             data["links"] = {}
             for field in model_info.fields_to_one:
-                linkname = "{}.{}".format(resource.Meta.name_plural, field.name)
+                linkname = "{}.{}".format(
+                    resource.Meta.name_plural, field.name)
                 data["links"].update({
                     linkname: resource.Meta.api.api_url + "/" + field.name +
                     "/{" + linkname + "}"
@@ -184,27 +338,56 @@ class Serializer(object):
         if include_structure:
             data["linked"] = []
 
+        if columnar:
+            data.update(get_columnar(
+                data.pop("data"),
+                cls._get_fieldnames_own(resource.Meta.model, fields_own),
+                resource.Meta.name_plural
+            ))
+
         for include_object in include_structure:
             current_models = set(model_instances)
             for field in include_object["field_path"]:
                 related_models = set()
-                for m in current_models:
-                    if field.category == field.CATEGORIES.TO_MANY:
-                        related_models |= set(getattr(m, field.name).all())
-                    if field.category == field.CATEGORIES.TO_ONE:
-                        related_model = getattr(m, field.name)
-                        if related_model is not None:
-                            related_models.add(related_model)
+                with context(resource, field.name, include_object["query"]):
+                    for m in current_models:
+                        if field.category == field.CATEGORIES.TO_MANY:
+                            related_models |= set(
+                                getattr(m, field.name).all())
+                        if field.category == field.CATEGORIES.TO_ONE:
+                            related_model = getattr(m, field.name)
+                            if related_model is not None:
+                                related_models.add(related_model)
 
                 current_models = related_models
 
             related_model_info = include_object["model_info"]
             related_resource = include_object["resource"]
+            if columnar:
+                data["linked"].append(get_columnar(
+                    [
+                        related_resource.dump_document(
+                            rel_model, related_model_info.fields_own)
+                        for rel_model in current_models
+                    ],
+                    related_resource._get_fieldnames_own(
+                        related_resource.Meta.model,
+                        related_model_info.fields_own),
+                    include_object["type"]
+                ))
+                continue
+
             for rel_model in current_models:
-                linked_obj = related_resource.dump_document(
-                    rel_model, related_model_info.fields_own
-                )
-                linked_obj["type"] = include_object["type"]
+                if as_fragments:
+                    linked_obj = related_resource.dump_document_fragment(
+                        rel_model, related_model_info.fields_own,
+                        type=include_object["type"]
+                    )
+                else:
+                    linked_obj = related_resource.dump_document(
+                        rel_model, related_model_info.fields_own
+                    )
+                    linked_obj["type"] = include_object["type"]
                 data["linked"].append(linked_obj)
 
         return data
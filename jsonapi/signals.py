@@ -1,5 +1,17 @@
-""" JSON-API signals."""
+""" JSON-API signals.
+
+.. versionadded:: 0.10.0
+    signal_response_trace is sent after signal_response with timings of
+    request phases, SQL queries log and memory trace, see jsonapi.timings,
+    jsonapi.queries and jsonapi.memory. Receivers should accept **kwargs,
+    arguments could be added later.
+
+"""
 import django.dispatch
 
-signal_request = django.dispatch.Signal()
-signal_response = django.dispatch.Signal()
+signal_request = django.dispatch.Signal(providing_args=["request"])
+signal_response = django.dispatch.Signal(
+    providing_args=["request", "response", "duration"])
+signal_response_trace = django.dispatch.Signal(
+    providing_args=[
+        "request", "response", "duration", "timings", "queries", "memory"])
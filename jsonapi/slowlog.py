@@ -0,0 +1,199 @@
+""" Log of slow requests.
+
+.. versionadded:: 0.10.0
+
+Requests to resources with Meta.slow_threshold (seconds) are logged with
+warning level to "jsonapi.slowlog" logger if they take longer:
+
+.. code-block:: python
+
+    class AuthorResource(Resource):
+        class Meta:
+            model = 'testapp.Author'
+            slow_threshold = 0.5
+
+Log record has slow_request attribute with dictionary, message contains it
+in JSON:
+
+.. code-block:: python
+
+    {
+        "resource": "author",
+        "method": "GET",
+        "path": "/api/author?include=posts",
+        "status": 200,
+        "duration": 0.7,
+        "queryargs": {"include": ["posts"], ...},  # see RequestParser.parse
+        "include": [
+            {"query": "post_set", "type": "posts", "resource": "post"}],
+        "timings": {"query": 0.001, ...},  # see jsonapi.timings
+        "queries": [{"sql": "SELECT ...", "params": [1], "duration": 0.6,
+                     "alias": "default"}],
+        "explain": [{"sql": "SELECT ...", "plan": [[...]]}],
+    }
+
+SQL statements are collected during requests to these resources and dropped
+if request is fast. EXPLAIN is run only for the slowest SELECT statements of
+slow requests on database of statement. It is done and record is logged in
+background thread, so slow requests are not slowed down more.
+
+"""
+import json
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .request_parser import RequestParser
+from .utils import LocalValue
+from .workers import BatchWorker
+
+logger = logging.getLogger(__name__)
+
+_current = LocalValue()
+
+
+class Statements(list):
+
+    """ Executed statements, query log listener."""
+
+    def __call__(self, sql, params, duration, alias=DEFAULT_DB_ALIAS):
+        self.append((sql, params, duration, alias))
+
+
+def start(log):
+    """ Collect statements of query log in current thread.
+
+    :param log: QueryLog of request, see jsonapi.queries.
+
+    """
+    statements = _current.set(Statements())
+    log.listeners.append(statements)
+    return statements
+
+
+def stop():
+    """ Stop collection of statements in current thread.
+
+    :return: Statements or None if collection is not started.
+
+    """
+    return _current.pop()
+
+
+def explain(sql, params, using=DEFAULT_DB_ALIAS):
+    """ Get plan of SELECT statement.
+
+    :param str using: database alias statement was executed on.
+    :return list: rows of EXPLAIN output.
+
+    """
+    connection = connections[using]
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else \
+        "EXPLAIN "
+    # NOTE: Django 1.6 cursors are not context managers.
+    with transaction.atomic(using=using):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(prefix + sql, params)
+            return [list(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+
+def get_record(request, response, duration, resource, statements,
+               timings=None):
+    """ Get structured record of slow request without plans of statements.
+
+    :param Statements statements: executed statements.
+    :param dict timings: durations of request phases.
+    :return dict: record
+
+    """
+    record = {
+        "resource": resource.Meta.name,
+        "method": request.method,
+        "path": request.get_full_path(),
+        "status": response.status_code,
+        "duration": duration,
+        "queryargs": None,
+        "include": [],
+        "timings": timings,
+        "queries": [{
+            "sql": sql,
+            "params": params,
+            "duration": statement_duration,
+            "alias": alias,
+        } for sql, params, statement_duration, alias in statements],
+        "explain": [],
+    }
+
+    try:
+        queryargs = RequestParser.parse(request.GET)
+        include_structure = resource._get_include_structure(
+            queryargs.include) if resource.Meta.is_model else []
+    except (ValueError, KeyError):
+        # Request is not valid, it is in path anyway.
+        pass
+    else:
+        record["queryargs"] = dict(queryargs._asdict())
+        record["include"] = [{
+            "query": include["query"],
+            "type": include["type"],
+            "resource": include["resource"].Meta.name,
+        } for include in include_structure]
+
+    return record
+
+
+def explain_record(record, explain_count=3):
+    """ Add plans of the slowest SELECT statements to record.
+
+    :param int explain_count: number of the slowest statements to explain.
+
+    """
+    selects = [
+        query for query in record["queries"]
+        if query["sql"].lstrip().upper().startswith("SELECT")
+    ]
+    selects.sort(key=lambda query: query["duration"], reverse=True)
+    for query in selects[:explain_count]:
+        try:
+            plan = explain(query["sql"], query["params"], using=query["alias"])
+        except Exception as e:
+            plan = "EXPLAIN failed: {}".format(e)
+        record["explain"].append({"sql": query["sql"], "plan": plan})
+
+
+def log_records(records):
+    """ Explain statements of records and log them."""
+    for record in records:
+        explain_record(record)
+        logger.warning(
+            "Slow request %s", json.dumps(record, default=str),
+            extra={"slow_request": record})
+
+
+_worker = BatchWorker(
+    log_records, queue_size=100, batch_size=10, name='jsonapi-slowlog')
+
+
+def check(request, response, duration, resource, statements, timings=None):
+    """ Log request if it is slower than Meta.slow_threshold of resource.
+
+    Record is explained and logged in background thread.
+
+    :return dict: record or None if request is fast.
+
+    """
+    if statements is None or resource is None or \
+            resource.Meta.slow_threshold is None or \
+            duration <= resource.Meta.slow_threshold:
+        return None
+
+    record = get_record(
+        request, response, duration, resource, statements, timings=timings)
+    if not _worker.submit(record):
+        logger.warning(
+            "Slow request %s %s is not logged, queue is full",
+            record["method"], record["path"])
+    return record
@@ -0,0 +1,277 @@
+""" Precomputed snapshots of read-mostly resources.
+
+.. versionadded:: 0.10.0
+
+Resource with Meta.snapshot = True is dumped to local file: encoded GET
+response for the whole collection and positions of every document in it.
+GET requests without query parameters are served from memory mapped file:
+collection is sent as is, response for ids is spliced from documents. There
+are no database queries and no serialization.
+
+.. code-block:: python
+
+    api = API(snapshots_dir='/var/lib/app/snapshots', snapshot_delay=1)
+
+    @api.register
+    class CountryResource(Resource):
+        class Meta:
+            model = 'testapp.Country'
+            snapshot = True
+
+Snapshot is rebuilt in background after model of resource is changed. Rebuild
+is delayed, so burst of changes leads to one rebuild. File is replaced
+atomically, other processes map new file on the next request and share its
+pages through page cache.
+
+Snapshot is behind database for rebuild delay, so it is suitable for rarely
+changed resources. Resources with authenticators or pagination are not served
+from snapshots. Queryset.update and other bulk operations do not trigger
+rebuild, see jsonapi.cache.
+
+"""
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+import tempfile
+import threading
+
+from django.db import connection
+from django.http import HttpRequest, QueryDict
+
+from .cache import get_parent, register
+from .django_utils import on_commit
+from .utils import atomic_write, makedirs
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot(object):
+
+    """ Memory mapped snapshot file.
+
+    File consists of JSON encoded index line and encoded collection. Index
+    has version, api url of document links, position of data member content
+    and positions of documents.
+
+    :param str path: snapshot file path.
+
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.stat = os.fstat(f.fileno())
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.start = self.mmap.find(b"\n") + 1
+        self.index = json.loads(self.mmap[:self.start].decode('utf8'))
+
+    @property
+    def version(self):
+        return self.index["version"]
+
+    @property
+    def api_url(self):
+        return self.index["api_url"]
+
+    def is_current(self, stat):
+        """ Check if snapshot is mapped from file with given stat."""
+        return (self.stat.st_ino, self.stat.st_mtime, self.stat.st_size) == \
+            (stat.st_ino, stat.st_mtime, stat.st_size)
+
+    @property
+    def size(self):
+        """ Size of encoded collection in bytes."""
+        return len(self.mmap) - self.start
+
+    def iter_content(self, chunk_size=65536):
+        """ Iterate over encoded collection by chunks of mapped file."""
+        for position in range(self.start, len(self.mmap), chunk_size):
+            yield self.mmap[position:position + chunk_size]
+
+    def get_content(self, ids=None):
+        """ Get encoded response.
+
+        Collection is not copied from mapped file at once, its content is
+        iterator of chunks, see iter_content.
+
+        :param ids: list of string ids, whole collection if None.
+        :return: (content, etag)
+
+        """
+        if ids is None:
+            return self.iter_content(), self.version
+
+        ids = set(ids)
+        start = self.start
+        data_start, data_end = self.index["data"]
+        documents = [
+            self.mmap[start + offset:start + offset + length]
+            for pk, offset, length in self.index["documents"]
+            if pk in ids
+        ]
+        content = self.mmap[start:start + data_start] + \
+            b",".join(documents) + self.mmap[start + data_end:]
+        etag = hashlib.md5("{}|{}".format(
+            self.version, ",".join(sorted(ids))).encode('utf8'))
+        return content, etag.hexdigest()
+
+
+class SnapshotStore(object):
+
+    """ Storage of resource snapshots in local directory.
+
+    :param str directory: snapshots directory, temporary directory by
+        default.
+    :param float delay: seconds to wait for other changes before rebuild.
+
+    """
+
+    def __init__(self, directory=None, delay=1):
+        self._directory = directory
+        self.delay = delay
+        self.resources = []
+        self._snapshots = {}  # resource name -> Snapshot
+        self._timers = {}  # resource name -> threading.Timer
+        self._requested = set()
+        self._lock = threading.Lock()
+        register(self)
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            self._directory = os.path.join(
+                tempfile.gettempdir(), "jsonapi-snapshots")
+        return makedirs(self._directory)
+
+    def get_path(self, resource):
+        return os.path.join(
+            self.directory, "{}.snapshot".format(resource.Meta.name))
+
+    def add(self, resource):
+        """ Track changes of resource model."""
+        self.resources.append(resource)
+
+    def invalidate(self, *tags):
+        """ Schedule rebuild of snapshots of changed models.
+
+        Rebuild is scheduled after transaction commit, so it sees changes.
+
+        """
+        models = {tag[1] for tag in tags}
+        for resource in self.resources:
+            if get_parent(resource.Meta.model) in models:
+                on_commit(lambda resource=resource: self.schedule(resource))
+
+    def schedule(self, resource):
+        """ Rebuild snapshot after delay, cancel scheduled rebuild."""
+        with self._lock:
+            timer = self._timers.pop(resource.Meta.name, None)
+            if timer is not None:
+                timer.cancel()
+
+            timer = self._timers[resource.Meta.name] = threading.Timer(
+                self.delay, self._rebuild, [resource])
+            timer.daemon = True
+            timer.start()
+
+    def _rebuild(self, resource):
+        try:
+            self.build(resource)
+        finally:
+            # Timer thread connection is not closed by request handlers.
+            connection.close()
+
+    def build(self, resource):
+        """ Dump resource collection to snapshot file.
+
+        Documents are dumped as encoded fragments, positions of fragments
+        are stored in index.
+
+        :return bool: True if snapshot is built.
+
+        """
+        api = resource.Meta.api
+        encoder = api.get_encoder(resource)
+        if not encoder.fragments or api.api_url is None:
+            # Links of documents are not known before the first request.
+            return False
+
+        # NOTE: Django 1.6 request has dictionary of query parameters.
+        request = HttpRequest()
+        request.GET = QueryDict('')
+        try:
+            queryset, _ = resource.filter_get_queryset(request=request)
+            objects = list(queryset)
+            document = resource.dump_documents(
+                resource, objects,
+                fields_own=resource.Meta.model_info.fields_own,
+                as_fragments=True)
+        except Exception:
+            logger.exception("Snapshot of %s is not built", resource.Meta.name)
+            return False
+
+        buf = io.BytesIO()
+        index = {"api_url": api.api_url, "documents": []}
+
+        # NOTE: members are encoded the same way as in dumps_document.
+        buf.write(b"{")
+        for member_index, (key, value) in enumerate(document.items()):
+            if member_index:
+                buf.write(b",")
+            buf.write(encoder.dumps(key) + b":")
+            if key != "data":
+                buf.write(encoder.dumps(value))
+                continue
+
+            buf.write(b"[")
+            data_start = buf.tell()
+            for fragment_index, (obj, fragment) in enumerate(
+                    zip(objects, value)):
+                if fragment_index:
+                    buf.write(b",")
+                index["documents"].append(
+                    [str(obj.pk), buf.tell(), len(fragment)])
+                buf.write(fragment)
+            index["data"] = [data_start, buf.tell()]
+            buf.write(b"]")
+        buf.write(b"}")
+
+        content = buf.getvalue()
+        index["version"] = hashlib.md5(content).hexdigest()
+
+        with atomic_write(self.get_path(resource), "wb") as f:
+            f.write(json.dumps(index).encode('utf8') + b"\n")
+            f.write(content)
+        return True
+
+    def get(self, resource):
+        """ Get snapshot of resource.
+
+        Snapshot is rebuilt on the first request in the process, file left by
+        previous process could be behind database.
+
+        :return: Snapshot or None if it is not built yet.
+
+        """
+        name = resource.Meta.name
+        if name not in self._requested:
+            self._requested.add(name)
+            self.schedule(resource)
+
+        path = self.get_path(resource)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        snapshot = self._snapshots.get(name)
+        if snapshot is None or not snapshot.is_current(stat):
+            try:
+                snapshot = self._snapshots[name] = Snapshot(path)
+            except (IOError, OSError, ValueError):
+                return None
+
+        return snapshot
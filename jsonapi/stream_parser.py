@@ -0,0 +1,160 @@
+""" Incremental parser of request documents.
+
+.. versionadded:: 0.10.0
+
+Parser reads JSON document {"data": [...]} from stream chunk by chunk and
+decodes "data" items one by one, so only current item and one chunk of
+request body are kept in memory.
+
+"""
+import codecs
+import json
+
+from . import six
+
+WHITESPACE = u" \t\n\r"
+
+
+class DocumentStreamParser(object):
+
+    """ Incremental parser of JSON document with data member.
+
+    :param stream: file-like object, such as django request.
+    :param int chunk_size: number of bytes to read at once.
+
+    """
+
+    def __init__(self, stream, chunk_size=65536):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf8')()
+        self.buffer = u""
+        self.position = 0
+        self.eof = False
+
+    def read(self, size=None):
+        """ Read next chunk to buffer.
+
+        :return bool: False if stream is exhausted.
+
+        """
+        if self.eof:
+            return False
+
+        chunk = self.stream.read(size or self.chunk_size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.position:] + \
+            self.text_decoder.decode(chunk, final=self.eof)
+        self.position = 0
+        return True
+
+    def peek(self):
+        """ Skip whitespaces and get next character.
+
+        :return: character or empty string at the end of stream.
+
+        """
+        while True:
+            while self.position < len(self.buffer) and \
+                    self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            if not self.read():
+                return u""
+
+    def expect(self, characters):
+        """ Consume one of expected characters.
+
+        :return: consumed character
+        :raise ValueError: next character is not expected.
+
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError("Expected one of '{}', got '{}'".format(
+                characters, character))
+        self.position += 1
+        return character
+
+    def decode_value(self):
+        """ Decode next JSON value.
+
+        Buffer is extended until value is decoded. Value at the end of buffer
+        could be incomplete number, so it is decoded again with more data.
+
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(
+                    self.buffer, self.position)
+            except ValueError:
+                if not self.read(size):
+                    raise
+            else:
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+                self.read(size)
+
+            # NOTE: read more data each time to keep decoding of large values
+            # linear.
+            size = max(size, len(self.buffer))
+
+    def decode_key(self):
+        key = self.decode_value()
+        if not isinstance(key, six.string_types):
+            raise ValueError("Expected object key, got {!r}".format(key))
+        self.expect(u":")
+        return key
+
+    def parse(self):
+        """ Parse document till data member.
+
+        :return: (items, is_collection), items is iterator of data items.
+            Rest of the document is decoded while items are iterated.
+        :raise ValueError: document is not valid.
+        :raise KeyError: document does not have data member.
+
+        """
+        self.expect(u"{")
+        if self.peek() == u"}":
+            raise KeyError("data")
+
+        while self.decode_key() != "data":
+            self.decode_value()
+            if self.expect(u",}") == u"}":
+                raise KeyError("data")
+
+        if self.peek() != u"[":
+            item = self.decode_value()
+            self.parse_end()
+            return iter([item]), False
+
+        self.position += 1
+        return self.iter_items(), True
+
+    def iter_items(self):
+        if self.peek() == u"]":
+            self.position += 1
+        else:
+            while True:
+                yield self.decode_value()
+                if self.expect(u",]") == u"]":
+                    break
+
+        self.parse_end()
+
+    def parse_end(self):
+        """ Parse document members after data."""
+        while self.expect(u",}") == u",":
+            self.decode_key()
+            self.decode_value()
+
+        if self.peek():
+            raise ValueError("Extra data after document")
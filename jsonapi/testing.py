@@ -0,0 +1,92 @@
+""" Test helpers for applications with API.
+
+.. versionadded:: 0.10.0
+
+QueryScalingMixin checks that number of SQL queries of GET request does not
+depend on number of objects in response:
+
+.. code-block:: python
+
+    class TestQueries(QueryScalingMixin, TestCase):
+        def create_objects(self, resource, count):
+            mixer.cycle(count).blend(resource.Meta.model)
+
+        def test_post(self):
+            self.assertQueriesDoNotScale(PostResource, '/api/post')
+            self.assertQueriesDoNotScale(
+                PostResource, '/api/post?include=author')
+
+Resource is requested with Meta.page_size 1, 10 and 100, so page has one,
+ten and hundred objects. If resource has Meta.max_queries, number of queries
+is checked against it too, see Resource.get_max_queries.
+
+"""
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+
+from . import six
+from .request_parser import RequestParser
+
+
+class QueryScalingMixin(object):
+
+    """ Mixin for django TestCase with query scaling assertions."""
+
+    query_scaling_sizes = 1, 10, 100
+
+    def create_objects(self, resource, count):
+        """ Create count objects of resource model."""
+        raise NotImplementedError()
+
+    def get_query_counts(self, resource, url, sizes=None, **kwargs):
+        """ Request url with different page sizes.
+
+        :param resource: resource to request.
+        :param str url: url of resource with query arguments.
+        :param tuple sizes: page sizes, query_scaling_sizes by default.
+        :param kwargs: arguments of test client get method.
+        :return list: number of queries for each of the sizes.
+
+        """
+        model = resource.Meta.model
+        page_size = resource.Meta.page_size
+        counts = []
+        try:
+            for size in sizes or self.query_scaling_sizes:
+                existing = model._default_manager.count()
+                if existing < size:
+                    self.create_objects(resource, size - existing)
+
+                resource.Meta.page_size = size
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url, **kwargs)
+
+                self.assertEqual(
+                    response.status_code, 200,
+                    "GET {} returned {}".format(url, response.status_code))
+                counts.append(len(context.captured_queries))
+        finally:
+            resource.Meta.page_size = page_size
+
+        return counts
+
+    def assertQueriesDoNotScale(self, resource, url, sizes=None, **kwargs):
+        """ Fail if number of queries grows with page size or exceeds
+        Meta.max_queries of resource.
+
+        Arguments are the same as in get_query_counts.
+
+        """
+        sizes = sizes or self.query_scaling_sizes
+        counts = self.get_query_counts(resource, url, sizes=sizes, **kwargs)
+        if len(set(counts)) > 1:
+            self.fail("Number of queries of GET {} grows with page size: "
+                      "{}".format(url, dict(zip(sizes, counts))))
+
+        query = six.moves.urllib.parse.urlsplit(url).query
+        include = RequestParser.parse(QueryDict(query)).include
+        max_queries = resource.get_max_queries(include)
+        if max_queries is not None and counts[0] > max_queries:
+            self.fail("Number of queries of GET {} is {}, budget is {}".format(
+                url, counts[0], max_queries))
@@ -0,0 +1,104 @@
+""" Per-phase timings of requests.
+
+.. versionadded:: 0.10.0
+
+API.handler_view starts timings for the current thread, request processing
+code records phases with timings.phase context manager. Phases with the same
+name are summed up, phases could be nested: "serialize" includes "sql".
+Timings are sent with signal_response_trace and could be returned in
+Server-Timing header, see API server_timing parameter.
+
+Phases:
+
+    * auth: authentication
+    * query: queryset building and pagination count
+    * serialize: dump of documents and linked documents
+    * sql: evaluation of GET queryset, part of serialize
+    * parse: request body parsing
+    * validate: resources cleaning and forms validation
+    * save: saving of forms
+    * encode: response encoding
+    * compress: response compression
+    * total: whole request
+
+Outside of request (background jobs, management commands) phases are not
+recorded.
+
+"""
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .utils import LocalValue
+
+#: Monotonic clock, python 2 does not have it.
+clock = getattr(time, 'perf_counter', time.time)
+
+_current = LocalValue()
+
+
+class Timings(object):
+
+    """ Durations of request phases in seconds."""
+
+    def __init__(self):
+        self.started = clock()
+        self.phases = OrderedDict()
+
+    def add(self, name, duration):
+        self.phases[name] = self.phases.get(name, 0) + duration
+
+    def finish(self):
+        """ Record total duration.
+
+        :return OrderedDict: phase name to duration mapping.
+
+        """
+        self.phases["total"] = clock() - self.started
+        return self.phases
+
+
+def start():
+    """ Start timings of request in current thread."""
+    return _current.set(Timings())
+
+
+def stop():
+    """ Stop timings of current thread.
+
+    :return: Timings or None if they are not started.
+
+    """
+    return _current.pop()
+
+
+def get():
+    return _current.get()
+
+
+@contextmanager
+def phase(name):
+    """ Record duration of code block."""
+    timings = get()
+    if timings is None:
+        yield
+        return
+
+    started = clock()
+    try:
+        yield
+    finally:
+        timings.add(name, clock() - started)
+
+
+def get_server_timing(phases):
+    """ Get Server-Timing header value.
+
+    :param dict phases: phase name to duration in seconds mapping.
+    :return str: header value, durations are in milliseconds.
+
+    """
+    return ", ".join(
+        "{};dur={:.3f}".format(name, duration * 1000)
+        for name, duration in phases.items()
+    )
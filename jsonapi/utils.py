@@ -1,4 +1,7 @@
 """ JSON:API utils."""
+import os
+import threading
+from contextlib import contextmanager
 
 
 class _classproperty(property):
@@ -30,6 +33,95 @@ def _cached(f):
     return wrapper
 
 
+def iter_chunks(iterable, size=None):
+    """ Split iterable into lists of given size.
+
+    .. versionadded:: 0.10.0
+
+    :param size: chunk size, all items are in one chunk if it is None.
+    :return: generator of lists. If size is None, there is exactly one
+        chunk, even empty.
+
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if size is not None and len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk or size is None:
+        yield chunk
+
+
+def makedirs(path):
+    """ Create directory if it does not exist.
+
+    .. versionadded:: 0.10.0
+
+    Directory could be created by other process at the same time.
+
+    """
+    if not os.path.isdir(path):
+        try:
+            os.makedirs(path)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+    return path
+
+
+class LocalValue(object):
+
+    """ Value of current thread, such as timings of request.
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self):
+        return getattr(self._local, 'value', None)
+
+    def set(self, value):
+        self._local.value = value
+        return value
+
+    def pop(self):
+        """ Unset value.
+
+        :return: value or None if it is not set.
+
+        """
+        value = self.get()
+        self._local.value = None
+        return value
+
+
+@contextmanager
+def atomic_write(path, mode="w"):
+    """ Open temporary file, which replaces file at path after code block.
+
+    .. versionadded:: 0.10.0
+
+    Readers of path see either the old or the new file. Temporary file is
+    removed if code block raises exception.
+
+    """
+    temp_path = "{}.{}.{}.tmp".format(
+        path, os.getpid(), threading.current_thread().ident)
+    try:
+        with open(temp_path, mode) as f:
+            yield f
+        os.rename(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 classproperty = lambda f: _classproperty(classmethod(f))
 cached_property = lambda f: property(_cached(f))
 cached_classproperty = lambda f: classproperty(_cached(f))
@@ -0,0 +1,158 @@
+""" Background workers.
+
+.. versionadded:: 0.10.0
+
+Pool is used to do work outside of request thread: refresh stale cached
+responses, process bulk import and export jobs. Threads are started on first
+submit, so pool could be created on module import and used after server
+forked worker processes.
+
+"""
+import logging
+import os
+import threading
+
+from . import six
+
+logger = logging.getLogger(__name__)
+
+
+def close_db_connections():
+    """ Close database connections opened in current thread."""
+    from django.db import connections
+    for connection in connections.all():
+        connection.close()
+
+
+class WorkerPool(object):
+
+    """ Bounded pool of daemon threads.
+
+    :param int size: number of threads. If size is 0, tasks are executed
+        immediately in the caller thread.
+    :param int queue_size: maximum number of waiting tasks.
+    :param str name: threads name prefix.
+
+    """
+
+    def __init__(self, size=2, queue_size=100, name='jsonapi-worker'):
+        self.size = size
+        self.queue_size = queue_size
+        self.name = name
+        self._queue = six.moves.queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, **kwargs):
+        """ Submit task to the pool.
+
+        :return bool: True if task is accepted, False if queue is full.
+
+        """
+        if not self.size:
+            self._execute(function, args, kwargs)
+            return True
+
+        self._start()
+        try:
+            self._queue.put_nowait((function, args, kwargs))
+        except six.moves.queue.Full:
+            logger.warning("Worker pool %s queue is full", self.name)
+            return False
+        return True
+
+    def join(self):
+        """ Wait until every submitted task is done."""
+        if self._threads:
+            self._queue.join()
+
+    def _start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            # NOTE: threads are not copied to forked process, start new ones.
+            self._pid = os.getpid()
+            self._queue = six.moves.queue.Queue(maxsize=self.queue_size)
+            self._threads = []
+            for index in range(self.size):
+                thread = threading.Thread(
+                    target=self._run, name="{}-{}".format(self.name, index))
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            function, args, kwargs = queue.get()
+            try:
+                self._execute(function, args, kwargs)
+                close_db_connections()
+            finally:
+                queue.task_done()
+
+    @staticmethod
+    def _execute(function, args, kwargs):
+        try:
+            function(*args, **kwargs)
+        except Exception:
+            logger.exception("Worker task %r failed", function)
+
+
+class BatchWorker(WorkerPool):
+
+    """ Daemon thread passing submitted items to function in batches.
+
+    .. versionadded:: 0.10.0
+
+    :param function: callable, it gets list of items.
+    :param int size: number of threads. If size is 0, function is called
+        immediately in the caller thread.
+    :param int queue_size: maximum number of waiting items.
+    :param int batch_size: maximum number of items in one call.
+    :param str name: thread name prefix.
+
+    """
+
+    def __init__(self, function, size=1, queue_size=100, batch_size=100,
+                 name='jsonapi-batch'):
+        super(BatchWorker, self).__init__(
+            size=size, queue_size=queue_size, name=name)
+        self.function = function
+        self.batch_size = batch_size
+
+    def submit(self, item):
+        """ Submit item to the worker.
+
+        :return bool: True if item is accepted, False if queue is full.
+
+        """
+        if not self.size:
+            self._execute(self.function, ([item],), {})
+            return True
+
+        self._start()
+        try:
+            self._queue.put_nowait(item)
+        except six.moves.queue.Full:
+            return False
+        return True
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            batch = [queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except six.moves.queue.Empty:
+                    break
+
+            try:
+                self._execute(self.function, (batch,), {})
+                close_db_connections()
+            finally:
+                for _ in batch:
+                    queue.task_done()
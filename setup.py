@@ -22,7 +22,11 @@ def read(fname):
 setup(
     name="jsonapi",
     version=version,
-    packages=["jsonapi"],
+    packages=[
+        "jsonapi",
+        "jsonapi.management",
+        "jsonapi.management.commands",
+    ],
     include_package_data=True,
     # metadata for upload to PyPI
     author="Kirill Pavlov",
@@ -72,6 +72,11 @@ class Comment(models.Model):
     author = models.ForeignKey(Author)
 
 
+class Category(models.Model):
+    name = models.CharField(max_length=100)
+    updated = models.DateTimeField(auto_now=True)
+
+
 class TestSerializerAllFields(models.Model):
     big_integer = models.BigIntegerField()
     # binary = models.BinaryField()
@@ -74,6 +74,7 @@ class CommentResource(Resource):
     class Meta:
         model = 'testapp.Comment'
         page_size = 3
+        max_queries = 2
 
     @classmethod
     def get_filters(cls, filters):
@@ -85,6 +86,13 @@ class CommentResource(Resource):
         return result
 
 
+@api.register
+class CategoryResource(Resource):
+    class Meta:
+        model = 'testapp.Category'
+        updated_field = 'updated'
+
+
 @api.register
 class GroupResource(Resource):
     class Meta:
@@ -25,7 +25,7 @@ def log_jsonapi_response(sender, signal, request=None,
         path=request.get_full_path()
     )
     if request.body:
-        msg += " --data '{}'".format(request.body.decode('utf8'))
+        msg += u" --data '{}'".format(request.body.decode('utf8', 'replace'))
 
     msg += "; status={status_code} ({duration:.3f} sec)".format(
         duration=duration,
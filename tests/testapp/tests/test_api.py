@@ -1,15 +1,19 @@
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from jsonapi.api import API
+from jsonapi.nplusone import NPlusOneError
 from jsonapi.resource import Resource
+from jsonapi.testing import QueryScalingMixin
 from mixer.backend.django import mixer
 from testfixtures import compare
 import datetime
 import django
 import json
+import mock
 import unittest
 
 from ..models import Author, Post, PostWithPicture
+from ..resources import CommentResource, PostResource
 from ..urls import api
 
 User = get_user_model()
@@ -1143,3 +1147,45 @@ class TestApiClient(TestCase):
         )
         data = json.loads(response.content.decode("utf-8"))
         self.assertEqual([o['id'] for o in data['data']], [2, 1])
+
+
+class TestQueryScaling(QueryScalingMixin, TestCase):
+    def create_objects(self, resource, count):
+        mixer.cycle(count).blend(resource.Meta.model)
+
+    def test_resources(self):
+        for resource in api.resource_map.values():
+            if resource.Meta.is_model and not resource.Meta.authenticators:
+                self.assertQueriesDoNotScale(
+                    resource, '/api/' + resource.Meta.name)
+
+    def test_include(self):
+        self.assertQueriesDoNotScale(PostResource, '/api/post?include=author')
+        self.assertQueriesDoNotScale(
+            CommentResource, '/api/comment?include=post,author')
+
+    def test_max_queries(self):
+        self.assertEqual(CommentResource.get_max_queries(), 2)
+        self.assertEqual(
+            CommentResource.get_max_queries(["post", "author"]), 4)
+        self.assertIsNone(PostResource.get_max_queries(["author"]))
+
+        CommentResource.Meta.max_queries = {"": 2, "post": 0}
+        self.addCleanup(setattr, CommentResource.Meta, 'max_queries', 2)
+        self.assertEqual(
+            CommentResource.get_max_queries(["post", "author"]), 3)
+
+    def test_max_queries_exceeded(self):
+        mixer.blend('testapp.Comment')
+        CommentResource.Meta.max_queries = 1
+        self.addCleanup(setattr, CommentResource.Meta, 'max_queries', 2)
+        with mock.patch.object(api, 'nplusone', 'raise'), \
+                self.assertRaises(NPlusOneError) as context:
+            self.client.get('/api/comment')
+
+        self.assertIn(
+            "budget is exceeded in resource comment: 2 queries, budget is 1",
+            str(context.exception))
+        with self.assertRaises(AssertionError):
+            self.assertQueriesDoNotScale(
+                CommentResource, '/api/comment', sizes=(1,))
@@ -0,0 +1,327 @@
+from django.core.cache import cache
+from django.test import TestCase
+from mixer.backend.django import mixer
+import gc
+import mock
+import threading
+import time
+
+from jsonapi import cache as jsonapi_cache
+from jsonapi.cache import LRUCache, SingleFlight
+from jsonapi.workers import WorkerPool
+
+from ..models import Author, Group, Membership, Post
+from ..resources import AuthorResource, PostResource, UserResource
+from ..urls import api
+
+
+class TestLRUCache(TestCase):
+    def test_get_set(self):
+        cache = LRUCache()
+        self.assertIsNone(cache.get('key'))
+        cache.set('key', 'value')
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_maxsize(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+
+    def test_ttl(self):
+        cache = LRUCache(ttl=0.01)
+        cache.set('key', 'value')
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('key'))
+
+    def test_invalidate_tags(self):
+        cache = LRUCache()
+        cache.set('a', 1, tags=['x'])
+        cache.set('b', 2, tags=['x', 'y'])
+        cache.set('c', 3, tags=['y'])
+        cache.invalidate('x')
+        self.assertNotIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_not_kept_alive(self):
+        count = len(jsonapi_cache._caches)
+        LRUCache()
+        gc.collect()
+        self.assertEqual(len(jsonapi_cache._caches), count)
+
+    def test_set_outdated_generation(self):
+        cache = LRUCache()
+        generation = cache.generation
+        cache.invalidate('x')
+        cache.set('a', 1, generation=generation)
+        self.assertNotIn('a', cache)
+
+
+class TestSingleFlight(TestCase):
+    def run_concurrently(self, single_flight, function, number=5):
+        results = []
+
+        def target():
+            try:
+                results.append(single_flight.do('key', function))
+            except ValueError as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=target) for _ in range(number)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalesce_calls(self):
+        calls = []
+
+        def function():
+            calls.append(1)
+            time.sleep(0.05)
+            return len(calls)
+
+        results = self.run_concurrently(SingleFlight(), function)
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, [1] * 5)
+
+    def test_error_propagation(self):
+        def function():
+            time.sleep(0.05)
+            raise ValueError("error")
+
+        results = self.run_concurrently(SingleFlight(), function)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    def test_timeout(self):
+        calls = []
+
+        def function():
+            calls.append(1)
+            time.sleep(0.05)
+
+        self.run_concurrently(SingleFlight(timeout=0.001), function, 2)
+        self.assertEqual(calls, [1, 1])
+
+    def test_sequential_calls_not_coalesced(self):
+        single_flight = SingleFlight()
+        self.assertEqual(single_flight.do('key', lambda: 1), 1)
+        self.assertEqual(single_flight.do('key', lambda: 2), 2)
+
+
+class TestDocumentCache(TestCase):
+    def setUp(self):
+        self.cache = LRUCache()
+        AuthorResource.Meta.document_cache = self.cache
+        PostResource.Meta.document_cache = self.cache
+
+    def tearDown(self):
+        AuthorResource.Meta.document_cache = None
+        PostResource.Meta.document_cache = None
+
+    def test_dump_document_cached(self):
+        author = mixer.blend(Author, name="author")
+        document = AuthorResource.dump_document(author)
+        document["name"] = "changed"
+        self.assertEqual(len(self.cache), 1)
+
+        with self.assertNumQueries(0):
+            cached_document = AuthorResource.dump_document(
+                Author(id=author.id, name="other"))
+        self.assertEqual(cached_document["name"], "author")
+
+    def test_cached_links_copied(self):
+        post = mixer.blend(Post)
+        field = AuthorResource.Meta.model_info.field_resource_map["posts"]
+        document = AuthorResource.dump_document(
+            post.author, fields_to_many=[field])
+        document["links"]["posts"].append(0)
+
+        document = AuthorResource.dump_document(
+            post.author, fields_to_many=[field])
+        self.assertEqual(document["links"]["posts"], [post.id])
+        document["links"]["posts"].append(0)
+        self.assertEqual(AuthorResource.dump_document(
+            post.author, fields_to_many=[field])["links"]["posts"], [post.id])
+
+    def test_invalidate_on_save_delete(self):
+        author = mixer.blend(Author, name="author")
+        AuthorResource.dump_document(author)
+        author.name = "changed"
+        author.save()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(
+            AuthorResource.dump_document(author)["name"], "changed")
+
+        author.delete()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalidate_related_documents(self):
+        post = mixer.blend(Post)
+        field = AuthorResource.Meta.model_info.field_resource_map["posts"]
+        document = AuthorResource.dump_document(
+            post.author, fields_to_many=[field])
+        self.assertEqual(document["links"]["posts"], [post.id])
+
+        mixer.blend(Post, author=post.author)
+        self.assertEqual(len(self.cache), 0)
+
+        PostResource.dump_document(post)
+        post.author.delete()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalidate_through_model(self):
+        group = mixer.blend(Group)
+        author = mixer.blend(Author)
+        field = AuthorResource.Meta.model_info.field_resource_map["groups"]
+        AuthorResource.dump_document(author, fields_to_many=[field])
+        Membership.objects.create(group=group, author=author)
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestResponseCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        api.response_cache.enabled = True
+        AuthorResource.Meta.cache_ttl = 60
+        UserResource.Meta.cache_ttl = 60
+
+    def tearDown(self):
+        api.response_cache.enabled = False
+        AuthorResource.Meta.cache_ttl = None
+        UserResource.Meta.cache_ttl = None
+
+    def get(self, url, **kwargs):
+        return self.client.get(
+            url, content_type='application/vnd.api+json', **kwargs)
+
+    def test_response_cached(self):
+        mixer.blend(Author)
+        content = self.get('/api/author').content
+        with self.assertNumQueries(0):
+            response = self.get('/api/author')
+        self.assertEqual(response.content, content)
+
+    def test_query_string_normalized(self):
+        self.get('/api/author?include=posts&sort=-id')
+        with self.assertNumQueries(0):
+            self.get('/api/author?sort=-id&include=posts')
+        with self.assertNumQueries(1):
+            self.get('/api/author?sort=id&include=posts')
+
+    def test_host(self):
+        self.get('/api/author', HTTP_HOST='a.example.com')
+        # Api urls are shared, they could be updated by concurrent request.
+        with mock.patch.object(api, 'update_urls'):
+            with self.assertNumQueries(1):
+                self.get('/api/author', HTTP_HOST='b.example.com')
+
+    def test_invalidate_primary_model(self):
+        author = mixer.blend(Author, name="author")
+        self.get('/api/author')
+        author.name = "changed"
+        author.save()
+        response = self.get('/api/author')
+        self.assertIn(b"changed", response.content)
+
+    def test_invalidate_include_model(self):
+        post = mixer.blend(Post, title="title")
+        self.get('/api/author?include=posts')
+        post.title = "changed"
+        post.save()
+        response = self.get('/api/author?include=posts')
+        self.assertIn(b"changed", response.content)
+
+    def test_stale_response_refreshed(self):
+        refresh_pool = api.refresh_pool
+        api.refresh_pool = WorkerPool(size=0)
+        AuthorResource.Meta.cache_ttl = 0
+        AuthorResource.Meta.cache_stale_ttl = 60
+        try:
+            author = mixer.blend(Author, name="author")
+            self.get('/api/author')
+            # NOTE: update does not send signals, cache is not invalidated.
+            Author.objects.filter(id=author.id).update(name="changed")
+            response = self.get('/api/author')
+            self.assertNotIn(b"changed", response.content)
+            response = self.get('/api/author')
+            self.assertIn(b"changed", response.content)
+        finally:
+            api.refresh_pool = refresh_pool
+            AuthorResource.Meta.cache_stale_ttl = None
+
+    def test_refresh_scheduled_once(self):
+        submitted = []
+
+        class Pool(object):
+            @staticmethod
+            def submit(function):
+                submitted.append(function)
+                time.sleep(0.01)
+                return True
+
+        refresh_pool = api.refresh_pool
+        api.refresh_pool = Pool()
+        try:
+            threads = [threading.Thread(
+                target=api.refresh_cached_content,
+                args=(AuthorResource, 'key')) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            api.refresh_pool = refresh_pool
+            api._refreshing.discard('key')
+
+        self.assertEqual(len(submitted), 1)
+
+    def test_authenticated_resource_not_cached(self):
+        self.assertIsNone(api.get_response_cache_key(
+            UserResource, request=type('Request', (object,), {})()))
+
+
+class TestDocumentFragments(TestCase):
+    def setUp(self):
+        self.cache = LRUCache()
+        AuthorResource.Meta.document_cache = self.cache
+        PostResource.Meta.document_cache = self.cache
+
+    def tearDown(self):
+        AuthorResource.Meta.document_cache = None
+        PostResource.Meta.document_cache = None
+
+    def get(self, url):
+        return self.client.get(url, content_type='application/vnd.api+json')
+
+    def test_fragments_output(self):
+        mixer.cycle(3).blend(Post)
+        for url in ['/api/author', '/api/post?include=author']:
+            AuthorResource.Meta.document_cache = None
+            PostResource.Meta.document_cache = None
+            content = self.get(url).content
+            AuthorResource.Meta.document_cache = self.cache
+            PostResource.Meta.document_cache = self.cache
+            self.assertEqual(self.get(url).content, content)
+            self.assertEqual(self.get(url).content, content)
+
+    def test_fragments_cached(self):
+        author = mixer.blend(Post).author
+        self.get('/api/author')
+        self.get('/api/post?include=author')
+        entry = next(
+            value for key, (_, value, _) in self.cache._data.items()
+            if key[0] is AuthorResource)
+        self.assertEqual(set(entry["fragments"]), {(), (("type", "author"),)})
+
+        fragment = AuthorResource.dump_document_fragment(author)
+        self.assertIs(
+            AuthorResource.dump_document_fragment(author), fragment)
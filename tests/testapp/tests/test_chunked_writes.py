@@ -0,0 +1,109 @@
+from django.test import TestCase
+from mixer.backend.django import mixer
+import json
+import mock
+
+from ..models import Author
+from ..resources import AuthorResource
+
+
+class TestChunkedWrites(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(AuthorResource.Meta, 'write_chunk_size', 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request(self, method, url, data):
+        response = getattr(self.client, method)(
+            url, json.dumps({"data": data}),
+            content_type='application/vnd.api+json')
+        return response, json.loads(response.content.decode('utf8'))
+
+    def test_post(self):
+        response, data = self.request(
+            "post", '/api/author', [{"name": str(i)} for i in range(5)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([d["name"] for d in data["data"]],
+                         ["0", "1", "2", "3", "4"])
+        self.assertEqual(data["meta"]["chunks"], [
+            {"offset": 0, "count": 2, "status": "saved"},
+            {"offset": 2, "count": 2, "status": "saved"},
+            {"offset": 4, "count": 1, "status": "saved"},
+        ])
+
+    def test_post_atomic(self):
+        items = [{"name": "a"}] * 3 + [{"name": ""}]
+        response, data = self.request("post", '/api/author', items)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(data["errors"][0]["links"], ["/data/3"])
+        self.assertEqual(Author.objects.count(), 0)
+
+    def test_post_commit_chunk(self):
+        items = [{"name": "a"}] * 3 + [{"name": ""}, {"name": "b"}]
+        response, data = self.request(
+            "post", '/api/author?commit=chunk', items)
+        # Saved chunks are kept, so response is successful with errors.
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["errors"][0]["links"], ["/data/3"])
+        self.assertEqual(
+            data["data"],
+            [{"id": id} for id in Author.objects.values_list("id", flat=True)])
+        self.assertEqual(data["meta"]["chunks"], [
+            {"offset": 0, "count": 2, "status": "saved"},
+            {"offset": 2, "count": 0, "status": "failed"},
+        ])
+        self.assertEqual(Author.objects.count(), 2)
+
+    def test_post_commit_chunk_ids(self):
+        response, data = self.request(
+            "post", '/api/author?commit=chunk',
+            [{"name": str(i)} for i in range(3)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            data["data"],
+            [{"id": id} for id in Author.objects.values_list("id", flat=True)])
+        self.assertEqual(len(data["meta"]["chunks"]), 2)
+
+    def test_post_commit_chunk_first_failed(self):
+        response, data = self.request(
+            "post", '/api/author?commit=chunk', [{"name": ""}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(data["data"], [])
+
+    def test_commit_not_valid(self):
+        response, _ = self.request(
+            "post", '/api/author?commit=unknown', [{"name": "a"}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Author.objects.count(), 0)
+
+    def test_put(self):
+        authors = mixer.cycle(3).blend(Author)
+        ids = ",".join(str(a.id) for a in authors)
+        response, data = self.request(
+            "put", '/api/author/' + ids,
+            [{"id": a.id, "name": "changed"} for a in authors])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(data["meta"]["chunks"]), 2)
+        self.assertEqual(
+            set(Author.objects.values_list("name", flat=True)), {"changed"})
+
+    def test_put_ids_not_matched(self):
+        authors = mixer.cycle(3).blend(Author, name="name")
+        ids = ",".join(str(a.id) for a in authors)
+        response, _ = self.request(
+            "put", '/api/author/' + ids,
+            [{"id": a.id, "name": "changed"} for a in authors[:2]])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            set(Author.objects.values_list("name", flat=True)), {"name"})
+
+    def test_put_ids_not_matched_commit_chunk(self):
+        authors = mixer.cycle(3).blend(Author, name="name")
+        ids = ",".join(str(a.id) for a in authors)
+        response, data = self.request(
+            "put", '/api/author/{}?commit=chunk'.format(ids),
+            [{"id": authors[0].id, "name": "changed"}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["meta"]["chunks"], [
+            {"offset": 0, "count": 1, "status": "saved"}])
+        self.assertIn("not matched", data["errors"][0]["detail"])
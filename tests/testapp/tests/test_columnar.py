@@ -0,0 +1,66 @@
+""" Test columnar representation of collections."""
+from django.test import TestCase
+from mixer.backend.django import mixer
+import json
+
+from ..models import Author, Comment, Post
+
+
+class TestColumnar(TestCase):
+    def get(self, url, **kwargs):
+        response = self.client.get(
+            url, content_type='application/vnd.api+json', **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('utf8'))
+
+    def test_columnar(self):
+        authors = mixer.cycle(2).blend(Author)
+        data = self.get('/api/author?format=columnar&sort=id')
+        self.assertEqual(data["type"], "authors")
+        self.assertEqual(data["columns"], ["id", "name"])
+        self.assertEqual(
+            data["rows"], [[author.id, author.name] for author in authors])
+        self.assertNotIn("data", data)
+
+    def test_same_documents(self):
+        mixer.cycle(3).blend(Comment)
+        url = '/api/comment?include=post,author'
+        data = self.get(url)
+        columnar = self.get(url + '&format=columnar')
+        self.assertEqual(columnar["links"], data["links"])
+
+        documents = [
+            dict(zip(columnar["columns"], row)) for row in columnar["rows"]]
+        self.assertEqual(documents, [
+            dict(
+                [(k, v) for k, v in d.items() if k != "links"] +
+                [("links." + k, v) for k, v in d["links"].items()]
+            )
+            for d in data["data"]
+        ])
+
+        self.assertEqual(
+            [(linked["type"], len(linked["rows"]))
+             for linked in columnar["linked"]],
+            [("post", 3), ("author", 3)])
+        self.assertIn("links.author", columnar["linked"][0]["columns"])
+
+    def test_accept_header(self):
+        mixer.blend(Post)
+        data = self.get(
+            '/api/post',
+            HTTP_ACCEPT='application/vnd.api+json; format=columnar')
+        self.assertEqual(data["type"], "posts")
+        self.assertEqual(len(data["rows"]), 1)
+
+    def test_unknown_format(self):
+        response = self.client.get(
+            '/api/author?format=xml', content_type='application/vnd.api+json')
+        self.assertEqual(response.status_code, 400)
+        data = json.loads(response.content.decode('utf8'))
+        self.assertEqual(data["errors"][0]["code"], 32003)
+
+    def test_empty(self):
+        data = self.get('/api/author?format=columnar')
+        self.assertEqual(data["columns"], ["id", "name"])
+        self.assertEqual(data["rows"], [])
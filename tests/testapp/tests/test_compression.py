@@ -0,0 +1,112 @@
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import TestCase, RequestFactory
+from mixer.backend.django import mixer
+import gzip
+import io
+import mock
+import zlib
+
+from jsonapi.compression import compress, compress_stream, get_encoding
+from ..models import Author
+from ..resources import AuthorResource
+from ..urls import api
+
+
+def gunzip(content):
+    return gzip.GzipFile(fileobj=io.BytesIO(content)).read()
+
+
+class TestGetEncoding(TestCase):
+    def test_get_encoding(self):
+        self.assertEqual(get_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(get_encoding("deflate, gzip"), "gzip")
+        self.assertEqual(get_encoding("deflate"), "deflate")
+        self.assertEqual(get_encoding("gzip;q=0.5, deflate"), "deflate")
+        self.assertEqual(get_encoding("GZIP"), "gzip")
+        self.assertEqual(get_encoding("*"), "gzip")
+        self.assertIsNone(get_encoding("gzip;q=0, *;q=0"))
+        self.assertIsNone(get_encoding("br"))
+        self.assertIsNone(get_encoding(""))
+        self.assertIsNone(get_encoding(None))
+
+    def test_compress(self):
+        content = b"content" * 100
+        self.assertEqual(gunzip(compress(content, "gzip")), content)
+        self.assertEqual(
+            zlib.decompress(compress(content, "deflate")), content)
+        # Output is deterministic.
+        self.assertEqual(compress(content, "gzip"), compress(content, "gzip"))
+
+    def test_compress_stream(self):
+        chunks = [b"chunk" * 100] * 10
+        self.assertEqual(
+            gunzip(b"".join(compress_stream(iter(chunks), "gzip"))),
+            b"".join(chunks))
+
+
+class TestResponseCompression(TestCase):
+    def setUp(self):
+        mixer.cycle(50).blend(Author)
+
+    def get(self, url, **kwargs):
+        return self.client.get(
+            url, content_type='application/vnd.api+json', **kwargs)
+
+    def test_compressed(self):
+        content = self.get('/api/author').content
+        response = self.get('/api/author', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gunzip(response.content), content)
+
+        response = self.get('/api/author', HTTP_ACCEPT_ENCODING='deflate')
+        self.assertEqual(response['Content-Encoding'], 'deflate')
+        self.assertEqual(zlib.decompress(response.content), content)
+
+    def test_min_length(self):
+        response = self.get('/api/author/1', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_disabled(self):
+        with mock.patch.object(api, 'compress_min_length', None):
+            response = self.get('/api/author', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn('Accept-Encoding', response['Vary'])
+
+    def test_streaming_response(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = api.compress_response(
+            request, StreamingHttpResponse([b"a", b"b"]))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gunzip(b"".join(response.streaming_content)), b"ab")
+
+    def test_etag_weakened(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = HttpResponse(b"a" * 2000)
+        response['ETag'] = '"etag"'
+        response = api.compress_response(request, response)
+        self.assertEqual(response['ETag'], 'W/"etag"')
+
+
+class TestCompressedResponseCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        api.response_cache.enabled = True
+        AuthorResource.Meta.cache_ttl = 60
+        mixer.cycle(50).blend(Author)
+
+    def tearDown(self):
+        api.response_cache.enabled = False
+        AuthorResource.Meta.cache_ttl = None
+
+    def test_compressed_content_cached(self):
+        content = self.client.get('/api/author').content
+        with mock.patch('jsonapi.api.compress', wraps=compress) as compress_:
+            for _ in range(3):
+                response = self.client.get(
+                    '/api/author', HTTP_ACCEPT_ENCODING='gzip')
+                self.assertEqual(gunzip(response.content), content)
+        self.assertEqual(compress_.call_count, 1)
+        self.assertTrue(response['ETag'].startswith('W/'))
@@ -0,0 +1,103 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.utils.http import http_date
+from mixer.backend.django import mixer
+import time
+
+from ..models import Author, Category
+from ..resources import AuthorResource, CategoryResource
+from ..urls import api
+
+
+class TestConditionalGet(TestCase):
+    def get(self, url, **kwargs):
+        return self.client.get(
+            url, content_type='application/vnd.api+json', **kwargs)
+
+    def test_etag_last_modified(self):
+        mixer.blend(Category)
+        response = self.get('/api/category')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_if_none_match(self):
+        mixer.blend(Category)
+        etag = self.get('/api/category')['ETag']
+        # Only aggregate query is executed.
+        with self.assertNumQueries(1):
+            response = self.get('/api/category', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_etag_changed(self):
+        category = mixer.blend(Category)
+        etag = self.get('/api/category')['ETag']
+        self.assertNotEqual(self.get('/api/category?sort=-id')['ETag'], etag)
+
+        mixer.blend(Category)
+        response = self.get('/api/category', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        category.delete()
+        response = self.get('/api/category', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since(self):
+        mixer.blend(Category)
+        response = self.get(
+            '/api/category', HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, 304)
+
+        response = self.get(
+            '/api/category',
+            HTTP_IF_MODIFIED_SINCE=http_date(time.time() - 3600))
+        self.assertEqual(response.status_code, 200)
+
+    def test_include_no_validators(self):
+        mixer.blend(Category)
+        request = RequestFactory().get('/api/category', {'include': 'x'})
+        self.assertIsNone(CategoryResource.get_validators(request=request))
+
+    def test_no_validators(self):
+        response = self.get('/api/author')
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_cached_resource_etag(self):
+        cache.clear()
+        api.response_cache.enabled = True
+        AuthorResource.Meta.cache_ttl = 60
+        try:
+            author = mixer.blend(Author)
+            etag = self.get('/api/author')['ETag']
+            response = self.get('/api/author', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+            author.save()
+            response = self.get('/api/author', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+        finally:
+            api.response_cache.enabled = False
+            AuthorResource.Meta.cache_ttl = None
+
+    def test_cached_validators(self):
+        cache.clear()
+        api.response_cache.enabled = True
+        CategoryResource.Meta.cache_ttl = 60
+        try:
+            mixer.blend(Category)
+            etag = self.get('/api/category')['ETag']
+            # Validators are cached with content, aggregate is not executed.
+            with self.assertNumQueries(0):
+                response = self.get('/api/category')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['ETag'], etag)
+                response = self.get(
+                    '/api/category', HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+        finally:
+            api.response_cache.enabled = False
+            CategoryResource.Meta.cache_ttl = None
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from django.test import TestCase
+from django.utils.translation import ugettext_lazy
+import datetime
+import decimal
+import json
+import unittest
+import uuid
+
+from jsonapi import six
+from jsonapi.encoders import (
+    OrjsonEncoderBackend,
+    StdlibEncoderBackend,
+    get_backend,
+    get_converter,
+    orjson,
+)
+from jsonapi.serializers import DatetimeDecimalEncoder
+
+
+class ListSubclass(six.moves.UserList, list):
+    pass
+
+
+DOCUMENT = {
+    "data": [{
+        "id": 1,
+        "name": u"имя \"quoted\"\n",
+        "datetime": datetime.datetime(1900, 12, 31, 23, 59, 0, 1),
+        "date": datetime.date(1900, 12, 31),
+        "time": datetime.time(23, 59),
+        "decimal": decimal.Decimal('0.1'),
+        "uuid": uuid.UUID('12345678123456781234567812345678'),
+        "lazy": ugettext_lazy("lazy"),
+        "float": 1.5,
+        "small_float": 1e-7,
+        "big_integer": 2 ** 70,
+        "none": None,
+        "bool": True,
+        "errors": ListSubclass(["error"]),
+        "links": {"author": 1, "comments": [1, 2]},
+    }],
+    "meta": {1: "integer key"},
+}
+
+
+class TestEncoderBackends(TestCase):
+    def test_get_converter_subclass(self):
+        class DateTime(datetime.datetime):
+            pass
+
+        self.assertIsNotNone(get_converter(DateTime))
+        self.assertIsNone(get_converter(object))
+
+    def test_stdlib_backend(self):
+        content = StdlibEncoderBackend().dumps(DOCUMENT)
+        data = json.loads(content.decode('utf8'))
+        document = data["data"][0]
+        self.assertEqual(document["datetime"], "1900-12-31T23:59:00.000001")
+        self.assertEqual(document["decimal"], 0.1)
+        self.assertEqual(
+            document["uuid"], "12345678-1234-5678-1234-567812345678")
+        self.assertEqual(document["lazy"], "lazy")
+        self.assertEqual(document["errors"], ["error"])
+        self.assertEqual(data["meta"], {"1": "integer key"})
+
+    def test_stdlib_backend_unknown_type(self):
+        with self.assertRaises(TypeError):
+            StdlibEncoderBackend().dumps({"value": object()})
+
+    def test_json_encoder_class(self):
+        backend = get_backend(DatetimeDecimalEncoder)
+        self.assertEqual(backend.cls, DatetimeDecimalEncoder)
+        self.assertIs(get_backend(DatetimeDecimalEncoder), backend)
+        self.assertEqual(
+            backend.dumps(DOCUMENT), StdlibEncoderBackend().dumps(DOCUMENT))
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_backend_output_identical(self):
+        stdlib_backend = StdlibEncoderBackend()
+        orjson_backend = OrjsonEncoderBackend()
+        self.assertEqual(
+            orjson_backend.dumps(DOCUMENT), stdlib_backend.dumps(DOCUMENT))
+
+        document = dict(DOCUMENT["data"][0])
+        del document["small_float"], document["big_integer"]
+        self.assertEqual(
+            orjson_backend.dumps(document), stdlib_backend.dumps(document))
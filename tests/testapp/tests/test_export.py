@@ -0,0 +1,157 @@
+from django.core.cache import cache
+from django.test import TestCase
+from mixer.backend.django import mixer
+from testfixtures import LogCapture
+import json
+import mock
+import os
+import shutil
+import tempfile
+
+from jsonapi.jobs import JobStore
+from jsonapi.workers import WorkerPool
+from ..models import Author, Post
+from ..resources import PostResource
+from ..urls import api
+
+
+class TestExport(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for attribute, value in [
+                ('job_store', JobStore(directory=directory)),
+                ('job_pool', WorkerPool(size=0))]:
+            patcher = mock.patch.object(api, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        api.response_cache.enabled = True
+        PostResource.Meta.export_chunk_size = 2
+
+    def tearDown(self):
+        api.response_cache.enabled = False
+        PostResource.Meta.export_chunk_size = None
+
+    def export(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 202)
+        job = json.loads(response.content.decode('utf8'))["data"]
+        self.assertEqual(job["status"], "queued")
+        self.assertTrue(response['Location'].endswith(
+            '/api/jobs/' + job["id"]))
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        content = b"".join(response.streaming_content)
+        self.assertEqual(response['Content-Length'], str(len(content)))
+        return response, [
+            json.loads(line) for line in content.decode('utf8').splitlines()]
+
+    def test_export(self):
+        authors = mixer.cycle(2).blend(Author)
+        posts = [
+            mixer.blend(Post, author=authors[index % 2])
+            for index in range(5)
+        ]
+
+        response, documents = self.export('/api/post/export?include=author')
+        self.assertEqual(
+            [(d["type"], d["id"]) for d in documents if d["type"] == "posts"],
+            [("posts", post.id) for post in posts])
+        self.assertEqual(
+            sorted(d["id"] for d in documents if d["type"] == "author"),
+            sorted(author.id for author in authors))
+        self.assertEqual(documents[0]["title"], posts[0].title)
+
+        job = api.job_store.get(response['ETag'].strip('"'))
+        self.assertEqual(job["result"], {"count": 5})
+        self.assertEqual(job["progress"], {"processed": 5})
+
+    def test_export_sort_not_unique(self):
+        posts = mixer.cycle(5).blend(Post, title="a")
+        _, documents = self.export('/api/post/export?sort=title')
+        self.assertEqual(
+            [d["id"] for d in documents], [post.id for post in posts])
+
+    def test_export_filter(self):
+        post = mixer.blend(Post, title="a")
+        mixer.blend(Post, title="b")
+        _, documents = self.export('/api/post/export?filter=title=a')
+        self.assertEqual([d["id"] for d in documents], [post.id])
+
+    def test_export_reused(self):
+        mixer.cycle(3).blend(Post)
+        response, _ = self.export('/api/post/export')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.client.get('/api/post/export')['ETag'], response['ETag'])
+
+        response = self.client.get(
+            '/api/post/export', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        mixer.blend(Post)
+        _, documents = self.export('/api/post/export')
+        self.assertEqual(len(documents), 4)
+
+    def test_superseded_export_deleted(self):
+        mixer.cycle(3).blend(Post)
+        response, _ = self.export('/api/post/export')
+        job_id = response['ETag'].strip('"')
+
+        mixer.blend(Post)
+        response, _ = self.export('/api/post/export')
+        self.assertIsNone(api.job_store.get(job_id))
+        self.assertFalse(os.path.exists(
+            api.job_store.get_path(job_id, "ndjson")))
+
+        # Export of other query is kept.
+        job_id = response['ETag'].strip('"')
+        self.export('/api/post/export?sort=-id')
+        self.assertIsNotNone(api.job_store.get(job_id))
+
+    def test_concurrent_export_submitted_once(self):
+        mixer.cycle(3).blend(Post)
+        get = api.job_store.get
+        calls = []
+
+        def get_stale(job_id):
+            # Concurrent request has not seen job created by the first one.
+            calls.append(job_id)
+            return get(job_id) if len(calls) > 1 else None
+
+        with mock.patch.object(
+                api.job_pool, 'submit', return_value=True) as submit:
+            self.client.get('/api/post/export')
+            with mock.patch.object(api.job_store, 'get', get_stale):
+                response = self.client.get('/api/post/export')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(submit.call_count, 1)
+
+    def test_export_error_not_exposed(self):
+        with mock.patch.object(
+                PostResource, 'export', side_effect=ValueError("internal")):
+            with LogCapture('jsonapi.api'):
+                response = self.client.get('/api/post/export')
+        job = api.job_store.get(response['Location'].rsplit('/', 1)[-1])
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["errors"], [{"detail": "Export failed"}])
+
+    def test_export_not_compressed(self):
+        mixer.cycle(3).blend(Post)
+        self.client.get('/api/post/export')
+        response = self.client.get(
+            '/api/post/export', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_export_not_available(self):
+        response = self.client.get('/api/author/export')
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_query_not_valid(self):
+        response = self.client.get('/api/post/export?include=unknown')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,169 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from mixer.backend.django import mixer
+from testfixtures import LogCapture
+import json
+import mock
+import os
+import shutil
+import tempfile
+
+from jsonapi.jobs import JobStore, prefers_async
+from jsonapi.signals import signal_response
+from jsonapi.workers import WorkerPool
+from ..models import Author
+from ..signals import log_jsonapi_response
+from ..urls import api
+
+
+class TestJobs(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for attribute, value in [
+                ('job_store', JobStore(directory=directory)),
+                ('job_pool', WorkerPool(size=0))]:
+            patcher = mock.patch.object(api, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # NOTE: request.body is not available, it is copied to spool file.
+        signal_response.disconnect(log_jsonapi_response)
+        self.addCleanup(signal_response.connect, log_jsonapi_response)
+
+    def request(self, method, url, data, **kwargs):
+        response = getattr(self.client, method)(
+            url, json.dumps({"data": data}),
+            content_type='application/vnd.api+json',
+            HTTP_PREFER='respond-async', **kwargs)
+        return response, json.loads(response.content.decode('utf8'))
+
+    def get_job(self, response, **kwargs):
+        response = self.client.get(response['Location'], **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('utf8'))["data"]
+
+    def test_prefers_async(self):
+        request = mock.Mock(META={'HTTP_PREFER': 'wait=10, respond-async'})
+        self.assertTrue(prefers_async(request))
+        request = mock.Mock(META={})
+        self.assertFalse(prefers_async(request))
+
+    def test_post(self):
+        response, data = self.request(
+            "post", '/api/author', [{"name": "a"}, {"name": "b"}])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(data["data"]["status"], "queued")
+        self.assertTrue(response['Location'].endswith(
+            '/api/jobs/' + data["data"]["id"]))
+
+        job = self.get_job(response)
+        self.assertEqual(job["status"], "finished")
+        self.assertEqual(job["progress"], {"processed": 2})
+        self.assertEqual(
+            sorted(job["result"]["ids"]),
+            sorted(Author.objects.values_list("id", flat=True)))
+        self.assertFalse(os.path.exists(
+            api.job_store.get_path(job["id"], "body")))
+
+    def test_post_errors(self):
+        response, _ = self.request(
+            "post", '/api/author', [{"name": "a"}, {"name": ""}])
+        job = self.get_job(response)
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["errors"][0]["links"], ["/data/1"])
+        self.assertEqual(Author.objects.count(), 0)
+
+    def test_put(self):
+        authors = mixer.cycle(2).blend(Author)
+        ids = ",".join(str(a.id) for a in authors)
+        response, _ = self.request(
+            "put", '/api/author/' + ids,
+            [{"id": a.id, "name": "changed"} for a in authors])
+        self.assertEqual(self.get_job(response)["status"], "finished")
+        self.assertEqual(
+            set(Author.objects.values_list("name", flat=True)), {"changed"})
+
+    def test_user(self):
+        user = User.objects.create_user("user", password="password")
+        other_user = mixer.blend(User)
+        self.client.login(username="user", password="password")
+        response, _ = self.request(
+            "put", '/api/user/{}'.format(user.id),
+            {"id": user.id, "email": "email@example.com"})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.get_job(response)["status"], "finished")
+        self.assertEqual(
+            User.objects.get(id=user.id).email, "email@example.com")
+
+        response, _ = self.request(
+            "put", '/api/user/{}'.format(other_user.id),
+            {"id": other_user.id, "email": "email@example.com"})
+        job = self.get_job(response)
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["errors"][0]["status"], 403)
+
+        self.client.logout()
+        self.assertEqual(
+            self.client.get(response['Location']).status_code, 404)
+
+    def test_job_not_found(self):
+        self.assertEqual(self.client.get('/api/jobs/unknown').status_code, 404)
+        self.assertEqual(
+            self.client.get('/api/jobs/' + "0" * 32).status_code, 404)
+
+    def test_queue_full(self):
+        with mock.patch.object(api.job_pool, 'submit', return_value=False):
+            response = self.client.post(
+                '/api/author', json.dumps({"data": {"name": "a"}}),
+                content_type='application/vnd.api+json',
+                HTTP_PREFER='respond-async')
+        self.assertEqual(response.status_code, 503)
+
+    def test_error_not_exposed(self):
+        with mock.patch(
+                'tests.testapp.resources.AuthorResource.post',
+                side_effect=ValueError("internal")):
+            with LogCapture('jsonapi.api') as log:
+                response, _ = self.request(
+                    "post", '/api/author', {"name": "a"})
+        self.assertEqual(str(log.records[0].exc_info[1]), "internal")
+        job = self.get_job(response)
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["errors"], [{"detail": "Job failed"}])
+
+    def test_interrupted(self):
+        with mock.patch.object(api.job_pool, 'submit', return_value=True):
+            response, _ = self.request("post", '/api/author', {"name": "a"})
+        self.assertEqual(self.get_job(response)["status"], "queued")
+
+        with mock.patch.object(api.job_store, 'timeout', -1):
+            job = self.get_job(response)
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["errors"], [{"detail": "Job is interrupted"}])
+        self.assertFalse(os.path.exists(
+            api.job_store.get_path(job["id"], "body")))
+
+        api.process_job(job["id"])
+        self.assertEqual(self.get_job(response)["status"], "failed")
+        self.assertFalse(Author.objects.exists())
+
+    def test_expire(self):
+        response, data = self.request("post", '/api/author', {"name": "a"})
+        path = api.job_store.get_path(data["data"]["id"], "json")
+        self.assertTrue(os.path.exists(path))
+
+        with mock.patch.multiple(
+                api.job_store, ttl=-1, EXPIRE_INTERVAL=-1):
+            self.assertEqual(
+                self.client.get(response['Location']).status_code, 404)
+            api.job_store.expire()
+        self.assertFalse(os.path.exists(path))
+
+    def test_lock_abandoned(self):
+        path = api.job_store.get_path("a", "lock")
+        open(path, "w").close()
+        os.utime(path, (0, 0))
+        with api.job_store.lock("a"):
+            self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path))
@@ -0,0 +1,82 @@
+from django.test import TestCase
+from mixer.backend.django import mixer
+from testfixtures import LogCapture
+import mock
+import unittest
+
+from jsonapi import memory
+from jsonapi.signals import signal_response_trace
+from ..models import Post
+from ..urls import api
+
+
+@unittest.skipIf(memory.tracemalloc is None, "tracemalloc is not available")
+class TestMemory(TestCase):
+    def setUp(self):
+        if not memory.tracemalloc.is_tracing():
+            self.addCleanup(memory.tracemalloc.stop)
+        self.addCleanup(memory.stop)
+
+    def test_phase(self):
+        memory.start(top=3)
+        with memory.phase("a"):
+            data = [bytearray(1024) for _ in range(100)]
+        result = memory.stop()
+
+        self.assertIsNone(memory.get())
+        self.assertGreaterEqual(result["phases"]["a"], 100 * 1024)
+        self.assertGreaterEqual(result["peak"], result["phases"]["a"])
+        self.assertGreaterEqual(result["allocated"], 100 * 1024)
+        self.assertEqual(len(result["top"]), 3)
+        self.assertIn("test_memory.py", result["top"][0]["site"])
+        self.assertEqual(len(data), 100)
+
+    def test_rate(self):
+        results = []
+        for _ in range(4):
+            memory.start(top=3, rate=2)
+            data = [bytearray(1024) for _ in range(100)]
+            results.append(memory.stop())
+        self.assertEqual(len(data), 100)
+        self.assertEqual(
+            sorted(bool(result["top"]) for result in results),
+            [False, False, True, True])
+
+    def test_phase_not_started(self):
+        with memory.phase("a"):
+            pass
+        self.assertIsNone(memory.stop())
+
+    def test_request(self):
+        mixer.cycle(3).blend(Post)
+        signals = []
+
+        def receiver(**kwargs):
+            signals.append(kwargs)
+
+        signal_response_trace.connect(receiver)
+        self.addCleanup(signal_response_trace.disconnect, receiver)
+
+        with mock.patch.object(api, 'memory', True), \
+                mock.patch.object(api, 'memory_threshold', 0), \
+                LogCapture('jsonapi.memory') as logs:
+            response = self.client.get('/api/post?include=author')
+
+        self.assertEqual(response.status_code, 200)
+        result = signals[0]["memory"]
+        self.assertEqual(list(result["phases"]), ["query", "serialize"])
+        self.assertGreater(result["peak"], 0)
+        self.assertIn(
+            "GET /api/post?include=author peak memory",
+            logs.records[0].getMessage())
+
+    def test_disabled(self):
+        signals = []
+
+        def receiver(**kwargs):
+            signals.append(kwargs)
+
+        signal_response_trace.connect(receiver)
+        self.addCleanup(signal_response_trace.disconnect, receiver)
+        self.client.get('/api/author')
+        self.assertIsNone(signals[0]["memory"])
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+from django.test import TestCase
+from mixer.backend.django import mixer
+import datetime
+import json
+import unittest
+
+from jsonapi import messagepack, six
+from jsonapi.messagepack import _packb, _unpackb
+from ..models import Author
+
+
+class TestMessagepack(TestCase):
+    VALUES = [
+        None, True, False, 0, 1, 127, 128, 255, 256, 65535, 65536,
+        2 ** 32, 2 ** 64 - 1, -1, -32, -33, -128, -129, -32768, -32769,
+        -2 ** 31 - 1, -2 ** 63, 1.5, -0.25,
+        u"", u"a", u"ж" * 31, u"a" * 32, u"a" * 256, u"a" * 65536,
+        b"", b"\x00" * 256, b"\x00" * 65536,
+        [], [1] * 15, [1] * 16, [u"a", [None, {}]] * 40000,
+        {}, {u"a": 1}, dict((u"k{}".format(i), i) for i in range(16)),
+    ]
+
+    def test_known_encoding(self):
+        self.assertEqual(_packb({u"a": 1}), b'\x81\xa1a\x01')
+        self.assertEqual(_packb([None, True, -1]), b'\x93\xc0\xc3\xff')
+        # NOTE: python 2 str is packed with str family.
+        self.assertEqual(
+            _packb(b"a"), b'\xa1a' if six.PY2 else b'\xc4\x01a')
+        self.assertEqual(_packb(bytearray(b"a")), b'\xc4\x01a')
+        self.assertEqual(_packb(300), b'\xcd\x01\x2c')
+
+    def test_round_trip(self):
+        for value in self.VALUES:
+            self.assertEqual(_unpackb(_packb(value)), value)
+
+    def test_tuple(self):
+        self.assertEqual(_unpackb(_packb((1, 2))), [1, 2])
+
+    def test_default(self):
+        date = datetime.date(2015, 1, 1)
+        with self.assertRaises(TypeError):
+            _packb(date)
+        self.assertEqual(
+            _unpackb(_packb(date, default=lambda o: o.isoformat())),
+            u"2015-01-01")
+
+    def test_invalid_data(self):
+        for data in [b"", b"\x92\x01", b"\xc1", b"\x01\x02", b"\xa2\xff\xff"]:
+            with self.assertRaises(ValueError):
+                _unpackb(data)
+
+    @unittest.skipIf(messagepack.msgpack is None, "msgpack is not installed")
+    def test_same_as_msgpack(self):
+        for value in self.VALUES:
+            self.assertEqual(messagepack.packb(value), _packb(value))
+            self.assertEqual(messagepack.unpackb(_packb(value)), value)
+
+
+class TestMessagepackAPI(TestCase):
+    def test_get(self):
+        mixer.cycle(3).blend(Author)
+        content = self.client.get('/api/author').content
+        response = self.client.get(
+            '/api/author', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(
+            messagepack.unpackb(response.content),
+            json.loads(content.decode('utf8')))
+
+    def test_json_preferred(self):
+        response = self.client.get(
+            '/api/author',
+            HTTP_ACCEPT='application/vnd.api+json, application/msgpack')
+        self.assertEqual(
+            response['Content-Type'], 'application/vnd.api+json')
+
+        response = self.client.get(
+            '/api/author',
+            HTTP_ACCEPT='application/vnd.api+json;q=0.5, application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+
+    def test_post(self):
+        response = self.client.post(
+            '/api/author',
+            messagepack.packb({"data": [{"name": "a"}, {"name": "b"}]}),
+            content_type='application/msgpack',
+            HTTP_ACCEPT='application/msgpack',
+        )
+        self.assertEqual(response.status_code, 201)
+        data = messagepack.unpackb(response.content)
+        self.assertEqual([d["name"] for d in data["data"]], ["a", "b"])
+        self.assertEqual(Author.objects.count(), 2)
+
+    def test_post_invalid(self):
+        response = self.client.post(
+            '/api/author', b"\xc1", content_type='application/msgpack')
+        self.assertEqual(response.status_code, 400)
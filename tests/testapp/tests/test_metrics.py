@@ -0,0 +1,102 @@
+from django.test import RequestFactory, TestCase
+from mixer.backend.django import mixer
+import json
+import mock
+import shutil
+import tempfile
+
+from jsonapi.metrics import MetricsRegistry
+from ..models import Author
+from ..urls import api
+
+
+class TestMetricsRegistry(TestCase):
+    def test_histogram(self):
+        registry = MetricsRegistry()
+        labels = {"resource": "author", "method": "GET"}
+        for value in [0, 3, 3, 1000]:
+            registry.observe("jsonapi_request_queries", labels, value)
+
+        lines = registry.render().splitlines()
+        prefix = ('jsonapi_request_queries_bucket'
+                  '{method="GET",resource="author"')
+        self.assertIn(prefix + ',le="0"} 1', lines)
+        self.assertIn(prefix + ',le="2"} 1', lines)
+        self.assertIn(prefix + ',le="5"} 3', lines)
+        self.assertIn(prefix + ',le="100"} 3', lines)
+        self.assertIn(prefix + ',le="+Inf"} 4', lines)
+        self.assertIn(
+            'jsonapi_request_queries_sum{method="GET",resource="author"} '
+            '1006', lines)
+        self.assertIn("# TYPE jsonapi_request_queries histogram", lines)
+
+    def test_label_escaping(self):
+        registry = MetricsRegistry()
+        registry.inc("jsonapi_requests_total", {"resource": 'a"\\\n'})
+        self.assertIn(
+            'jsonapi_requests_total{resource="a\\"\\\\\\n"} 1',
+            registry.render().splitlines())
+
+    def test_shared_directory(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        registry = MetricsRegistry(directory=directory)
+        registry.inc("jsonapi_requests_total", {"resource": "author"}, 2)
+        registry.observe(
+            "jsonapi_request_queries", {"resource": "author"}, 1)
+        # Metrics of other worker process.
+        with mock.patch('os.getpid', return_value=0):
+            other = MetricsRegistry(directory=directory)
+            other.inc("jsonapi_requests_total", {"resource": "author"})
+            other.observe(
+                "jsonapi_request_queries", {"resource": "author"}, 2)
+            other.flush()
+
+        lines = registry.render().splitlines()
+        self.assertIn('jsonapi_requests_total{resource="author"} 3', lines)
+        self.assertIn(
+            'jsonapi_request_queries_count{resource="author"} 2', lines)
+        self.assertIn(
+            'jsonapi_request_queries_sum{resource="author"} 3', lines)
+
+
+class TestRequestMetrics(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(api, 'metrics', MetricsRegistry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get(self):
+        mixer.blend(Author)
+        response = self.client.get('/api/author')
+        self.assertEqual(response.status_code, 200)
+
+        # NOTE: metrics url is not added, testapp api does not have metrics.
+        response = api.metrics_view(RequestFactory().get('/api/metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        lines = response.content.decode('utf8').splitlines()
+        self.assertIn(
+            'jsonapi_requests_total{method="GET",resource="author",'
+            'status="200"} 1', lines)
+        self.assertIn(
+            'jsonapi_request_queries_sum{method="GET",resource="author"} 1',
+            lines)
+        self.assertIn(
+            'jsonapi_response_size_bytes_count{method="GET",'
+            'resource="author"} 1', lines)
+
+    def test_error(self):
+        response = self.client.post(
+            '/api/author', json.dumps({"data": {"name": "not clean name"}}),
+            content_type='application/vnd.api+json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            'jsonapi_errors_total{code="32100",method="POST",'
+            'resource="author"} 1', api.metrics.render().splitlines())
+
+    def test_not_allowed(self):
+        self.client.post('/api/comment')
+        self.assertIn(
+            'jsonapi_requests_total{method="POST",resource="comment",'
+            'status="405"} 1', api.metrics.render().splitlines())
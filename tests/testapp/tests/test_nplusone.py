@@ -0,0 +1,71 @@
+from django.test import TestCase
+from mixer.backend.django import mixer
+from testfixtures import LogCapture
+import mock
+
+from jsonapi import nplusone
+from jsonapi.nplusone import NPlusOneError, fingerprint
+from ..models import Author, Post
+from ..resources import PostResource
+from ..urls import api
+
+
+class TestNPlusOne(TestCase):
+    def setUp(self):
+        mixer.cycle(3).blend(Post)
+        patchers = [
+            mock.patch.object(
+                PostResource, 'dump_document_author_name',
+                staticmethod(lambda obj: obj.author.name), create=True),
+            mock.patch.object(
+                PostResource.Meta, 'fieldnames_include',
+                PostResource.Meta.fieldnames_include + ['author_name']),
+            mock.patch.object(api, 'nplusone', nplusone.MODE_RAISE),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint(
+                'SELECT "a"."id" FROM "a"\n WHERE "a"."id" IN (%s, %s, %s) '
+                'AND "a"."name" = \'x\' LIMIT 21'),
+            'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (?) '
+            'AND "a"."name" = ? LIMIT ?')
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t1" WHERE "id" = %s'),
+            'SELECT * FROM "t1" WHERE "id" = ?')
+
+    def test_raise(self):
+        with self.assertRaises(NPlusOneError) as context:
+            self.client.get('/api/post')
+
+        message = str(context.exception)
+        self.assertIn(
+            "resource post, field author_name, include None", message)
+        self.assertIn("3 queries for 3 rows", message)
+
+    def test_include_path(self):
+        # Author is selected with post, field hook does not query it.
+        response = self.client.get('/api/post?include=author')
+        self.assertEqual(response.status_code, 200)
+
+    def test_log(self):
+        with mock.patch.object(api, 'nplusone', nplusone.MODE_LOG), \
+                LogCapture('jsonapi.nplusone') as logs:
+            response = self.client.get('/api/post')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("field author_name", logs.records[0].getMessage())
+
+    def test_one_row(self):
+        Post.objects.exclude(id=Post.objects.first().id).delete()
+        response = self.client.get('/api/post')
+        self.assertEqual(response.status_code, 200)
+
+    def test_detector_stopped(self):
+        self.client.get('/api/author')
+        self.assertIsNone(nplusone.get())
+        self.assertEqual(Author.objects.count(), 3)
@@ -0,0 +1,60 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from mixer.backend.django import mixer
+import mock
+import os
+import shutil
+import tempfile
+
+from jsonapi import six
+from jsonapi.profiling import Profiler, get_dumps, get_token
+from ..models import Author
+from ..urls import api
+
+
+class TestProfiling(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.profiler = Profiler(directory=self.directory)
+        patcher = mock.patch.object(api, 'profiler', self.profiler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        mixer.blend(Author)
+
+    def test_rate(self):
+        self.profiler.rate = 2
+        for _ in range(4):
+            self.assertEqual(self.client.get('/api/author').status_code, 200)
+        self.client.post(
+            '/api/author', '{}', content_type='application/vnd.api+json')
+
+        paths = get_dumps(self.directory, "author")
+        self.assertEqual(len(paths), 2)
+        self.assertEqual(paths, get_dumps(self.directory, "author", "GET"))
+        self.assertTrue(os.path.basename(paths[0]).startswith("author.GET."))
+
+    def test_header(self):
+        self.client.get('/api/author', HTTP_X_JSONAPI_PROFILE="profile:x:y")
+        self.assertEqual(get_dumps(self.directory, "author"), [])
+
+        self.client.get('/api/author', HTTP_X_JSONAPI_PROFILE=get_token())
+        self.assertEqual(len(get_dumps(self.directory, "author")), 1)
+
+    def test_command(self):
+        for _ in range(2):
+            self.client.get('/api/author', HTTP_X_JSONAPI_PROFILE=get_token())
+
+        output = os.path.join(self.directory, "merged.stats")
+        stdout = six.StringIO()
+        call_command(
+            'jsonapi_profile', self.directory, 'author', limit=5,
+            output=output, stdout=stdout)
+        report = stdout.getvalue()
+        self.assertIn("2 requests", report)
+        self.assertIn("handler_view", report)
+        self.assertTrue(os.path.exists(output))
+
+        with self.assertRaises(CommandError):
+            call_command('jsonapi_profile', self.directory, 'post')
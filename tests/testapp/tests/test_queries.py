@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test import TestCase
+from mixer.backend.django import mixer
+import json
+import mock
+
+from jsonapi import queries
+from jsonapi.queries import QueryLog
+from jsonapi.signals import signal_response_trace
+from ..models import Author, Post
+from ..urls import api
+
+
+class TestQueryLog(TestCase):
+    def tearDown(self):
+        queries.stop()
+
+    def test_record(self):
+        log = QueryLog(slowest=2)
+        for index, duration in enumerate([0.1, 0.3, 0.2, 0.05]):
+            log.record("q{}".format(index), [index], duration)
+
+        self.assertEqual(log.as_dict(), {
+            "count": 4,
+            "duration": 0.1 + 0.3 + 0.2 + 0.05,
+            "slowest": [
+                {"sql": "q1", "params": [1], "duration": 0.3},
+                {"sql": "q2", "params": [2], "duration": 0.2},
+            ],
+        })
+        self.assertNotIn("params", log.as_dict(params=False)["slowest"][0])
+
+    def test_cursor_wrapped(self):
+        log = queries.start()
+        Author.objects.count()
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        self.assertEqual(cursor.fetchone(), (1,))
+        cursor.close()
+        self.assertIs(queries.stop(), log)
+        self.assertEqual(log.count, 2)
+
+        Author.objects.count()
+        self.assertEqual(log.count, 2)
+
+
+class TestRequestQueries(TestCase):
+    def setUp(self):
+        self.signals = []
+
+        def receiver(**kwargs):
+            self.signals.append(kwargs)
+
+        signal_response_trace.connect(receiver)
+        self.addCleanup(signal_response_trace.disconnect, receiver)
+
+    def test_signal(self):
+        mixer.cycle(3).blend(Post)
+        with self.assertNumQueries(2), \
+                mock.patch.object(api, 'query_log', True):
+            self.client.get('/api/author?include=posts')
+
+        log = self.signals[0]["queries"]
+        self.assertEqual(log["count"], 2)
+        self.assertEqual(len(log["slowest"]), 2)
+        self.assertIn("SELECT", log["slowest"][0]["sql"])
+
+    def test_not_used(self):
+        with mock.patch.object(api, 'nplusone', None), \
+                mock.patch.object(api, 'metrics', None):
+            self.client.get('/api/author')
+        self.assertIsNone(self.signals[0]["queries"])
+
+    def test_debug_meta(self):
+        mixer.blend(Author)
+        with mock.patch.object(api, 'debug', True):
+            response = self.client.get(
+                '/api/author', HTTP_ACCEPT_ENCODING='gzip')
+        data = json.loads(response.content.decode('utf8'))
+        self.assertEqual(data["meta"]["debug"]["queries"]["count"], 1)
+        self.assertIn("query", data["meta"]["debug"]["timings"])
+        self.assertEqual(len(data["data"]), 1)
+
+    def test_no_debug_meta(self):
+        response = self.client.get('/api/author')
+        data = json.loads(response.content.decode('utf8'))
+        self.assertNotIn("meta", data)
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from mixer.backend.django import mixer
+import json
+import mock
+import os
+import shutil
+import tempfile
+
+from jsonapi.receivers import NDJSONReceiver
+from jsonapi.signals import signal_response_trace
+from ..models import Post
+from ..urls import api
+
+
+class TestNDJSONReceiver(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "requests.ndjson")
+        self.receiver = NDJSONReceiver(self.path, batch_size=2)
+        signal_response_trace.connect(self.receiver)
+        self.addCleanup(signal_response_trace.disconnect, self.receiver)
+
+    def get_records(self):
+        self.receiver.join()
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_records(self):
+        mixer.cycle(3).blend(Post)
+        with mock.patch.object(api, 'query_log', True):
+            for _ in range(3):
+                self.client.get('/api/post?include=author')
+            self.client.get('/api/user')
+
+        records = self.get_records()
+        self.assertEqual(len(records), 4)
+        self.assertEqual(records[0]["path"], "/api/post?include=author")
+        self.assertEqual(records[0]["status"], 200)
+        self.assertEqual(records[0]["queries"], 1)
+        self.assertGreater(records[0]["size"], 0)
+        self.assertIn("serialize", records[0]["timings"])
+        self.assertEqual(records[3]["status"], 401)
+        self.assertEqual(self.receiver.dropped, 0)
+
+    def test_queue_full(self):
+        with mock.patch.object(
+                self.receiver._worker, 'submit', return_value=False):
+            self.client.get('/api/author')
+        self.assertEqual(self.receiver.dropped, 1)
+        self.assertFalse(os.path.exists(self.path))
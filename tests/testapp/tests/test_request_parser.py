@@ -107,3 +107,23 @@ class TestRequestParser(TestCase):
                               "&fields=a&sort=b&include=c&page=1")
         result = RequestParser.parse(querydict)
         self.assertEqual(result.filter, ['a=1', 'b__in=[1,2]', 'c__gt=0'])
+
+    def test_parse_format(self):
+        self.assertEqual(RequestParser.parse(QueryDict("")).format, None)
+        querydict = QueryDict("format=columnar")
+        self.assertEqual(RequestParser.parse(querydict).format, "columnar")
+
+        with self.assertRaises(ValueError):
+            RequestParser.parse(QueryDict("format=unknown"))
+
+    def test_parse_accept_format(self):
+        parse = RequestParser.parse_accept_format
+        self.assertEqual(
+            parse('application/vnd.api+json; format="columnar"'), "columnar")
+        self.assertEqual(
+            parse('text/html, application/vnd.api+json;format=columnar'),
+            "columnar")
+        self.assertIsNone(parse('application/vnd.api+json'))
+        self.assertIsNone(parse('application/vnd.api+json; format=unknown'))
+        self.assertIsNone(parse('application/json; format=columnar'))
+        self.assertIsNone(parse(None))
@@ -0,0 +1,68 @@
+from django.test import TestCase
+from mixer.backend.django import mixer
+from testfixtures import LogCapture
+import json
+import mock
+
+from jsonapi import slowlog
+from jsonapi.workers import BatchWorker
+from ..models import Post
+from ..resources import AuthorResource
+
+
+class TestSlowLog(TestCase):
+    def setUp(self):
+        mixer.cycle(3).blend(Post)
+        # NOTE: records are logged in the test thread, background thread has
+        # other connection to test database.
+        patcher = mock.patch.object(
+            slowlog, '_worker', BatchWorker(slowlog.log_records, size=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_slow(self):
+        with mock.patch.object(AuthorResource.Meta, 'slow_threshold', 0), \
+                LogCapture('jsonapi.slowlog') as logs:
+            response = self.client.get('/api/author?include=posts')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(slowlog.stop())
+
+        record = logs.records[0].slow_request
+        self.assertEqual(record["resource"], "author")
+        self.assertEqual(record["path"], "/api/author?include=posts")
+        self.assertEqual(record["queryargs"]["include"], ["posts"])
+        self.assertEqual(record["include"], [
+            {"query": "post_set", "type": "posts", "resource": "post"}])
+        self.assertIn("serialize", record["timings"])
+        self.assertEqual(len(record["queries"]), 2)
+        self.assertEqual(record["queries"][0]["alias"], "default")
+        self.assertEqual(len(record["explain"]), 2)
+        self.assertIsInstance(record["explain"][0]["plan"], list)
+        self.assertEqual(
+            json.loads(logs.records[0].getMessage()[len("Slow request "):]),
+            json.loads(json.dumps(record, default=str)))
+
+    def test_fast(self):
+        with mock.patch.object(AuthorResource.Meta, 'slow_threshold', 60), \
+                LogCapture('jsonapi.slowlog') as logs:
+            self.client.get('/api/author')
+        self.assertEqual(logs.records, [])
+
+    def test_disabled(self):
+        with mock.patch.object(slowlog, 'start') as start:
+            self.client.get('/api/author')
+        self.assertFalse(start.called)
+
+    def test_explain_in_background(self):
+        with mock.patch.object(AuthorResource.Meta, 'slow_threshold', 0), \
+                mock.patch.object(slowlog._worker, 'submit') as submit, \
+                mock.patch.object(slowlog, 'explain') as explain:
+            self.client.get('/api/author')
+            self.assertFalse(explain.called)
+            record = submit.call_args[0][0]
+            self.assertEqual(record["explain"], [])
+            slowlog.explain_record(record)
+
+        explain.assert_called_once_with(
+            record["queries"][0]["sql"], record["queries"][0]["params"],
+            using="default")
@@ -0,0 +1,124 @@
+from django.test import TestCase
+from mixer.backend.django import mixer
+import json
+import mock
+import shutil
+import tempfile
+
+from jsonapi.snapshots import SnapshotStore
+from ..models import Group, Post
+from ..resources import GroupResource, PostResource
+from ..urls import api
+
+
+class TestSnapshots(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.store = SnapshotStore(directory=directory)
+        self.store.add(GroupResource)
+        self.store.add(PostResource)
+        # Store is invalidated with every model change after the test.
+        self.addCleanup(self.store.resources.__delitem__, slice(None))
+        for target, attribute, value in [
+                (api, 'snapshots', self.store),
+                (self.store, 'schedule', mock.Mock()),
+                (GroupResource.Meta, 'snapshot', True),
+                (PostResource.Meta, 'snapshot', True)]:
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get(self, url, **kwargs):
+        response = self.client.get(url, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content) \
+            if response.streaming else response.content
+        return response, json.loads(content.decode('utf8'))
+
+    def build(self, resource):
+        # Snapshot links depend on api url of requests.
+        self.client.get('/api/' + resource.Meta.name)
+        self.assertTrue(self.store.build(resource))
+
+    def test_get(self):
+        mixer.cycle(3).blend(Post)
+        _, expected = self.get('/api/post')
+        self.build(PostResource)
+
+        with self.assertNumQueries(0):
+            response, data = self.get('/api/post')
+        self.assertEqual(data, expected)
+        self.assertTrue(response.has_header('ETag'))
+        # Collection is streamed from mapped file.
+        self.assertTrue(response.streaming)
+
+    def test_get_ids(self):
+        groups = mixer.cycle(3).blend(Group)
+        url = '/api/group/{},{}'.format(groups[2].id, groups[0].id)
+        _, expected = self.get(url)
+        self.build(GroupResource)
+
+        with self.assertNumQueries(0):
+            _, data = self.get(url)
+        self.assertEqual(data, expected)
+
+        with self.assertNumQueries(0):
+            _, data = self.get('/api/group/0')
+        self.assertEqual(data["data"], [])
+
+    def test_get_empty(self):
+        self.build(GroupResource)
+        _, data = self.get('/api/group')
+        self.assertEqual(data, {"data": []})
+
+    def test_not_modified(self):
+        mixer.cycle(2).blend(Group)
+        self.build(GroupResource)
+        response, _ = self.get('/api/group')
+        response = self.client.get(
+            '/api/group', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_snapshot_not_used(self):
+        mixer.cycle(2).blend(Group)
+        self.build(GroupResource)
+        Group.objects.create(name="new")
+
+        for url, kwargs in [
+                ('/api/group?filter=name=new', {}),
+                ('/api/group', {'HTTP_ACCEPT': 'application/msgpack'})]:
+            with self.assertNumQueries(1):
+                self.client.get(url, **kwargs)
+
+    def test_other_host(self):
+        mixer.cycle(2).blend(Group)
+        self.build(GroupResource)
+        with mock.patch.object(api, 'update_urls'):
+            with self.assertNumQueries(1):
+                self.get('/api/group', HTTP_HOST='other.example.com')
+
+    def test_rebuild_scheduled(self):
+        self.assertEqual(self.store.get(GroupResource), None)
+        self.store.schedule.assert_called_once_with(GroupResource)
+
+        self.build(GroupResource)
+        snapshot = self.store.get(GroupResource)
+        self.assertIs(self.store.get(GroupResource), snapshot)
+        self.build(GroupResource)
+        self.assertIsNot(self.store.get(GroupResource), snapshot)
+
+        self.store.schedule.reset_mock()
+        with mock.patch('jsonapi.snapshots.on_commit',
+                        side_effect=lambda f: f()):
+            Group.objects.create(name="new")
+        self.store.schedule.assert_called_once_with(GroupResource)
+
+    def test_debounce(self):
+        store = SnapshotStore(directory=self.store.directory, delay=60)
+        with mock.patch('jsonapi.snapshots.threading.Timer') as Timer:
+            store.schedule(GroupResource)
+            store.schedule(GroupResource)
+
+        self.assertEqual(Timer.call_count, 2)
+        Timer.return_value.cancel.assert_called_once_with()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from django.test import TestCase
+import io
+import json
+import mock
+
+from jsonapi.signals import signal_response
+from jsonapi.stream_parser import DocumentStreamParser
+from ..models import Author
+from ..resources import AuthorResource
+from ..signals import log_jsonapi_response
+
+
+def parse(document, chunk_size=1):
+    parser = DocumentStreamParser(
+        io.BytesIO(document.encode('utf8')), chunk_size=chunk_size)
+    items, is_collection = parser.parse()
+    return list(items), is_collection
+
+
+class TestDocumentStreamParser(TestCase):
+    def test_parse_collection(self):
+        items = [
+            {u"name": u"a", u"links": {u"posts": [1, 2]}},
+            {u"name": u"ж \"\\", u"value": 12345.5e-3},
+            [], 1234567, None,
+        ]
+        document = json.dumps({"meta": {"a": [1]}, "data": items}, indent=2)
+        for chunk_size in (1, 2, 3, 7, 65536):
+            self.assertEqual(parse(document, chunk_size), (items, True))
+
+    def test_parse_object(self):
+        self.assertEqual(
+            parse(u'{"data": {"name": "a"}, "meta": 1}'),
+            ([{u"name": u"a"}], False))
+
+    def test_parse_empty(self):
+        self.assertEqual(parse(u' { "data" : [ ] } '), ([], True))
+
+    def test_data_missing(self):
+        for document in [u'{}', u'{"meta": {}}']:
+            with self.assertRaises(KeyError):
+                parse(document)
+
+    def test_not_valid(self):
+        for document in [
+                u'', u'[]', u'{"data": [1,]}', u'{"data": [1, 2}',
+                u'{"data": [1]', u'{"data": [1]}}', u'{"data": [1], 1: 2}',
+                u'{"data": [{"a": }]}', u'{"meta" 1, "data": []}']:
+            with self.assertRaises(ValueError):
+                parse(document)
+
+    def test_items_decoded_lazily(self):
+        items, _ = DocumentStreamParser(
+            io.BytesIO(b'{"data": [1, 2, x]}'), chunk_size=1).parse()
+        self.assertEqual(next(items), 1)
+        self.assertEqual(next(items), 2)
+        with self.assertRaises(ValueError):
+            next(items)
+
+
+class TestStreamedRequest(TestCase):
+    def setUp(self):
+        # NOTE: request.body is not available, it is read from stream.
+        signal_response.disconnect(log_jsonapi_response)
+        self.addCleanup(signal_response.connect, log_jsonapi_response)
+
+    def post(self, data):
+        with mock.patch.object(AuthorResource.Meta, 'stream_min_length', 0):
+            return self.client.post(
+                '/api/author', data, content_type='application/vnd.api+json')
+
+    def test_post(self):
+        response = self.post(json.dumps({
+            "data": [{"name": "a"}, {"name": "b"}]}))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(Author.objects.values_list("name", flat=True)), ["a", "b"])
+
+    def test_post_not_valid(self):
+        response = self.post('{"data": [{"name": "a"}, x]}')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Author.objects.count(), 0)
+
+        response = self.post('{"meta": {}}')
+        self.assertEqual(response.status_code, 400)
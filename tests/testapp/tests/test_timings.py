@@ -0,0 +1,105 @@
+from django.test import TestCase
+from mixer.backend.django import mixer
+import json
+import mock
+
+from jsonapi import queries, timings
+from jsonapi.signals import signal_response, signal_response_trace
+from ..models import Author, Post
+from ..urls import api
+
+
+class TestTimings(TestCase):
+    def tearDown(self):
+        timings.stop()
+
+    def test_phase(self):
+        timings.start()
+        with timings.phase("a"):
+            pass
+        with timings.phase("a"):
+            pass
+        phases = timings.stop().finish()
+        self.assertEqual(list(phases.keys()), ["a", "total"])
+        self.assertLessEqual(phases["a"], phases["total"])
+
+    def test_phase_not_started(self):
+        with timings.phase("a"):
+            pass
+        self.assertIsNone(timings.get())
+
+    def test_get_server_timing(self):
+        self.assertEqual(
+            timings.get_server_timing({"sql": 0.0012}), "sql;dur=1.200")
+
+
+class TestRequestTimings(TestCase):
+    def setUp(self):
+        self.signals = []
+
+        def receiver(**kwargs):
+            self.signals.append(kwargs)
+
+        signal_response_trace.connect(receiver)
+        self.addCleanup(signal_response_trace.disconnect, receiver)
+
+    def test_get(self):
+        mixer.cycle(3).blend(Post)
+        response = self.client.get('/api/post?include=author')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Server-Timing'))
+
+        phases = self.signals[0]["timings"]
+        self.assertEqual(
+            set(phases), {"query", "serialize", "sql", "encode", "total"})
+        self.assertLessEqual(phases["sql"], phases["serialize"])
+
+    def test_post(self):
+        response = self.client.post(
+            '/api/author', json.dumps({"data": {"name": "a"}}),
+            content_type='application/vnd.api+json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Author.objects.exists())
+        self.assertEqual(
+            set(self.signals[0]["timings"]),
+            {"parse", "validate", "save", "encode", "total"})
+
+    def test_server_timing(self):
+        with mock.patch.object(api, 'server_timing', True):
+            response = self.client.get('/api/author')
+        self.assertIn('total;dur=', response['Server-Timing'])
+        self.assertIn('query;dur=', response['Server-Timing'])
+
+    def test_not_authenticated(self):
+        response = self.client.get('/api/user')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(set(self.signals[0]["timings"]), {"auth", "total"})
+
+    def test_exception(self):
+        with mock.patch.object(
+                api, 'handler_view_get', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                self.client.get('/api/author')
+        self.assertEqual(self.signals[0]["response"].status_code, 500)
+        self.assertIn("total", self.signals[0]["timings"])
+        self.assertIsNone(timings.get())
+        self.assertIsNone(queries.get())
+
+    def test_not_found(self):
+        response = self.client.get('/api/author/export')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.signals[0]["response"].status_code, 404)
+        self.assertIsNone(timings.get())
+
+    def test_response_signal_arguments(self):
+        responses = []
+
+        def receiver(sender, signal, request=None, response=None,
+                     duration=None):
+            responses.append(response)
+
+        signal_response.connect(receiver)
+        self.addCleanup(signal_response.disconnect, receiver)
+        response = self.client.get('/api/author')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(responses, [response])
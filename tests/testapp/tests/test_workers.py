@@ -0,0 +1,73 @@
+from django.test import TestCase
+from testfixtures import LogCapture
+import mock
+import threading
+
+from jsonapi.workers import BatchWorker, WorkerPool
+
+
+class TestWorkerPool(TestCase):
+    def test_submit(self):
+        pool = WorkerPool(size=2)
+        results = []
+        for index in range(10):
+            self.assertTrue(pool.submit(results.append, index))
+        pool.join()
+        self.assertEqual(sorted(results), list(range(10)))
+
+    def test_submit_queue_full(self):
+        pool = WorkerPool(size=1, queue_size=1)
+        event = threading.Event()
+        pool.submit(event.wait)
+        # NOTE: wait until worker takes the first task from the queue.
+        while pool._queue.qsize():
+            pass
+        self.assertTrue(pool.submit(event.wait))
+        self.assertFalse(pool.submit(event.wait))
+        event.set()
+        pool.join()
+
+    def test_submit_synchronous(self):
+        pool = WorkerPool(size=0)
+        results = []
+        pool.submit(results.append, 1)
+        self.assertEqual(results, [1])
+
+    def test_task_error_logged(self):
+        pool = WorkerPool(size=0)
+        with LogCapture('jsonapi.workers') as log:
+            self.assertTrue(pool.submit(lambda: 1 / 0))
+        self.assertEqual(len(log.records), 1)
+
+
+class TestBatchWorker(TestCase):
+    def test_submit(self):
+        batches = []
+        event = threading.Event()
+
+        def write(batch):
+            event.wait()
+            batches.append(batch)
+
+        worker = BatchWorker(write, batch_size=2)
+        self.assertTrue(worker.submit(0))
+        # NOTE: wait until worker takes the first item from the queue.
+        while worker._queue.qsize():
+            pass
+        for index in range(1, 4):
+            self.assertTrue(worker.submit(index))
+        event.set()
+        worker.join()
+        self.assertEqual(batches, [[0], [1, 2], [3]])
+
+    def test_submit_queue_full(self):
+        worker = BatchWorker(list, queue_size=1)
+        with mock.patch.object(worker, '_start'):
+            self.assertTrue(worker.submit(0))
+            self.assertFalse(worker.submit(1))
+
+    def test_submit_synchronous(self):
+        batches = []
+        worker = BatchWorker(batches.append, size=0)
+        self.assertTrue(worker.submit(1))
+        self.assertEqual(batches, [[1]])